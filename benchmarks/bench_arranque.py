@@ -0,0 +1,124 @@
+# Benchmark: arranque de la interfaz.
+# 1) python -X importtime de `import gui` (lo que se carga antes de la
+#    ventana) y de la precarga completa (gui.precargar_modulos), con los
+#    módulos de primer nivel que más tardan. Con --guardar se escribe el
+#    resultado en JSON y con --comparar se muestran las diferencias contra
+#    uno guardado antes, para seguir la evolución entre versiones.
+# 2) Si hay pantalla: tiempo hasta la ventana y hasta el primer análisis
+#    completo, medidos desde que se lanza el proceso (incluye el intérprete).
+#    Cada repetición usa una cache en disco vacía.
+# Uso: python benchmarks/bench_arranque.py [--repeticiones 5] [--guardar archivo.json] [--comparar archivo.json]
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EXPRESION = "x^3 - 3*x"
+MODULOS_MOSTRADOS = 8
+TIEMPO_LIMITE = 120 # s por repetición
+
+def tiempos_de_importacion(codigo):
+    # Corre `codigo` con -X importtime y devuelve {módulo de primer nivel: ms acumulados}
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo],
+                             cwd=RAIZ, capture_output=True, text=True, timeout=TIEMPO_LIMITE)
+    modulos = {}
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        # Los módulos de primer nivel no tienen sangría
+        if nombre.startswith(" ") and not nombre.startswith("  "):
+            modulos[nombre.strip()] = int(acumulado) / 1000
+    return modulos
+
+def mostrar_importaciones(titulo, modulos, anteriores=None):
+    total = sum(modulos.values())
+    print(f"{titulo}: {total:.0f} ms en importaciones")
+    for nombre, ms in sorted(modulos.items(), key=lambda m: -m[1])[:MODULOS_MOSTRADOS]:
+        linea = f"  {nombre:<36}{ms:>10.1f} ms"
+        if anteriores is not None:
+            linea += f"{ms - anteriores.get(nombre, 0.0):>+12.1f}"
+        print(linea)
+
+def hijo():
+    # Proceso medido: avisa por stdout cuando la ventana está a la vista y
+    # cuando terminó el primer análisis
+    sys.path.insert(0, RAIZ)
+    import tkinter as tk
+    import gui
+    try:
+        gui.construir_ventana()
+    except tk.TclError:
+        print("sin-pantalla", flush=True)
+        return
+    gui.ventana.update()
+    print("ventana", flush=True)
+    gui.entrada_funcion.insert(0, EXPRESION)
+    gui.analizar_funcion()
+    while len(gui.etapas_mostradas) < len(gui.tareas.ETAPAS) or gui.trabajador.ocupado():
+        gui.ventana.update()
+        time.sleep(0.005)
+    print("analisis", flush=True)
+    gui.cerrar_ventana()
+
+def medir_arranque():
+    # Devuelve (ms hasta la ventana, ms hasta el primer análisis), o None sin pantalla
+    with tempfile.TemporaryDirectory() as carpeta:
+        entorno = dict(os.environ, GRAFI_CACHE=os.path.join(carpeta, "analisis.sqlite3"))
+        inicio = time.perf_counter()
+        proceso = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--hijo"],
+                                   cwd=RAIZ, env=entorno, stdout=subprocess.PIPE, text=True)
+        marcas = {}
+        for linea in proceso.stdout:
+            marcas[linea.strip()] = (time.perf_counter() - inicio) * 1000
+        proceso.wait(timeout=TIEMPO_LIMITE)
+    if "sin-pantalla" in marcas or "analisis" not in marcas:
+        return None
+    return marcas["ventana"], marcas["analisis"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque de la interfaz")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--guardar", help="escribir los tiempos de importación en este JSON")
+    parser.add_argument("--comparar", help="JSON guardado antes con --guardar")
+    parser.add_argument("--hijo", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.hijo:
+        hijo()
+        return
+
+    anteriores = {}
+    if args.comparar:
+        with open(args.comparar) as archivo:
+            anteriores = json.load(archivo)
+    resultado = {
+        "antes_de_la_ventana": tiempos_de_importacion("import gui"),
+        "precarga": tiempos_de_importacion("import gui; gui.precargar_modulos()"),
+    }
+    for clave, modulos in resultado.items():
+        mostrar_importaciones(clave.replace("_", " ").capitalize(), modulos,
+                              anteriores.get(clave) if args.comparar else None)
+    if args.guardar:
+        with open(args.guardar, "w") as archivo:
+            json.dump(resultado, archivo, indent=2)
+
+    tiempos = []
+    for _ in range(args.repeticiones):
+        medicion = medir_arranque()
+        if medicion is None:
+            print("Sin pantalla: no se mide el tiempo hasta la ventana")
+            return
+        tiempos.append(medicion)
+    ventanas = sorted(t[0] for t in tiempos)
+    analisis = sorted(t[1] for t in tiempos)
+    print(f"Hasta la ventana: {ventanas[len(ventanas) // 2]:.0f} ms (mediana de {len(tiempos)})")
+    print(f"Hasta el primer análisis: {analisis[len(analisis) // 2]:.0f} ms (mediana de {len(tiempos)})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+# Benchmark de operations y steps sobre el corpus de benchmarks/corpus.json
+# (polinomios de grado creciente, racionales, trigonométricas, exp/log,
+# composiciones y casos donde solve se pasa del tiempo límite).
+# Para cada función mide, por etapa: parseo, derivadas, puntos críticos,
+# inflexión, tablas de intervalos, muestreo del gráfico, pasos, dibujo del
+# gráfico (canvas Agg, sin Tk) y el análisis completo de punta a punta.
+# Cada repetición corre en un proceso nuevo (ya calentado con otra función)
+# y con las caches vacías: se mide lo que cuesta una función nueva, y los
+# solve que se pasan del tiempo límite (siguen en un hilo) no le quitan CPU a
+# las mediciones siguientes. Se guardan el mínimo y la mediana de las repeticiones.
+#
+# Uso:
+#   python benchmarks/bench_corpus.py correr [--repeticiones 3] [--categoria polinomios] [--guardar base.json] [--comparar base.json]
+#   python benchmarks/bench_corpus.py comparar base.json nuevo.json [--umbral 0.25] [--piso-ms 2]
+# `comparar` (y `correr --comparar`) marca como regresión toda etapa cuyo
+# mínimo creció más que el umbral (fracción) y más que el piso en ms, y
+# termina con código 1 si hubo alguna: sirve para correrlo antes de un commit.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np # noqa: E402
+import sympy # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import grafico # noqa: E402
+import operations # noqa: E402
+import steps # noqa: E402
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus.json")
+
+ETAPAS = ["parseo", "derivadas", "criticos", "inflexion", "intervalos", "muestreo", "pasos", "grafico", "completo"]
+UMBRAL = 0.25 # 25 % más lento
+PISO_MS = 2.0 # diferencias menores son ruido
+TIEMPO_LIMITE = 600 # s por repetición
+
+# Solo los colores que usa grafico.Grafico (los temas completos están en gui,
+# que importa Tk)
+TEMA = {"graph_bg": "#1e1e1e", "graph_fg": "white", "graph_grid": "#444444"}
+
+def leer_corpus(ruta=CORPUS, categoria=None):
+    with open(ruta, encoding="utf-8") as archivo:
+        corpus = json.load(archivo)
+    if categoria is not None:
+        corpus["expresiones"] = [e for e in corpus["expresiones"] if e["categoria"] == categoria]
+    return corpus
+
+def todos_los_pasos(analisis):
+    steps.pasos_derivadas(analisis)
+    steps.pasos_puntos_criticos(analisis)
+    steps.pasos_inflexion(analisis)
+    steps.pasos_crecimiento(analisis)
+    steps.pasos_concavidad(analisis)
+
+def medir_etapas(texto, figura):
+    # Una repetición: {etapa: ms}. Las etapas van en orden sobre el mismo
+    # análisis, así que cada una mide solo lo que agrega a las anteriores.
+    tiempos = {}
+
+    def medir(etapa, trabajo):
+        inicio = time.perf_counter()
+        resultado = trabajo()
+        tiempos[etapa] = (time.perf_counter() - inicio) * 1000
+        return resultado
+
+    operations.limpiar_caches()
+    funcion = medir("parseo", lambda: operations.convertir_texto_a_funcion(texto))
+    analisis = operations.Analisis(funcion)
+    medir("derivadas", lambda: (analisis.primera_derivada, analisis.segunda_derivada))
+    medir("criticos", lambda: (analisis.puntos_criticos, analisis.clasificacion))
+    medir("inflexion", lambda: analisis.puntos_inflexion)
+    medir("intervalos", lambda: (analisis.intervalos_crecimiento, analisis.intervalos_concavidad))
+    medir("muestreo", lambda: (analisis.datos_grafico, analisis.limites_y))
+    medir("pasos", lambda: todos_los_pasos(analisis))
+    # Con el canvas Agg, mostrar() dibuja en el momento (draw_idle llama a draw)
+    medir("grafico", lambda: figura.mostrar(analisis))
+    return tiempos, analisis
+
+def medir_completo(texto, figura):
+    # De punta a punta, sin caches: lo que espera el usuario
+    operations.limpiar_caches()
+    inicio = time.perf_counter()
+    analisis = operations.Analisis(operations.convertir_texto_a_funcion(texto))
+    analisis.clasificacion
+    analisis.intervalos_crecimiento
+    analisis.intervalos_concavidad
+    todos_los_pasos(analisis)
+    figura.mostrar(analisis)
+    return {"completo": (time.perf_counter() - inicio) * 1000}, analisis
+
+def hijo(texto, modo):
+    # Proceso de una repetición: escribe en stdout un JSON con los tiempos.
+    # Las etapas y el análisis completo van en procesos distintos porque un
+    # solve abandonado en uno seguiría corriendo durante el otro.
+    figura = grafico.Grafico(TEMA)
+    medicion = medir_etapas if modo == "etapas" else medir_completo
+    # El primer análisis de un proceso paga importaciones y compilaciones
+    # que no dependen de la función
+    medicion("x^3 - x", figura)
+    tiempos, analisis = medicion(texto, figura)
+    print(json.dumps({"tiempos": tiempos, "metodo_criticos": analisis.metodo_criticos,
+                      "metodo_inflexion": analisis.metodo_inflexion,
+                      "abandonados": operations.hay_calculos_abandonados()}))
+    # Sin esperar a los solve abandonados
+    sys.stdout.flush()
+    os._exit(0)
+
+def lanzar_hijo(texto, modo):
+    proceso = subprocess.run([sys.executable, os.path.abspath(__file__), "hijo", texto, "--modo", modo],
+                             capture_output=True, text=True, timeout=TIEMPO_LIMITE)
+    if proceso.returncode != 0:
+        raise RuntimeError(f"falló la medición de {texto}:\n{proceso.stderr}")
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+def repeticion(texto):
+    medicion = lanzar_hijo(texto, "etapas")
+    completo = lanzar_hijo(texto, "completo")
+    medicion["tiempos"].update(completo["tiempos"])
+    medicion["abandonados"] = medicion["abandonados"] or completo["abandonados"]
+    return medicion
+
+def correr(corpus, repeticiones):
+    # Devuelve el resultado completo (metadatos + etapas por función)
+    resultados = {}
+    for entrada in corpus["expresiones"]:
+        muestras = {etapa: [] for etapa in ETAPAS}
+        for _ in range(repeticiones):
+            medicion = repeticion(entrada["expresion"])
+            for etapa, ms in medicion["tiempos"].items():
+                muestras[etapa].append(ms)
+        resultados[entrada["id"]] = {
+            "categoria": entrada["categoria"],
+            "expresion": entrada["expresion"],
+            "metodo_criticos": medicion["metodo_criticos"],
+            "metodo_inflexion": medicion["metodo_inflexion"],
+            "solve_abandonado": medicion["abandonados"],
+            "etapas": {etapa: {"min": min(valores), "mediana": statistics.median(valores)}
+                       for etapa, valores in muestras.items()},
+        }
+        total = resultados[entrada["id"]]["etapas"]["completo"]["min"]
+        print(f"{entrada['id']:<14}{entrada['expresion']:<44}{total:>10.1f} ms  ({medicion['metodo_criticos']})",
+              flush=True)
+    return {
+        "corpus": corpus["version"],
+        "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "repeticiones": repeticiones,
+        "entorno": {"python": platform.python_version(), "sympy": sympy.__version__, "numpy": np.__version__,
+                    "maquina": platform.platform(), "nucleos": os.cpu_count()},
+        "resultados": resultados,
+    }
+
+def mostrar_resumen(datos):
+    # Suma por etapa y por categoría (mínimos, en ms)
+    categorias = sorted({r["categoria"] for r in datos["resultados"].values()})
+    print()
+    print(f"{'categoría':<18}" + "".join(f"{etapa:>11}" for etapa in ETAPAS))
+    for categoria in categorias:
+        fila = [r for r in datos["resultados"].values() if r["categoria"] == categoria]
+        sumas = [sum(r["etapas"][etapa]["min"] for r in fila) for etapa in ETAPAS]
+        print(f"{categoria:<18}" + "".join(f"{ms:>11.1f}" for ms in sumas))
+
+def comparar(base, nuevo, umbral=UMBRAL, piso_ms=PISO_MS):
+    # Imprime las diferencias por función y etapa; devuelve la cantidad de regresiones
+    if base["corpus"] != nuevo["corpus"]:
+        print(f"Aviso: versiones de corpus distintas ({base['corpus']} y {nuevo['corpus']}); "
+              "se comparan solo las funciones con el mismo id y la misma expresión")
+    if base["entorno"] != nuevo["entorno"]:
+        print("Aviso: las mediciones son de entornos distintos:")
+        print(f"    base:  {base['entorno']}")
+        print(f"    nuevo: {nuevo['entorno']}")
+    regresiones = 0
+    mejoras = 0
+    for clave, actual in nuevo["resultados"].items():
+        anterior = base["resultados"].get(clave)
+        if anterior is None or anterior["expresion"] != actual["expresion"]:
+            continue
+        for etapa in ETAPAS:
+            antes = anterior["etapas"].get(etapa, {}).get("min")
+            ahora = actual["etapas"][etapa]["min"]
+            if antes is None or abs(ahora - antes) < piso_ms:
+                continue
+            cambio = (ahora - antes) / antes if antes > 0 else float("inf")
+            if cambio > umbral:
+                regresiones += 1
+                marca = "REGRESIÓN"
+            elif cambio < -umbral:
+                mejoras += 1
+                marca = "mejora"
+            else:
+                continue
+            print(f"{marca:<10}{clave:<14}{etapa:<12}{antes:>10.1f} ms -> {ahora:>10.1f} ms  ({cambio:+.0%})")
+        if anterior.get("metodo_criticos") != actual.get("metodo_criticos"):
+            print(f"{'método':<10}{clave:<14}{'criticos':<12}{anterior.get('metodo_criticos')} -> "
+                  f"{actual.get('metodo_criticos')}")
+
+    def total(datos, etapa):
+        comunes = [c for c in nuevo["resultados"] if c in base["resultados"]]
+        return sum(datos["resultados"][c]["etapas"][etapa]["min"] for c in comunes)
+
+    antes, ahora = total(base, "completo"), total(nuevo, "completo")
+    print(f"Total de punta a punta: {antes:.1f} ms -> {ahora:.1f} ms; "
+          f"{regresiones} regresiones y {mejoras} mejoras (umbral {umbral:.0%}, piso {piso_ms} ms)")
+    return regresiones
+
+def leer(ruta):
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de operations y steps sobre un corpus de funciones")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    p_correr = comandos.add_parser("correr", help="medir el corpus")
+    p_correr.add_argument("--corpus", default=CORPUS)
+    p_correr.add_argument("--categoria", help="solo las funciones de esta categoría")
+    p_correr.add_argument("--repeticiones", type=int, default=3)
+    p_correr.add_argument("--guardar", help="escribir los resultados (línea base) en este JSON")
+    p_correr.add_argument("--comparar", help="comparar contra esta línea base al terminar")
+    p_correr.add_argument("--umbral", type=float, default=UMBRAL)
+    p_correr.add_argument("--piso-ms", type=float, default=PISO_MS)
+    p_hijo = comandos.add_parser("hijo") # una repetición (lo lanza `correr`)
+    p_hijo.add_argument("expresion")
+    p_hijo.add_argument("--modo", choices=["etapas", "completo"], default="etapas")
+    p_comparar = comandos.add_parser("comparar", help="comparar dos resultados guardados")
+    p_comparar.add_argument("base")
+    p_comparar.add_argument("nuevo")
+    p_comparar.add_argument("--umbral", type=float, default=UMBRAL)
+    p_comparar.add_argument("--piso-ms", type=float, default=PISO_MS)
+    args = parser.parse_args()
+
+    if args.comando == "hijo":
+        hijo(args.expresion, args.modo)
+    if args.comando == "comparar":
+        regresiones = comparar(leer(args.base), leer(args.nuevo), args.umbral, args.piso_ms)
+        sys.exit(1 if regresiones else 0)
+
+    datos = correr(leer_corpus(args.corpus, args.categoria), args.repeticiones)
+    mostrar_resumen(datos)
+    if args.guardar:
+        with open(args.guardar, "w", encoding="utf-8") as archivo:
+            json.dump(datos, archivo, indent=1, ensure_ascii=False)
+    if args.comparar:
+        print()
+        regresiones = comparar(leer(args.comparar), datos, args.umbral, args.piso_ms)
+        sys.exit(1 if regresiones else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# Benchmark: evaluación punto por punto con subs contra la función compilada.
+# Uso: python benchmarks/bench_evaluacion.py
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import operations # noqa: E402
+
+EXPRESIONES = {
+    "polinomio": "x^5 - 3*x^3 + 2*x - 7",
+    "trigonometrica": "sin(x) + cos(2*x) - tan(x/3)",
+    "anidada": "exp(sin(x^2 + 1)) / (1 + log(1 + cos(x)^2))",
+}
+
+def medir(funcion, repeticiones):
+    # Devuelve el mejor tiempo (en segundos) de varias repeticiones
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+def main():
+    x_vals = np.linspace(-10, 10, 400)
+    print(f"{'expresión':<16}{'subs (ms)':>12}{'compilada (ms)':>16}{'aceleración':>14}")
+    for nombre, texto in EXPRESIONES.items():
+        funcion = operations.convertir_texto_a_funcion(texto)
+
+        def con_subs():
+            return [complex(operations.evaluar_funcion(funcion, v)) for v in x_vals]
+
+        def compilada():
+            return operations.evaluar_en_arreglo(funcion, x_vals)
+
+        compilada() # La primera llamada incluye la compilación
+        t_subs = medir(con_subs, 2)
+        t_comp = medir(compilada, 20)
+        print(f"{nombre:<16}{t_subs * 1000:>12.2f}{t_comp * 1000:>16.3f}{t_subs / t_comp:>13.0f}x")
+
+if __name__ == "__main__":
+    main()
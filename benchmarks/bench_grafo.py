@@ -0,0 +1,63 @@
+# Benchmark: análisis con los nodos de tareas.NODOS en un solo proceso (uno
+# detrás de otro) contra varios procesos (los independientes a la vez).
+# Para cada función se imprime el tiempo total y la línea de tiempo de cada
+# nodo (inicio y fin desde el pedido, y segundos de cálculo en su proceso):
+# con varios procesos, "criticos" e "inflexion" deberían solaparse.
+# Cada medición usa procesos nuevos (sin caches de análisis anteriores),
+# ya arrancados antes de medir. El solapamiento solo acelera si hay núcleos libres.
+# Uso: python benchmarks/bench_grafo.py [--procesos 3]
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import operations # noqa: E402
+import tareas # noqa: E402
+
+EXPRESIONES = [
+    "x^3 - 3*x",
+    "sin(x) + cos(2*x)",
+    "x*exp(-x^2) + sin(x)/3",
+    "log(x^2 + 1) - x/4",
+]
+
+def medir(texto, procesos):
+    # Devuelve (segundos totales, tiempos por nodo)
+    trabajador = tareas.Trabajador(procesos)
+    try:
+        # Un análisis trivial para no medir el arranque de los procesos
+        # (cada uno se calienta solo antes de avisar que está listo)
+        tareas.analizar_esperando(trabajador, operations.convertir_texto_a_funcion("x"))
+        inicio = time.perf_counter()
+        _, tiempos = tareas.analizar_esperando(trabajador, operations.convertir_texto_a_funcion(texto))
+        return time.perf_counter() - inicio, tiempos
+    finally:
+        trabajador.cerrar()
+
+def mostrar_tiempos(tiempos):
+    for nodo, _, _ in tareas.NODOS:
+        if nodo in tiempos:
+            inicio, fin, calculo = tiempos[nodo]
+            print(f"    {nodo:<12}{inicio * 1000:>9.0f}{fin * 1000:>9.0f}{calculo * 1000:>10.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Nodos del análisis en serie contra en paralelo")
+    parser.add_argument("--procesos", type=int, default=3)
+    args = parser.parse_args()
+    print(f"Núcleos: {os.cpu_count()}")
+    for texto in EXPRESIONES:
+        serie, tiempos_serie = medir(texto, 1)
+        paralelo, tiempos_paralelo = medir(texto, args.procesos)
+        suma = sum(t[2] for t in tiempos_paralelo.values())
+        lento = max(t[2] for t in tiempos_paralelo.values())
+        print(f"{texto}: 1 proceso {serie * 1000:.0f} ms, {args.procesos} procesos {paralelo * 1000:.0f} ms "
+              f"(suma de nodos {suma * 1000:.0f} ms, el más lento {lento * 1000:.0f} ms)")
+        print(f"    {'nodo':<12}{'inicio':>9}{'fin':>9}{'cálculo':>10}   (ms, {args.procesos} procesos)")
+        mostrar_tiempos(tiempos_paralelo)
+        print(f"    {'':<12}{'':>9}{'':>9}{'':>10}   (ms, 1 proceso)")
+        mostrar_tiempos(tiempos_serie)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Benchmark: grilla fija de 400 puntos contra el muestreo adaptativo.
+# Para cada curva mostramos cuántos puntos usa cada método, cuánto tarda y el
+# error máximo de la línea dibujada (como % de la altura visible) comparado
+# con una grilla de referencia muy densa.
+# Uso: python benchmarks/bench_muestreo.py
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import operations # noqa: E402
+
+EXPRESIONES = {
+    "recta": "2*x + 1",
+    "cubica": "x^3 - 3*x",
+    "polo": "1/x",
+    "tangente": "tan(x)",
+    "raiz": "sqrt(4 - x^2)",
+    "oscilante": "sin(5*x) * exp(-x^2/20)",
+    "sin(1/x)": "sin(1/x)",
+}
+
+VENTANA = (-10.0, 10.0)
+PUNTOS_REFERENCIA = 200001
+
+def medir(funcion, repeticiones):
+    # Devuelve el mejor tiempo (en segundos) de varias repeticiones
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+def error_visible(xs, ys, x_ref, y_ref, limites):
+    # Error máximo entre la polilínea (xs, ys) y la referencia, recortando
+    # ambas a la parte visible y midiendo en fracción de la altura
+    bajo, alto = limites
+    interpolada = np.interp(x_ref, xs, ys)
+    with np.errstate(invalid='ignore'):
+        error = np.abs(np.clip(interpolada, bajo, alto) - np.clip(y_ref, bajo, alto)) / (alto - bajo)
+    error = error[np.isfinite(error)]
+    return float(error.max()) if len(error) else 0.0
+
+def main():
+    print(f"{'curva':<12}{'fija pts':>10}{'fija ms':>10}{'fija err%':>11}"
+          f"{'adapt pts':>11}{'adapt ms':>10}{'adapt err%':>12}")
+    for nombre, texto in EXPRESIONES.items():
+        funcion = operations.convertir_texto_a_funcion(texto)
+        a, b = VENTANA
+
+        def fija():
+            xs = np.linspace(a, b, 400)
+            return xs, operations.evaluar_en_arreglo(funcion, xs)
+
+        def adaptativa():
+            return operations.muestrear_funcion(funcion, a, b)
+
+        # Primera llamada: compila la función y calcula las singularidades
+        muestra = adaptativa()
+        x_fija, y_fija = fija()
+        t_fija = medir(fija, 20)
+        t_adapt = medir(adaptativa, 20)
+
+        x_ref = np.linspace(a, b, PUNTOS_REFERENCIA)
+        y_ref = operations.evaluar_en_arreglo(funcion, x_ref)
+        limites = muestra.limites_y
+        err_fija = error_visible(x_fija, y_fija, x_ref, y_ref, limites)
+        err_adapt = error_visible(muestra.xs, muestra.ys, x_ref, y_ref, limites)
+        print(f"{nombre:<12}{len(x_fija):>10}{t_fija * 1000:>10.2f}{err_fija * 100:>11.2f}"
+              f"{len(muestra.xs):>11}{t_adapt * 1000:>10.2f}{err_adapt * 100:>12.2f}")
+
+if __name__ == "__main__":
+    main()
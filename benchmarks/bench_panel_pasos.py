@@ -0,0 +1,83 @@
+# Benchmark: tiempo de dibujar el panel de pasos con 10, 100 y 1000 líneas.
+# Compara panel_pasos.PanelPasos (un solo tk.Text con etiquetas, carga por
+# bloques) con el panel anterior (un LabelFrame con un Frame y varios Labels
+# por línea), y mide también el cambio de tema del panel nuevo.
+# Necesita una pantalla (o Xvfb) porque crea una ventana de Tk.
+# Uso: python benchmarks/bench_panel_pasos.py
+
+import os
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import gui # noqa: E402  (solo por los temas)
+import panel_pasos # noqa: E402
+import steps # noqa: E402
+
+CANTIDADES = (10, 100, 1000)
+
+def generar_pasos(cantidad):
+    # Pasos parecidos a los de una función periódica con muchos puntos críticos
+    pasos = []
+    for i in range(cantidad):
+        punto = round(-10 + 20 * i / max(1, cantidad - 1), 10)
+        if i % 3 == 0:
+            pasos.append(steps.Evaluando(punto, "f''"))
+        elif i % 3 == 1:
+            pasos.append(steps.Evaluacion("f''", punto, -1.0))
+        else:
+            pasos.append(steps.FilaIntervalo(punto, punto + 0.5, "f'", punto + 0.25, 1, "CRECIENTE ↑"))
+    return pasos
+
+def panel_anterior(padre, tema, pasos):
+    # Lo que hacía gui.crear_seccion_paso: un Label por pedazo de cada línea
+    marco = tk.LabelFrame(padre, text="Pasos", bg=tema["bg_frame"], fg=tema["fg_title"])
+    marco.pack(fill=tk.X, expand=True, padx=10, pady=10)
+    for paso in pasos:
+        fila = tk.Frame(marco, bg=tema["bg_frame"])
+        fila.pack(fill=tk.X, pady=1)
+        for texto, _ in panel_pasos.piezas_de_paso(paso):
+            tk.Label(fila, text=texto, bg=tema["bg_frame"], fg=tema["fg_text"]).pack(side=tk.LEFT)
+    return marco
+
+def medir(ventana, accion):
+    inicio = time.perf_counter()
+    accion()
+    ventana.update()
+    return (time.perf_counter() - inicio) * 1000
+
+def main():
+    try:
+        ventana = tk.Tk()
+    except tk.TclError as e:
+        print(f"No se pudo abrir una ventana de Tk: {e}")
+        sys.exit(1)
+    ventana.geometry("450x600")
+    temas = list(gui.THEMES.values())
+
+    contenedor_nuevo = tk.Frame(ventana)
+    contenedor_nuevo.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    panel = panel_pasos.PanelPasos(contenedor_nuevo, temas[0])
+    ventana.update()
+
+    print(f"{'líneas':>8}{'anterior (ms)':>16}{'nuevo (ms)':>13}{'tema (ms)':>12}{'pendientes':>12}")
+    for cantidad in CANTIDADES:
+        pasos = generar_pasos(cantidad)
+
+        contenedor_viejo = tk.Frame(ventana)
+        contenedor_viejo.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        t_viejo = medir(ventana, lambda: panel_anterior(contenedor_viejo, temas[0], pasos))
+        contenedor_viejo.destroy()
+        ventana.update()
+
+        panel.limpiar()
+        t_nuevo = medir(ventana, lambda: panel.agregar_seccion("Pasos", pasos))
+        t_tema = medir(ventana, lambda: panel.aplicar_tema(temas[1]))
+        panel.aplicar_tema(temas[0])
+        print(f"{cantidad:>8}{t_viejo:>16.1f}{t_nuevo:>13.1f}{t_tema:>12.2f}{panel.lineas_pendientes():>12}")
+
+    ventana.destroy()
+
+if __name__ == "__main__":
+    main()
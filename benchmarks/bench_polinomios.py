@@ -0,0 +1,70 @@
+# Benchmark: camino general (sympy.diff + sympy.solve + lambdify) contra el
+# camino de coeficientes de polinomios.py, para grados 2 a 50.
+# Uso: python benchmarks/bench_polinomios.py
+
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import sympy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import operations # noqa: E402
+import polinomios # noqa: E402
+
+GRADOS = [2, 3, 4, 5, 8, 10, 20, 30, 50]
+LIMITE_SOLVE = 5.0 # segundos para el camino general
+
+def polinomio_aleatorio(grado, generador):
+    x = sympy.symbols('x')
+    coefs = [generador.randint(-9, 9) for _ in range(grado)]
+    return x**grado + sum(c * x**i for i, c in enumerate(coefs))
+
+def camino_general(funcion, x_vals):
+    # Lo que hacía operations antes del camino rápido
+    x = sympy.symbols('x')
+    d1 = sympy.diff(funcion, x)
+    d2 = sympy.diff(d1, x)
+    resultado = operations._solve_con_limite(d1, LIMITE_SOLVE, operations.VENTANA_NUMERICA)
+    operations._solve_con_limite(d2, LIMITE_SOLVE, operations.VENTANA_NUMERICA)
+    sympy.lambdify(x, funcion, "numpy")(x_vals)
+    return resultado is not None
+
+def camino_polinomio(funcion, x_vals):
+    coefs = polinomios.coeficientes(funcion)
+    d1 = polinomios.derivar(coefs)
+    d2 = polinomios.derivar(d1)
+    polinomios.raices_reales(d1)
+    polinomios.raices_reales(d2)
+    polinomios.compilar(coefs)(x_vals)
+    return True
+
+def main():
+    generador = random.Random(0)
+    x_vals = np.linspace(-10, 10, 400)
+    # Calentamos SymPy para no medir la primera importación de sus módulos
+    camino_polinomio(polinomio_aleatorio(3, generador), x_vals)
+    funciones = [polinomio_aleatorio(grado, generador) for grado in GRADOS]
+
+    # Primero todo el camino rápido: los solve abandonados del camino general
+    # siguen corriendo en segundo plano y lo harían parecer más lento
+    tiempos_poli = []
+    for funcion in funciones:
+        polinomios.coeficientes.cache_clear()
+        inicio = time.perf_counter()
+        camino_polinomio(funcion, x_vals)
+        tiempos_poli.append(time.perf_counter() - inicio)
+
+    print(f"{'grado':>6}{'general (s)':>14}{'polinomio (s)':>16}{'aceleración':>14}")
+    for grado, funcion, t_poli in zip(GRADOS, funciones, tiempos_poli):
+        inicio = time.perf_counter()
+        completo = camino_general(funcion, x_vals)
+        t_general = time.perf_counter() - inicio
+
+        marca = "" if completo else "  (solve superó el límite)"
+        print(f"{grado:>6}{t_general:>14.3f}{t_poli:>16.4f}{t_general / t_poli:>13.0f}x{marca}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# Benchmark: latencia de operations.resolver_ecuacion sobre ecuaciones difíciles.
+# Cada ecuación se mide en un proceso nuevo, porque un solve abandonado por
+# el tiempo límite sigue corriendo y ensuciaría las mediciones siguientes.
+# Uso: python benchmarks/bench_raices.py [limite_en_segundos]
+
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import operations # noqa: E402
+
+ECUACIONES = [
+    "5*x**4 + cos(x) - 3",
+    "20*x**3 - sin(x)",
+    "exp(x) - 6*x",
+    "x*sin(x) - 1",
+    "cos(x) - x",
+    "x**7 - 3*x**2 + sin(x)",
+    "log(x**2 + 1) - cos(3*x)",
+    "exp(-x**2)*cos(5*x) - x/10",
+    "tan(x) - x",
+    "x**5 - x + 1",
+]
+
+def medir(texto, limite):
+    expresion = operations.convertir_texto_a_funcion(texto)
+    inicio = time.perf_counter()
+    puntos, metodo = operations.resolver_ecuacion(expresion, limite=limite)
+    return time.perf_counter() - inicio, metodo, len(puntos)
+
+def main():
+    limite = float(sys.argv[1]) if len(sys.argv) > 1 else operations.TIEMPO_LIMITE_SOLVE
+    contexto = multiprocessing.get_context("spawn")
+    peor = 0.0
+    print(f"Tiempo límite de solve: {limite:g} s")
+    print(f"{'ecuación = 0':<32}{'tiempo (s)':>12}{'método':>10}{'raíces':>8}")
+    for texto in ECUACIONES:
+        with contexto.Pool(1) as pool:
+            tiempo, metodo, cantidad = pool.apply(medir, (texto, limite))
+            pool.terminate()
+        peor = max(peor, tiempo)
+        print(f"{texto:<32}{tiempo:>12.3f}{metodo:>10}{cantidad:>8}")
+    print(f"Peor caso: {peor:.3f} s")
+
+if __name__ == "__main__":
+    main()
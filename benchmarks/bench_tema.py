@@ -0,0 +1,75 @@
+# Benchmark: cuánto cuesta cambiar de tema con un análisis ya en pantalla.
+# El gráfico se prueba sin ventana (Agg, donde draw_idle dibuja en el acto):
+# el primer cambio a un tema redibuja la figura y los siguientes pegan el
+# fondo guardado de ese tema. Si hay pantalla, también se mide el panel de
+# pasos (solo reconfigura etiquetas). Ninguno de los dos vuelve a analizar.
+# Uso: python benchmarks/bench_tema.py
+
+import os
+import sys
+import time
+
+import matplotlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import operations # noqa: E402
+import grafico # noqa: E402
+import gui # noqa: E402  (solo por los temas)
+import steps # noqa: E402
+
+# gui elige TkAgg al importarse; aquí no hay ventana
+matplotlib.use('Agg')
+
+EXPRESIONES = ["x^3 - 3*x", "sin(x)", "1/x"]
+CAMBIOS = 20
+UN_CUADRO_MS = 1000 / 60
+
+def medir_ms(accion):
+    inicio = time.perf_counter()
+    accion()
+    return (time.perf_counter() - inicio) * 1000
+
+def medir_grafico(analisis, temas):
+    figura = grafico.Grafico(temas[0])
+    figura.mostrar(analisis)
+    primero = medir_ms(lambda: figura.aplicar_tema(temas[1]))
+    tiempos = [medir_ms(lambda: figura.aplicar_tema(temas[i % 2])) for i in range(CAMBIOS)]
+    return primero, sorted(tiempos)[len(tiempos) // 2]
+
+def medir_panel(analisis, temas):
+    # Devuelve la mediana en ms, o None si no hay pantalla
+    import tkinter as tk
+    import panel_pasos
+    try:
+        ventana = tk.Tk()
+    except tk.TclError:
+        return None
+    panel = panel_pasos.PanelPasos(ventana, temas[0])
+    for titulo, pasos in (("Derivadas", steps.pasos_derivadas(analisis)),
+                          ("Críticos", steps.pasos_puntos_criticos(analisis)),
+                          ("Crecimiento", steps.pasos_crecimiento(analisis))):
+        panel.agregar_seccion(titulo, pasos)
+    ventana.update()
+    tiempos = []
+    for i in range(CAMBIOS):
+        tiempos.append(medir_ms(lambda: (panel.aplicar_tema(temas[i % 2]), ventana.update_idletasks())))
+    ventana.destroy()
+    return sorted(tiempos)[len(tiempos) // 2]
+
+def main():
+    temas = list(gui.THEMES.values())
+    print(f"Un cuadro a 60 Hz: {UN_CUADRO_MS:.1f} ms")
+    print(f"{'función':<12}{'gráfico 1.º (ms)':>18}{'gráfico (ms)':>14}{'panel (ms)':>14}{'análisis nuevos':>17}")
+    for texto in EXPRESIONES:
+        analisis = operations.analizar(operations.convertir_texto_a_funcion(texto))
+        analisis.datos_grafico
+        antes = operations.cache_analisis.estadisticas()
+        primero, mediana = medir_grafico(analisis, temas)
+        panel = medir_panel(analisis, temas)
+        despues = operations.cache_analisis.estadisticas()
+        nuevos = (despues["aciertos"] + despues["fallos"]) - (antes["aciertos"] + antes["fallos"])
+        texto_panel = "sin pantalla" if panel is None else f"{panel:.2f}"
+        print(f"{texto:<12}{primero:>18.1f}{mediana:>14.2f}{texto_panel:>14}{nuevos:>17}")
+
+if __name__ == "__main__":
+    main()
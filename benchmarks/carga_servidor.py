@@ -0,0 +1,125 @@
+# Prueba de carga del servidor de análisis (servidor.py) en localhost.
+# Varios clientes en paralelo (hilos con http.client, conexión persistente)
+# mandan pedidos y se informan la latencia p50/p99, el rendimiento y los
+# códigos de respuesta. Dos escenarios:
+#   iguales:   todos piden la misma función a la vez (se junta en un cálculo)
+#   distintas: cada pedido es una función diferente (ejercita el pool y el 503)
+# Sin --url se lanza un servidor propio en un puerto libre y se cierra al final.
+# Uso: python benchmarks/carga_servidor.py [--clientes 30] [--pedidos 300] [--url http://127.0.0.1:8765]
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PLANTILLAS = ["x^3 - {k}*x", "x^4 - {k}*x^2", "sin({k}*x)", "exp(-x^2/{k})", "x/(x^2 + {k})"]
+
+def expresiones(escenario, cantidad):
+    if escenario == "iguales":
+        return ["x^3 - 3*x"] * cantidad
+    return [PLANTILLAS[i % len(PLANTILLAS)].format(k=i // len(PLANTILLAS) + 1) for i in range(cantidad)]
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+def cliente(host, puerto, cola, resultados, candado):
+    conexion = http.client.HTTPConnection(host, puerto, timeout=120)
+    while True:
+        with candado:
+            if not cola:
+                break
+            texto = cola.pop()
+        cuerpo = json.dumps({"expresion": texto, "pasos": False})
+        inicio = time.perf_counter()
+        try:
+            conexion.request("POST", "/analizar", cuerpo, {"Content-Type": "application/json"})
+            respuesta = conexion.getresponse()
+            respuesta.read()
+            estado = respuesta.status
+            if respuesta.getheader("Connection", "").lower() == "close":
+                conexion.close()
+        except (OSError, http.client.HTTPException):
+            conexion.close()
+            estado = "error"
+        with candado:
+            resultados.append((estado, time.perf_counter() - inicio))
+    conexion.close()
+
+def correr(host, puerto, escenario, clientes, pedidos):
+    cola = expresiones(escenario, pedidos)
+    resultados = []
+    candado = threading.Lock()
+    hilos = [threading.Thread(target=cliente, args=(host, puerto, cola, resultados, candado)) for _ in range(clientes)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    total = time.perf_counter() - inicio
+
+    latencias = [t * 1000 for estado, t in resultados if estado == 200]
+    codigos = {}
+    for estado, _ in resultados:
+        codigos[estado] = codigos.get(estado, 0) + 1
+    texto_codigos = ", ".join(f"{codigo}: {cantidad}" for codigo, cantidad in sorted(codigos.items(), key=str))
+    print(f"{escenario}: {len(resultados)} pedidos en {total:.2f} s ({len(resultados) / total:.1f} pedidos/s)  [{texto_codigos}]")
+    if latencias:
+        print(f"  latencia de los 200: p50 {percentil(latencias, 50):.1f} ms, p99 {percentil(latencias, 99):.1f} ms")
+
+def estado_servidor(host, puerto):
+    conexion = http.client.HTTPConnection(host, puerto, timeout=10)
+    conexion.request("GET", "/estado")
+    estado = json.loads(conexion.getresponse().read())
+    conexion.close()
+    return estado
+
+def lanzar_servidor(procesos):
+    # Servidor propio en un puerto libre; devuelve (proceso, puerto)
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        puerto = s.getsockname()[1]
+    argumentos = [sys.executable, os.path.join(RAIZ, "servidor.py"), "--puerto", str(puerto)]
+    if procesos:
+        argumentos += ["-j", str(procesos)]
+    proceso = subprocess.Popen(argumentos, cwd=RAIZ, stdout=subprocess.PIPE, text=True)
+    proceso.stdout.readline() # "grafi escuchando en ..."
+    return proceso, puerto
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor de grafi")
+    parser.add_argument("--url", help="servidor ya en marcha (por defecto se lanza uno)")
+    parser.add_argument("--clientes", type=int, default=30)
+    parser.add_argument("--pedidos", type=int, default=300)
+    parser.add_argument("-j", "--procesos", type=int, default=None, help="procesos del servidor lanzado")
+    parser.add_argument("--escenario", choices=["iguales", "distintas", "ambos"], default="ambos")
+    args = parser.parse_args()
+
+    proceso = None
+    if args.url:
+        partes = urlsplit(args.url)
+        host, puerto = partes.hostname, partes.port or 80
+    else:
+        proceso, puerto = lanzar_servidor(args.procesos)
+        host = "127.0.0.1"
+    try:
+        escenarios = ["iguales", "distintas"] if args.escenario == "ambos" else [args.escenario]
+        for escenario in escenarios:
+            correr(host, puerto, escenario, args.clientes, args.pedidos)
+        estado = estado_servidor(host, puerto)
+        print("servidor: " + ", ".join(f"{k} {v}" for k, v in estado.items()))
+    finally:
+        if proceso is not None:
+            proceso.terminate()
+            proceso.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Prueba de resistencia del gráfico: muestra miles de análisis seguidos en la
+# misma figura (grafico.Grafico, sin ventana) y va imprimiendo la memoria
+# residente (RSS) del proceso. Con la figura persistente la memoria se
+# estabiliza; con --pyplot se repite lo que hacía antes la interfaz (una
+# figura nueva de pyplot por análisis, nunca cerrada) para comparar.
+# Uso: python benchmarks/soak_grafico.py [--iteraciones 2000] [--pyplot]
+
+import argparse
+import os
+import sys
+import time
+
+import matplotlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import operations # noqa: E402
+import grafico # noqa: E402
+import gui # noqa: E402  (solo por los temas)
+
+# gui elige TkAgg al importarse; aquí no hay ventana
+matplotlib.use('Agg')
+
+EXPRESIONES = [
+    "x^3 - 3*x",
+    "x^4 - 2*x^2",
+    "sin(x)",
+    "1/x",
+    "exp(-x^2)",
+    "x^5 - 5*x^3 + 4*x",
+    "tan(x)",
+    "sqrt(4 - x^2)",
+]
+
+def memoria_residente():
+    # RSS actual en MB (Linux); en otros sistemas, el máximo alcanzado
+    try:
+        with open("/proc/self/statm") as archivo:
+            paginas = int(archivo.read().split()[1])
+        return paginas * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def graficar_con_pyplot(analisis, tema):
+    # Lo que hacía gui.graficar_en_ventana antes de grafico.Grafico
+    import matplotlib.pyplot as plt
+    figura = plt.figure(figsize=(5, 4), dpi=100, facecolor=tema["graph_bg"])
+    ax = figura.add_subplot(111)
+    x_vals, y_vals = analisis.datos_grafico
+    ax.plot(x_vals, y_vals, label='f(x)', linewidth=2)
+    for x_max, y_max in analisis.marcadores_maximos:
+        ax.plot(x_max, y_max, 'ro', markersize=8)
+        ax.text(x_max, y_max, 'Max', fontsize=9, color='red', verticalalignment='bottom')
+    ax.legend()
+    figura.tight_layout()
+    figura.canvas.draw()
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de resistencia del gráfico")
+    parser.add_argument("--iteraciones", type=int, default=2000)
+    parser.add_argument("--pyplot", action="store_true", help="usar una figura de pyplot nueva en cada análisis")
+    args = parser.parse_args()
+
+    # Los análisis se calculan una vez (quedan en la cache de operations);
+    # lo que se prueba aquí es el gráfico
+    analisis = [operations.analizar(operations.convertir_texto_a_funcion(t)) for t in EXPRESIONES]
+    for a in analisis:
+        a.datos_grafico
+
+    temas = list(gui.THEMES.values())
+    figura = None if args.pyplot else grafico.Grafico(temas[0])
+    inicio = time.perf_counter()
+    print(f"{'iteración':>10}{'RSS (MB)':>12}{'ms/gráfico':>13}")
+    parcial = time.perf_counter()
+    for i in range(1, args.iteraciones + 1):
+        actual = analisis[i % len(analisis)]
+        tema = temas[(i // 50) % len(temas)]
+        if args.pyplot:
+            graficar_con_pyplot(actual, tema)
+        else:
+            if i % 50 == 0:
+                figura.aplicar_tema(tema)
+            figura.mostrar(actual)
+        if i % 250 == 0:
+            ms = (time.perf_counter() - parcial) * 1000 / 250
+            print(f"{i:>10}{memoria_residente():>12.1f}{ms:>13.2f}")
+            parcial = time.perf_counter()
+    print(f"Total: {time.perf_counter() - inicio:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+import sympy
+
+# Cache en disco (SQLite) de los análisis de operations.py.
+# Guarda las derivadas, raíces y signos de intervalos ya calculados para que
+# al volver a abrir grafi no se repita el trabajo simbólico. Varios procesos
+# pueden leer y escribir a la vez: usamos el modo WAL de SQLite y cada
+# operación abre su propia conexión con tiempo de espera.
+#
+# Uso desde la terminal:
+#   python cache_disco.py info
+#   python cache_disco.py listar
+#   python cache_disco.py limpiar
+
+# Si cambia la forma de guardar los datos, subimos este número y las
+# entradas viejas dejan de coincidir (y terminan desalojadas).
+VERSION_FORMATO = "8"
+
+RUTA_POR_DEFECTO = os.path.join(os.path.expanduser("~"), ".cache", "grafi", "analisis.sqlite3")
+MAX_BYTES_POR_DEFECTO = 64 * 1024 * 1024
+
+# La hora del último acceso (para desalojar lo menos usado) no se escribe en
+# cada lectura: se junta y se guarda de una vez al escribir, o cuando hay
+# muchas pendientes o pasó un rato
+ACCESOS_POR_LOTE = 32
+INTERVALO_ACCESOS = 60.0 # s
+
+# Partes del análisis que vale la pena guardar (las caras de calcular)
+PARTES_GUARDADAS = (
+    "primera_derivada",
+    "segunda_derivada",
+    "puntos_criticos",
+    "metodo_criticos",
+    "clasificacion",
+    "criterio_primera_derivada",
+    "derivadas_superiores",
+    "maximos",
+    "minimos",
+    "candidatos_inflexion",
+    "puntos_inflexion",
+    "metodo_inflexion",
+    "intervalos_crecimiento",
+    "intervalos_concavidad",
+)
+
+def calcular_clave(forma_canonica):
+    # Hash estable de la expresión canónica junto con las versiones que
+    # afectan el resultado (formato de la cache y versión de SymPy)
+    texto = forma_canonica + "|" + VERSION_FORMATO + "|" + sympy.__version__
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+def _tipos_guardados():
+    # Tuplas con nombre que aparecen en las partes guardadas; se vuelven a
+    # armar al leer para que quien las use pueda pedir fila.inicio, etc.
+    import operations
+    return {"FilaSigno": operations.FilaSigno}
+
+@lru_cache(maxsize=1)
+def _constructores():
+    # Clases de SymPy con las que se vuelven a armar las expresiones: el
+    # archivo lo comparten muchos procesos, así que no evaluamos nada de lo
+    # que trae (ni sympify ni eval), solo llamamos a estas clases
+    clases = {}
+    pendientes = [sympy.Basic]
+    while pendientes:
+        clase = pendientes.pop()
+        pendientes.extend(clase.__subclasses__())
+        if clase.__module__.startswith("sympy."):
+            clases.setdefault(clase.__name__, clase)
+    return clases
+
+def _expresion_a_json(valor):
+    # Árbol de la expresión: {"e": [clase, argumentos...]}, con los átomos
+    # (números, símbolos, constantes) guardados como datos
+    if isinstance(valor, sympy.Integer):
+        return {"e": ["Integer", str(valor.p)]}
+    if isinstance(valor, sympy.Rational):
+        return {"e": ["Rational", str(valor.p), str(valor.q)]}
+    if isinstance(valor, sympy.Float):
+        signo, mantisa, exponente, bits = valor._mpf_
+        return {"e": ["Float", signo, format(int(mantisa), "x"), exponente, bits, valor._prec]}
+    if isinstance(valor, sympy.Symbol):
+        supuestos = getattr(valor, "_assumptions_orig", None)
+        if supuestos is None:
+            supuestos = valor.assumptions0
+        return {"e": ["Symbol", valor.name, dict(supuestos)]}
+    if len(valor.args) == 0:
+        # pi, E, oo, I, zoo, true...: únicos, se buscan por nombre en S
+        return {"e": ["S", type(valor).__name__]}
+    return {"e": [type(valor).__name__] + [_expresion_a_json(a) for a in valor.args]}
+
+def _expresion_desde_json(datos):
+    tipo = datos[0]
+    if tipo == "Integer":
+        return sympy.Integer(int(datos[1]))
+    if tipo == "Rational":
+        return sympy.Rational(int(datos[1]), int(datos[2]))
+    if tipo == "Float":
+        signo, mantisa, exponente, bits, precision = datos[1:]
+        return sympy.Float((signo, mantisa, exponente, bits), precision=precision)
+    if tipo == "Symbol":
+        return sympy.Symbol(datos[1], **datos[2])
+    if tipo == "S":
+        constante = getattr(sympy.S, datos[1], None)
+        if datos[1].startswith("_") or not isinstance(constante, sympy.Basic):
+            raise ValueError("constante desconocida: " + datos[1])
+        return constante
+    clase = _constructores().get(tipo)
+    if clase is None:
+        raise ValueError("clase desconocida: " + tipo)
+    return clase(*[_expresion_desde_json(a["e"]) for a in datos[1:]])
+
+def _a_json(valor):
+    if isinstance(valor, sympy.Basic):
+        return _expresion_a_json(valor)
+    if isinstance(valor, tuple) and hasattr(valor, "_fields"):
+        return {"t": type(valor).__name__, "v": [_a_json(v) for v in valor]}
+    if isinstance(valor, (tuple, list)):
+        return [_a_json(v) for v in valor]
+    return valor
+
+def _desde_json(valor, tipos):
+    if isinstance(valor, dict):
+        if "t" in valor:
+            return tipos[valor["t"]](*[_desde_json(v, tipos) for v in valor["v"]])
+        return _expresion_desde_json(valor["e"])
+    if isinstance(valor, list):
+        return tuple(_desde_json(v, tipos) for v in valor)
+    return valor
+
+def serializar(partes):
+    return json.dumps({nombre: _a_json(valor) for nombre, valor in partes.items()})
+
+def deserializar(texto):
+    tipos = _tipos_guardados()
+    return {nombre: _desde_json(valor, tipos) for nombre, valor in json.loads(texto).items()}
+
+class CacheDisco:
+
+    def __init__(self, ruta=RUTA_POR_DEFECTO, max_bytes=MAX_BYTES_POR_DEFECTO):
+        self.ruta = ruta
+        self.max_bytes = max_bytes
+        self._accesos = {} # clave -> hora del último acceso, aún sin guardar
+        self._accesos_guardados = time.time()
+        self._lock = threading.Lock()
+        carpeta = os.path.dirname(ruta)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        with self._conectar() as conexion:
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("""
+                CREATE TABLE IF NOT EXISTS analisis (
+                    clave TEXT PRIMARY KEY,
+                    expresion TEXT NOT NULL,
+                    datos TEXT NOT NULL,
+                    bytes INTEGER NOT NULL,
+                    ultimo_acceso REAL NOT NULL
+                )""")
+            conexion.execute("CREATE INDEX IF NOT EXISTS idx_ultimo_acceso ON analisis (ultimo_acceso)")
+
+    def _conectar(self):
+        # Una conexión por operación: así se puede usar desde cualquier hilo
+        # y los bloqueos de otros procesos se esperan en lugar de fallar
+        return _Conexion(self.ruta)
+
+    def leer(self, forma_canonica):
+        # Devuelve el diccionario de partes guardadas, o None si no existe
+        clave = calcular_clave(forma_canonica)
+        with self._conectar() as conexion:
+            fila = conexion.execute("SELECT datos FROM analisis WHERE clave = ?", (clave,)).fetchone()
+        if fila is None:
+            return None
+        self._registrar_acceso(clave)
+        try:
+            return deserializar(fila[0])
+        except Exception:
+            # Entrada corrupta o ilegible: hacemos como si no existiera
+            return None
+
+    def escribir(self, forma_canonica, expresion, partes):
+        clave = calcular_clave(forma_canonica)
+        datos = serializar(partes)
+        with self._conectar() as conexion:
+            conexion.execute(
+                "INSERT OR REPLACE INTO analisis (clave, expresion, datos, bytes, ultimo_acceso) VALUES (?, ?, ?, ?, ?)",
+                (clave, expresion, datos, len(datos), time.time()))
+            self._guardar_accesos(conexion)
+            self._desalojar(conexion)
+
+    def _registrar_acceso(self, clave):
+        ahora = time.time()
+        with self._lock:
+            self._accesos[clave] = ahora
+            pendientes = len(self._accesos) >= ACCESOS_POR_LOTE or ahora - self._accesos_guardados > INTERVALO_ACCESOS
+        if pendientes:
+            self.guardar_accesos()
+
+    def guardar_accesos(self):
+        # Escribe de una vez las horas de acceso pendientes
+        with self._conectar() as conexion:
+            self._guardar_accesos(conexion)
+
+    def _guardar_accesos(self, conexion):
+        with self._lock:
+            accesos = list(self._accesos.items())
+            self._accesos.clear()
+            self._accesos_guardados = time.time()
+        if accesos:
+            conexion.executemany("UPDATE analisis SET ultimo_acceso = ? WHERE clave = ?",
+                                 [(hora, clave) for clave, hora in accesos])
+
+    def _desalojar(self, conexion):
+        # Borramos las entradas usadas hace más tiempo hasta caber en max_bytes
+        total = conexion.execute("SELECT COALESCE(SUM(bytes), 0) FROM analisis").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        borradas = 0
+        filas = conexion.execute("SELECT clave, bytes FROM analisis ORDER BY ultimo_acceso").fetchall()
+        for clave, tamano in filas:
+            if total <= self.max_bytes:
+                break
+            conexion.execute("DELETE FROM analisis WHERE clave = ?", (clave,))
+            total -= tamano
+            borradas += 1
+        return borradas
+
+    def info(self):
+        with self._conectar() as conexion:
+            entradas, total = conexion.execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM analisis").fetchone()
+        return {"ruta": self.ruta, "entradas": entradas, "bytes": total, "max_bytes": self.max_bytes}
+
+    def listar(self):
+        with self._conectar() as conexion:
+            return conexion.execute(
+                "SELECT expresion, bytes, ultimo_acceso FROM analisis ORDER BY ultimo_acceso DESC").fetchall()
+
+    def limpiar(self):
+        with self._lock:
+            self._accesos.clear()
+        with self._conectar() as conexion:
+            conexion.execute("DELETE FROM analisis")
+        with self._conectar() as conexion:
+            conexion.execute("VACUUM")
+
+class _Conexion:
+    # Abre una conexión, confirma la transacción al salir y siempre la cierra
+
+    def __init__(self, ruta):
+        self.conexion = sqlite3.connect(ruta, timeout=10)
+
+    def __enter__(self):
+        return self.conexion
+
+    def __exit__(self, tipo, valor, traza):
+        try:
+            if tipo is None:
+                self.conexion.commit()
+            else:
+                self.conexion.rollback()
+        finally:
+            self.conexion.close()
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Cache en disco de análisis de grafi")
+    parser.add_argument("--ruta", default=os.environ.get("GRAFI_CACHE", RUTA_POR_DEFECTO))
+    parser.add_argument("accion", choices=["info", "listar", "limpiar"])
+    args = parser.parse_args(argumentos)
+
+    cache = CacheDisco(args.ruta)
+    if args.accion == "info":
+        for nombre, valor in cache.info().items():
+            print(f"{nombre}: {valor}")
+    elif args.accion == "listar":
+        for expresion, tamano, acceso in cache.listar():
+            fecha = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(acceso))
+            print(f"{fecha}  {tamano:>8} B  {expresion}")
+    else:
+        cache.limpiar()
+        print("Cache vaciada.")
+
+if __name__ == "__main__":
+    main()
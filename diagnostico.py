@@ -0,0 +1,149 @@
+import tkinter as tk
+from tkinter import filedialog, messagebox
+
+import instrumentacion
+import tareas
+
+# Aquí está la ventana de diagnóstico: tiempos por etapa (de este proceso y
+# de los procesos de tareas), aciertos de las caches, la línea de tiempo del
+# último análisis por nodo, y botones para exportar (JSON o traza de Chrome)
+# y para perfilar un análisis con cProfile.
+# Mientras está abierta la instrumentación está encendida; al cerrarla se apaga.
+
+INTERVALO_ACTUALIZACION = 500 # ms
+INTERVALO_PERFIL = 50 # ms entre revisiones del perfil en curso
+FUENTE = ("Courier", 10)
+
+class VentanaDiagnostico:
+
+    def __init__(self, master, tema, trabajador, funcion_actual, al_cerrar=None):
+        # `funcion_actual()` devuelve la expresión de sympy a perfilar (o None)
+        self.trabajador = trabajador
+        self.funcion_actual = funcion_actual
+        self.al_cerrar = al_cerrar
+        self.actualizacion = None
+        self.revision_perfil = None
+
+        self.ventana = tk.Toplevel(master)
+        self.ventana.title("grafi - diagnóstico")
+        self.ventana.geometry("640x520")
+        self.ventana.protocol("WM_DELETE_WINDOW", self.cerrar)
+
+        self.botonera = tk.Frame(self.ventana, padx=10, pady=8)
+        self.botonera.pack(side=tk.TOP, fill=tk.X)
+        self.botones = []
+        self.btn_perfilar = None
+        for texto, comando in (("Reiniciar", self.reiniciar), ("Exportar JSON", self.exportar_json),
+                               ("Exportar traza", self.exportar_chrome), ("Perfilar", self.perfilar)):
+            boton = tk.Button(self.botonera, text=texto, command=comando, font=("Arial", 9, "bold"),
+                              relief=tk.FLAT, padx=10, pady=3, cursor="hand2")
+            boton.pack(side=tk.LEFT, padx=(0, 8))
+            self.botones.append(boton)
+        self.btn_perfilar = self.botones[-1]
+
+        self.scrollbar = tk.Scrollbar(self.ventana, orient="vertical")
+        self.texto = tk.Text(self.ventana, wrap="none", bd=0, highlightthickness=0, padx=10, pady=10,
+                             font=FUENTE, state="disabled", yscrollcommand=self.scrollbar.set)
+        self.scrollbar.configure(command=self.texto.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.texto.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.aplicar_tema(tema)
+        instrumentacion.activar()
+        self.actualizar()
+
+    def aplicar_tema(self, tema):
+        self.ventana.configure(bg=tema["bg_window"])
+        self.botonera.configure(bg=tema["bg_window"])
+        for boton in self.botones:
+            boton.configure(bg=tema["bg_button"], fg=tema["fg_button"])
+        self.texto.configure(bg=tema["bg_frame"], fg=tema["fg_text"])
+
+    def contenido(self):
+        lineas = [instrumentacion.texto_resumen()]
+        tiempos = self.trabajador.tiempos
+        if tiempos:
+            lineas += ["", f"{'último análisis':<28}{'inicio':>9}{'fin':>12}{'cálculo':>11}   (ms)"]
+            for nodo, _, _ in tareas.NODOS:
+                if nodo in tiempos:
+                    inicio, fin, calculo = tiempos[nodo]
+                    lineas.append(f"{nodo:<28}{inicio * 1000:>9.0f}{fin * 1000:>12.0f}{calculo * 1000:>11.0f}")
+        return "\n".join(lineas)
+
+    def mostrar(self, texto):
+        posicion = self.texto.yview()[0]
+        self.texto.configure(state="normal")
+        self.texto.delete("1.0", tk.END)
+        self.texto.insert("1.0", texto)
+        self.texto.configure(state="disabled")
+        self.texto.yview_moveto(posicion)
+
+    def actualizar(self):
+        self.mostrar(self.contenido())
+        self.actualizacion = self.ventana.after(INTERVALO_ACTUALIZACION, self.actualizar)
+
+    def detener(self):
+        if self.actualizacion is not None:
+            self.ventana.after_cancel(self.actualizacion)
+            self.actualizacion = None
+
+    def reiniciar(self):
+        # También vuelve a la vista que se actualiza sola (después de perfilar)
+        instrumentacion.reiniciar()
+        self.detener()
+        self.actualizar()
+
+    def exportar_json(self):
+        ruta = filedialog.asksaveasfilename(parent=self.ventana, defaultextension=".json",
+                                            initialfile="grafi-tiempos.json", filetypes=[("JSON", "*.json")])
+        if ruta:
+            instrumentacion.exportar_json(ruta)
+
+    def exportar_chrome(self):
+        # Se abre en chrome://tracing o en https://ui.perfetto.dev
+        ruta = filedialog.asksaveasfilename(parent=self.ventana, defaultextension=".json",
+                                            initialfile="grafi-traza.json", filetypes=[("Traza", "*.json")])
+        if ruta:
+            instrumentacion.exportar_chrome(ruta)
+
+    def perfilar(self):
+        # Un análisis completo de la función actual (sin la cache de análisis)
+        # con cProfile, en un proceso aparte de tareas (NODO_PERFIL): la ventana sigue
+        # respondiendo y los tiempos por etapa llegan con el resultado.
+        funcion = self.funcion_actual()
+        if funcion is None:
+            messagebox.showinfo("Diagnóstico", "Primero analice una función.", parent=self.ventana)
+            return
+
+        ruta = filedialog.asksaveasfilename(parent=self.ventana, defaultextension=".prof",
+                                            initialfile="grafi.prof", filetypes=[("cProfile", "*.prof")])
+        self.detener()
+        self.trabajador.enviar_aparte(tareas.NODO_PERFIL, funcion, ruta or None)
+        self.btn_perfilar.configure(state="disabled")
+        self.ventana.configure(cursor="watch")
+        self.mostrar(self.contenido() + "\n\nPerfilando...")
+        self.revisar_perfil()
+
+    def revisar_perfil(self):
+        self.revision_perfil = None
+        mensaje = self.trabajador.recibir_aparte(tareas.NODO_PERFIL)
+        if mensaje is None:
+            self.revision_perfil = self.ventana.after(INTERVALO_PERFIL, self.revisar_perfil)
+            return
+        self.btn_perfilar.configure(state="normal")
+        self.ventana.configure(cursor="")
+        tipo, texto = mensaje
+        if tipo == "error":
+            texto = "No se pudo perfilar: " + texto
+        self.mostrar(self.contenido() + "\n\n" + texto)
+
+    def cerrar(self):
+        if self.revision_perfil is not None:
+            self.ventana.after_cancel(self.revision_perfil)
+            self.revision_perfil = None
+            self.trabajador.cancelar_aparte(tareas.NODO_PERFIL)
+        self.detener()
+        instrumentacion.desactivar()
+        self.ventana.destroy()
+        if self.al_cerrar is not None:
+            self.al_cerrar()
@@ -0,0 +1,258 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing.connection import wait
+
+import operations
+import steps
+
+# Aquí está el análisis por lotes desde la línea de comandos, sin interfaz
+# (no se importa tkinter ni matplotlib). Lee una expresión por línea de un
+# archivo o de la entrada estándar, las analiza en varios procesos y escribe
+# un resultado JSON por línea (JSONL) a medida que van saliendo.
+# Uso: python -m grafi ejercicios.txt -o resultados.jsonl [-j 8] [--tiempo-limite 60] [--desordenado]
+#
+# Cada proceso tiene su propia tubería con este proceso. No usamos
+# multiprocessing.Pool porque no deja cancelar una sola tarea: cuando una
+# expresión pasa su tiempo límite, matamos ese proceso (igual que en
+# tareas.Trabajador) y lo reemplazamos por uno nuevo.
+
+TIEMPO_LIMITE_POR_DEFECTO = 60.0 # s por expresión
+INTERVALO_REVISION = 0.1 # s entre revisiones de los tiempos límite
+
+def _numero(valor):
+    # Aproximación decimal de un valor de SymPy, o None si no es un real finito
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        return None
+    if numero != numero or numero in (float("inf"), float("-inf")):
+        return None
+    return numero
+
+def _punto(x, y=None):
+    punto = {"x": str(x), "x_aprox": _numero(x)}
+    if y is not None:
+        punto["y"] = str(y)
+        punto["y_aprox"] = _numero(y)
+    return punto
+
+def _fila(fila):
+    # Una fila de operations.tabla_de_signos (None en un extremo es infinito)
+    return {"inicio": fila.inicio, "fin": fila.fin, "x_prueba": fila.x_prueba, "signo": fila.signo}
+
+def resultado_json(analisis, con_pasos=True):
+    # Aquí pasamos un operations.Analisis a un diccionario que se puede
+    # escribir como JSON: las expresiones van como texto de SymPy y los
+    # puntos llevan además su aproximación decimal.
+    resultado = {
+        "funcion": str(analisis.funcion),
+        "primera_derivada": str(analisis.primera_derivada),
+        "segunda_derivada": str(analisis.segunda_derivada),
+        "puntos_criticos": [_punto(p) for p in analisis.puntos_criticos],
+        "metodo_criticos": analisis.metodo_criticos,
+        "clasificacion": [{"punto": _punto(p), "segunda_derivada": str(evaluacion), "tipo": tipo}
+                          for p, evaluacion, tipo, _ in analisis.clasificacion],
+        "maximos": [_punto(x, y) for x, y in analisis.maximos],
+        "minimos": [_punto(x, y) for x, y in analisis.minimos],
+        "candidatos_inflexion": [_punto(p) for p in analisis.candidatos_inflexion],
+        "puntos_inflexion": [_punto(p) for p in analisis.puntos_inflexion],
+        "metodo_inflexion": analisis.metodo_inflexion,
+        "intervalos_crecimiento": [_fila(f) for f in analisis.intervalos_crecimiento],
+        "intervalos_concavidad": [_fila(f) for f in analisis.intervalos_concavidad],
+    }
+    if con_pasos:
+        resultado["pasos"] = {
+            "derivadas": steps.explicar_derivadas(analisis),
+            "criticos": steps.explicar_puntos_criticos(analisis),
+            "inflexion": steps.obtener_texto_inflexion(analisis),
+            "crecimiento": steps.obtener_intervalos_crecimiento(analisis),
+            "concavidad": steps.obtener_intervalos_concavidad(analisis),
+        }
+    return resultado
+
+def analizar_texto(texto, con_pasos=True):
+    # Análisis completo de una expresión escrita por el usuario.
+    # "estado" es "ok", "invalida" o "error" ("tiempo_agotado" lo pone el pool).
+    funcion = operations.convertir_texto_a_funcion(texto)
+    if funcion is None:
+        return {"expresion": texto, "estado": "invalida"}
+    try:
+        resultado = resultado_json(operations.analizar(funcion), con_pasos)
+    except Exception as e:
+        return {"expresion": texto, "estado": "error", "error": str(e)}
+    return {"expresion": texto, "estado": "ok", **resultado}
+
+def leer_expresiones(archivo):
+    # Una expresión por línea; se saltan las vacías y las que empiezan con #
+    for linea in archivo:
+        linea = linea.strip()
+        if linea and not linea.startswith("#"):
+            yield linea
+
+def _bucle_proceso(conexion):
+    # Corre en cada proceso del pool: recibe (indice, texto, con_pasos) y
+    # devuelve (indice, resultado, reiniciar). Antes avisa que ya terminó de
+    # importar, para que el tiempo límite no cuente el arranque del proceso.
+    conexion.send(None)
+    while True:
+        try:
+            pedido = conexion.recv()
+        except EOFError:
+            break
+        if pedido is None:
+            break
+        indice, texto, con_pasos = pedido
+        inicio = time.perf_counter()
+        resultado = analizar_texto(texto, con_pasos)
+        resultado["segundos"] = round(time.perf_counter() - inicio, 4)
+        # Un solve abandonado (ver operations.resolver_ecuacion) sigue gastando
+        # CPU: este proceso se despide y el pool crea otro
+        reiniciar = operations.hay_calculos_abandonados()
+        conexion.send((indice, resultado, reiniciar))
+        if reiniciar:
+            break
+
+class _Ranura:
+    # Un proceso del pool y la expresión que está analizando (si hay una).
+    # También la usa servidor.py.
+
+    def __init__(self, contexto, con_pasos=True):
+        self.conexion, extremo_hijo = contexto.Pipe()
+        self.proceso = contexto.Process(target=_bucle_proceso, args=(extremo_hijo,), daemon=True)
+        self.proceso.start()
+        extremo_hijo.close()
+        self.con_pasos = con_pasos
+        self.listo = False # Hasta que avisa, el proceso está importando
+        self.trabajo = None # (indice, texto)
+        self.inicio = None
+
+    def enviar(self, indice, texto, con_pasos=None):
+        if con_pasos is None:
+            con_pasos = self.con_pasos
+        self.trabajo = (indice, texto)
+        self.inicio = time.perf_counter()
+        self.conexion.send((indice, texto, con_pasos))
+
+    def matar(self):
+        if self.proceso.is_alive():
+            self.proceso.terminate()
+        self.proceso.join()
+        self.conexion.close()
+
+    def cerrar(self):
+        try:
+            self.conexion.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.proceso.join(timeout=1)
+        self.matar()
+
+def analizar_en_paralelo(expresiones, procesos=None, tiempo_limite=TIEMPO_LIMITE_POR_DEFECTO,
+                         con_pasos=True, ordenado=True):
+    # Generador de resultados (diccionarios de analizar_texto con "indice").
+    # Con ordenado=True salen en el orden de entrada; si no, apenas terminan.
+    # Las expresiones se leen de a poco, así que sirve con entradas enormes.
+    contexto = multiprocessing.get_context("spawn")
+    procesos = procesos or os.cpu_count() or 1
+    ranuras = [_Ranura(contexto, con_pasos) for _ in range(procesos)]
+    pendientes = enumerate(expresiones)
+    quedan = True
+    listos = {} # indice -> resultado (solo en modo ordenado)
+    siguiente = 0
+    try:
+        while True:
+            # Cada proceso libre recibe la expresión siguiente
+            for ranura in ranuras:
+                if ranura.listo and ranura.trabajo is None and quedan:
+                    try:
+                        ranura.enviar(*next(pendientes))
+                    except StopIteration:
+                        quedan = False
+            if not quedan and all(r.trabajo is None for r in ranuras):
+                break
+
+            terminados = []
+            esperando = [r.conexion for r in ranuras if not r.listo or r.trabajo is not None]
+            listas = wait(esperando, timeout=INTERVALO_REVISION)
+            for i, ranura in enumerate(ranuras):
+                if not ranura.listo:
+                    if ranura.conexion in listas:
+                        try:
+                            ranura.conexion.recv()
+                        except EOFError:
+                            raise RuntimeError("no se pudo iniciar un proceso de análisis")
+                        ranura.listo = True
+                    continue
+                if ranura.trabajo is None:
+                    continue
+                indice, texto = ranura.trabajo
+                if ranura.conexion in listas:
+                    try:
+                        _, resultado, reiniciar = ranura.conexion.recv()
+                    except EOFError:
+                        # El proceso murió (por ejemplo, sin memoria)
+                        resultado = {"expresion": texto, "estado": "error", "error": "el proceso terminó inesperadamente"}
+                        reiniciar = True
+                elif time.perf_counter() - ranura.inicio > tiempo_limite:
+                    resultado = {"expresion": texto, "estado": "tiempo_agotado"}
+                    resultado["segundos"] = round(time.perf_counter() - ranura.inicio, 4)
+                    reiniciar = True
+                else:
+                    continue
+                ranura.trabajo = None
+                if reiniciar:
+                    ranura.matar()
+                    ranuras[i] = _Ranura(contexto, con_pasos)
+                resultado["indice"] = indice
+                terminados.append(resultado)
+
+            for resultado in terminados:
+                if not ordenado:
+                    yield resultado
+                    continue
+                listos[resultado["indice"]] = resultado
+                while siguiente in listos:
+                    yield listos.pop(siguiente)
+                    siguiente += 1
+    finally:
+        for ranura in ranuras:
+            ranura.cerrar()
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(prog="grafi", description="Análisis por lotes de funciones (JSONL)")
+    parser.add_argument("entrada", nargs="?", default="-", help="archivo con una expresión por línea (- es la entrada estándar)")
+    parser.add_argument("-o", "--salida", default="-", help="archivo JSONL de salida (- es la salida estándar)")
+    parser.add_argument("-j", "--procesos", type=int, default=os.cpu_count(), help="procesos en paralelo")
+    parser.add_argument("--tiempo-limite", type=float, default=TIEMPO_LIMITE_POR_DEFECTO, help="segundos por expresión")
+    parser.add_argument("--desordenado", action="store_true", help="escribir cada resultado apenas termina")
+    parser.add_argument("--sin-pasos", action="store_true", help="no incluir el texto de los pasos")
+    args = parser.parse_args(argumentos)
+
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, encoding="utf-8")
+    salida = sys.stdout if args.salida == "-" else open(args.salida, "w", encoding="utf-8")
+    inicio = time.perf_counter()
+    conteo = {}
+    try:
+        resultados = analizar_en_paralelo(leer_expresiones(entrada), args.procesos, args.tiempo_limite,
+                                          not args.sin_pasos, not args.desordenado)
+        for resultado in resultados:
+            salida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+            salida.flush()
+            conteo[resultado["estado"]] = conteo.get(resultado["estado"], 0) + 1
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+    total = sum(conteo.values())
+    segundos = time.perf_counter() - inicio
+    resumen = ", ".join(f"{estado}: {cantidad}" for estado, cantidad in sorted(conteo.items()))
+    print(f"{total} expresiones en {segundos:.1f} s ({resumen})", file=sys.stderr)
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
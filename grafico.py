@@ -0,0 +1,286 @@
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import instrumentacion
+
+# Aquí está el gráfico de la ventana: una sola Figure y un solo canvas que
+# duran toda la sesión. Cada análisis nuevo solo cambia los datos de las
+# líneas y de los marcadores; no se crean figuras nuevas (pyplot las guarda
+# todas y nunca se liberan) ni se tocan los rcParams globales.
+# Los marcadores y sus etiquetas son "animados": no forman parte del dibujo
+# normal y se pintan encima del fondo guardado (blitting), así que cambiarlos
+# no obliga a redibujar ejes, grilla y curva.
+# La imagen de cada tema se guarda junto con el estado de la vista: volver a
+# un tema ya dibujado con los mismos datos es solo pegar esa imagen (blit).
+# Con la rueda del mouse se hace zoom alrededor del cursor y arrastrando con
+# el botón izquierdo se desplaza la vista; quien usa el gráfico recibe cada
+# cambio de vista (conectar_navegacion) y decide cuándo volver a muestrear.
+
+# Estilo de cada tipo de marcador: (formato, color, texto, alineación vertical)
+ESTILOS_MARCADORES = {
+    "maximos": ('o', 'red', 'Max', 'bottom'),
+    "minimos": ('o', 'blue', 'Min', 'top'),
+    "inflexion": ('o', 'green', 'Inf', 'bottom'),
+}
+
+# Cuánto acerca o aleja cada paso de la rueda, y el ancho mínimo y máximo
+# de la vista en x
+FACTOR_ZOOM = 1.2
+ANCHO_MINIMO_VISTA = 1e-6
+ANCHO_MAXIMO_VISTA = 1e6
+
+class Grafico:
+    # Figura con la curva f(x), los ejes y los marcadores de un análisis.
+    # Si se pasa `master` (un widget de Tk) el canvas es FigureCanvasTkAgg;
+    # si no, es un canvas Agg sin ventana (para pruebas y benchmarks).
+
+    def __init__(self, tema, master=None):
+        self.figura = Figure(figsize=(5, 4), dpi=100, layout="tight")
+        if master is None:
+            self.canvas = FigureCanvasAgg(self.figura)
+            self.widget = None
+        else:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            self.canvas = FigureCanvasTkAgg(self.figura, master=master)
+            self.widget = self.canvas.get_tk_widget()
+        # draw_idle termina llamando a canvas.draw: así se mide el dibujo real
+        self.canvas.draw = instrumentacion.medido("grafico.dibujar")(self.canvas.draw)
+        self.ax = self.figura.add_subplot(111)
+
+        self.linea, = self.ax.plot([], [], label='f(x)', linewidth=2)
+        self.eje_x = self.ax.axhline(0, linewidth=1)
+        self.eje_y = self.ax.axvline(0, linewidth=1)
+        self.ax.grid(True, linestyle='--', alpha=0.7)
+        self.leyenda = self.ax.legend()
+
+        # Un Line2D por tipo de marcador y una lista de etiquetas que se
+        # reutilizan (las que sobran quedan ocultas)
+        self.marcadores = {}
+        self.etiquetas = {}
+        for tipo, (formato, color, _, _) in ESTILOS_MARCADORES.items():
+            marcador, = self.ax.plot([], [], formato, color=color, markersize=8, animated=True)
+            self.marcadores[tipo] = marcador
+            self.etiquetas[tipo] = []
+
+        self.fondo = None
+        # Lo ya dibujado por tema: clave del tema -> (estado de la vista,
+        # fondo sin marcadores, imagen completa con marcadores)
+        self.fondos_por_tema = {}
+        self.clave_tema = None
+        # Cambia cada vez que cambian los datos, los marcadores o los límites
+        self.version = 0
+        self.canvas.mpl_connect("draw_event", self._al_dibujar)
+        self.al_cambiar_vista = None
+        self.arrastre = None
+        self.aplicar_tema(tema)
+
+    def aplicar_tema(self, tema):
+        # Cambia los colores de todo lo que ya está dibujado, sin volver a graficar
+        self.clave_tema = (tema["graph_bg"], tema["graph_fg"], tema["graph_grid"])
+        fondo = tema["graph_bg"]
+        frente = tema["graph_fg"]
+        self.figura.set_facecolor(fondo)
+        self.ax.set_facecolor(fondo)
+        for borde in self.ax.spines.values():
+            borde.set_edgecolor(frente)
+        self.ax.tick_params(colors=frente, which="both")
+        self.ax.xaxis.label.set_color(frente)
+        self.ax.yaxis.label.set_color(frente)
+        self.ax.tick_params(grid_color=tema["graph_grid"])
+        self.eje_x.set_color(frente)
+        self.eje_y.set_color(frente)
+        self.leyenda.get_frame().set_facecolor(fondo)
+        self.leyenda.get_frame().set_edgecolor(frente)
+        for texto in self.leyenda.get_texts():
+            texto.set_color(frente)
+        guardado = self.fondos_por_tema.get(self.clave_tema)
+        if guardado is not None and guardado[0] == self._estado():
+            # Este tema ya se dibujó con la vista actual: basta con pegar la imagen
+            self.fondo = guardado[1]
+            self.canvas.restore_region(guardado[2])
+            self.canvas.blit(self.figura.bbox)
+        else:
+            self.canvas.draw_idle()
+
+    def mostrar(self, analisis):
+        # Muestra la curva y los marcadores de un análisis (etapa "grafico")
+        self.linea.set_animated(False)
+        x_vals, y_vals = analisis.datos_grafico
+        self.linea.set_data(x_vals, y_vals)
+        self.ax.set_xlim(analisis.rango_grafico)
+        if analisis.limites_y is not None:
+            self.ax.set_ylim(analisis.limites_y)
+        else:
+            self.ax.set_ylim(-1, 1)
+        self._poner_marcadores(analisis.marcadores_maximos, analisis.marcadores_minimos,
+                               analisis.marcadores_inflexion)
+        self.version += 1
+        # Ejes y curva cambiaron: redibujo completo (los marcadores se pintan
+        # en _al_dibujar, encima del fondo nuevo)
+        self.canvas.draw_idle()
+
+    def mostrar_previa(self, muestra, rango):
+        # Solo la curva, antes de que estén los puntos de interés (modo en
+        # vivo); el análisis completo llega después con mostrar()
+        self.linea.set_animated(False)
+        self.linea.set_data(muestra.xs, muestra.ys)
+        self.ax.set_xlim(rango)
+        if muestra.limites_y is not None:
+            self.ax.set_ylim(muestra.limites_y)
+        else:
+            self.ax.set_ylim(-1, 1)
+        self._poner_marcadores([], [], [])
+        self.version += 1
+        self.canvas.draw_idle()
+
+    def mostrar_variacion(self, variacion, rango=None):
+        # Curva y marcadores de una función con parámetros (parametros.Variacion).
+        # Con `rango` se ajustan los ejes (la primera vez); sin él quedan
+        # fijos, para que al mover un deslizador se vea cómo cambia la curva.
+        # Aquí la curva también es "animada": con los ejes fijos, cada
+        # movimiento es pegar el fondo y pintar encima curva y marcadores.
+        muestra = variacion.muestra
+        self.linea.set_data(muestra.xs, muestra.ys)
+        self._poner_marcadores(variacion.maximos, variacion.minimos, variacion.inflexion)
+        self.version += 1
+        if rango is None and self.fondo is not None and self.linea.get_animated():
+            self._pegar_fondo()
+            return
+        self.linea.set_animated(True)
+        if rango is not None:
+            self.ax.set_xlim(rango)
+            if muestra.limites_y is not None:
+                self.ax.set_ylim(muestra.limites_y)
+            else:
+                self.ax.set_ylim(-1, 1)
+        self.canvas.draw_idle()
+
+    def mostrar_marcadores(self, maximos, minimos, inflexion):
+        # Cambia solo los marcadores: con el fondo guardado basta con blitting
+        self._poner_marcadores(maximos, minimos, inflexion)
+        self.version += 1
+        if self.fondo is None:
+            self.canvas.draw_idle()
+            return
+        self._pegar_fondo()
+
+    def mostrar_curva(self, x_vals, y_vals):
+        # Cambia solo los datos de la curva (por ejemplo, al volver a muestrear
+        # la vista después de un zoom), sin tocar los límites de los ejes
+        self.linea.set_data(x_vals, y_vals)
+        self.version += 1
+        self.canvas.draw_idle()
+
+    def vista(self):
+        return self.ax.get_xlim()
+
+    def conectar_navegacion(self, al_cambiar_vista):
+        # Activa el zoom con la rueda y el desplazamiento arrastrando.
+        # al_cambiar_vista(a, b) se llama en cada cambio de la vista en x.
+        self.al_cambiar_vista = al_cambiar_vista
+        self.canvas.mpl_connect("scroll_event", self._rueda)
+        self.canvas.mpl_connect("button_press_event", self._presionar)
+        self.canvas.mpl_connect("motion_notify_event", self._mover)
+        self.canvas.mpl_connect("button_release_event", self._soltar)
+
+    def limpiar(self):
+        self.linea.set_animated(False)
+        self.linea.set_data([], [])
+        self._poner_marcadores((), (), ())
+        self.version += 1
+        self.canvas.draw_idle()
+
+    def _poner_marcadores(self, maximos, minimos, inflexion):
+        puntos = {"maximos": maximos, "minimos": minimos, "inflexion": inflexion}
+        for tipo, lista in puntos.items():
+            _, color, texto, alineacion = ESTILOS_MARCADORES[tipo]
+            xs = np.array([p[0] for p in lista], dtype=float)
+            ys = np.array([p[1] for p in lista], dtype=float)
+            self.marcadores[tipo].set_data(xs, ys)
+            etiquetas = self.etiquetas[tipo]
+            while len(etiquetas) < len(lista):
+                etiquetas.append(self.ax.text(0, 0, texto, fontsize=9, color=color,
+                                              verticalalignment=alineacion, animated=True))
+            for i, etiqueta in enumerate(etiquetas):
+                if i < len(lista):
+                    etiqueta.set_position((xs[i], ys[i]))
+                    etiqueta.set_visible(True)
+                else:
+                    etiqueta.set_visible(False)
+
+    def _dibujar_marcadores(self):
+        # (y la curva, cuando es animada: ver mostrar_variacion)
+        if self.linea.get_animated():
+            self.ax.draw_artist(self.linea)
+        for tipo, marcador in self.marcadores.items():
+            self.ax.draw_artist(marcador)
+            for etiqueta in self.etiquetas[tipo]:
+                if etiqueta.get_visible():
+                    self.ax.draw_artist(etiqueta)
+
+    def _hay_curva(self):
+        return len(self.linea.get_xdata()) > 0
+
+    def _rueda(self, evento):
+        # Zoom que deja fijo el punto que está bajo el cursor
+        if evento.inaxes is not self.ax or not self._hay_curva():
+            return
+        factor = 1 / FACTOR_ZOOM if evento.button == "up" else FACTOR_ZOOM
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        ancho = min(max((x1 - x0) * factor, ANCHO_MINIMO_VISTA), ANCHO_MAXIMO_VISTA)
+        factor = ancho / (x1 - x0)
+        x, y = evento.xdata, evento.ydata
+        self._cambiar_vista((x - (x - x0) * factor, x + (x1 - x) * factor),
+                            (y - (y - y0) * factor, y + (y1 - y) * factor))
+
+    def _presionar(self, evento):
+        if evento.inaxes is not self.ax or evento.button != 1 or not self._hay_curva():
+            return
+        # Guardamos la posición en píxeles: los datos bajo el cursor cambian al arrastrar
+        self.arrastre = (evento.x, evento.y, self.ax.get_xlim(), self.ax.get_ylim())
+
+    def _mover(self, evento):
+        if self.arrastre is None:
+            return
+        x_inicio, y_inicio, (x0, x1), (y0, y1) = self.arrastre
+        dx = (evento.x - x_inicio) * (x1 - x0) / self.ax.bbox.width
+        dy = (evento.y - y_inicio) * (y1 - y0) / self.ax.bbox.height
+        self._cambiar_vista((x0 - dx, x1 - dx), (y0 - dy, y1 - dy))
+
+    def _soltar(self, evento):
+        self.arrastre = None
+
+    def _cambiar_vista(self, limites_x, limites_y):
+        # Mientras el usuario se mueve se estiran los puntos que ya hay; el
+        # nuevo muestreo de la vista lo pide quien recibe al_cambiar_vista
+        self.ax.set_xlim(limites_x)
+        self.ax.set_ylim(limites_y)
+        self.version += 1
+        self.canvas.draw_idle()
+        if self.al_cambiar_vista is not None:
+            self.al_cambiar_vista(limites_x[0], limites_x[1])
+
+    def _estado(self):
+        # Lo que tiene que coincidir para reutilizar un fondo: datos, límites y tamaño
+        return (self.version, tuple(self.figura.bbox.bounds))
+
+    @instrumentacion.medido("grafico.blit")
+    def _pegar_fondo(self):
+        self.canvas.restore_region(self.fondo)
+        self._dibujar_marcadores()
+        self._guardar_imagen()
+        self.canvas.blit(self.figura.bbox)
+
+    def _guardar_imagen(self):
+        imagen = self.canvas.copy_from_bbox(self.figura.bbox)
+        self.fondos_por_tema[self.clave_tema] = (self._estado(), self.fondo, imagen)
+
+    def _al_dibujar(self, evento):
+        # Después de cada dibujo completo guardamos el fondo (sin marcadores)
+        # y pintamos los marcadores encima
+        self.fondo = self.canvas.copy_from_bbox(self.figura.bbox)
+        self._dibujar_marcadores()
+        self._guardar_imagen()
+        self.canvas.blit(self.figura.bbox)
@@ -1,17 +1,25 @@
 import tkinter as tk # GUI y sus elementos
 from tkinter import messagebox # Para el mensaje de error de una entrada inválida
-import matplotlib # Herramientas de grafiación
-matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import operations # operations.py --> Lógica de operaciones
-import steps # steps.py --> Lógica de pasos
-import re # Para parsear formatos y entradas, con regex
+import instrumentacion # instrumentacion.py --> Tiempos por etapa (ventana de diagnóstico)
+import tareas # tareas.py --> Análisis en un proceso aparte
+import multiprocessing
+import threading
+import time
 
 # Este es el módulo principal que controla la interfaz gráfica.
 # Usamos tkinter para crear ventanas, botones y cuadros de texto.
 # Hemos mejorado la interfaz para usar elementos nativos y solucionar problemas de layout.
 
+# Los módulos pesados (sympy a través de operations, matplotlib, numpy) no se
+# importan aquí: los carga precargar_modulos en un hilo aparte mientras la
+# ventana ya está a la vista. Hasta que terminan, valen None.
+operations = None # operations.py --> Lógica de operaciones
+steps = None # steps.py --> Lógica de pasos
+grafico = None # grafico.py --> Figura de matplotlib que dura toda la sesión
+muestreo = None # muestreo.py --> Tramos del gráfico interactivo
+panel_pasos = None # panel_pasos.py --> Panel de pasos (un solo tk.Text)
+parametros = None # parametros.py --> Funciones con parámetros (deslizadores)
+
 # --- TEMAS DE COLOR ---
 THEMES = {
     "dark": {
@@ -31,7 +39,10 @@ THEMES = {
         "math_color": "#ffffff",
         "btn_theme_bg": "#ffffff",
         "btn_theme_fg": "#000000",
-        "btn_theme_text": "Modo: Oscuro"
+        "btn_theme_text": "Modo: Oscuro",
+        # En dark mode el rojo y el azul estándar no se leen bien
+        "fg_positivo": "#ff5555", # Rojo más claro
+        "fg_negativo": "#5555ff" # Azul más claro
     },
     "light": {
         "bg_window": "#f5f5f5",
@@ -50,7 +61,9 @@ THEMES = {
         "math_color": "#000000",
         "btn_theme_bg": "#000000",
         "btn_theme_fg": "#ffffff",
-        "btn_theme_text": "Modo: Claro"
+        "btn_theme_text": "Modo: Claro",
+        "fg_positivo": "red",
+        "fg_negativo": "blue"
     }
 }
 
@@ -60,11 +73,9 @@ current_mode = "dark" # Default
 # Variables globales para los widgets
 ventana = None
 entrada_funcion = None
-frame_resultados = None # Frame scrollable para los pasos
+pasos_ventana = None # panel_pasos.PanelPasos con la explicación
 frame_grafico = None
-canvas_scroll = None # Canvas para el scroll
-canvas_grafico = None # Canvas de matplotlib
-figura_grafico = None # Figura de matplotlib
+grafico_ventana = None # grafico.Grafico con la figura y el canvas de matplotlib
 panel_superior = None
 panel_central = None
 frame_izq_container = None
@@ -72,6 +83,48 @@ etiqueta_funcion = None
 btn_analizar = None
 btn_limpiar = None
 btn_tema = None
+btn_diagnostico = None
+ventana_diagnostico = None # diagnostico.VentanaDiagnostico, si está abierta
+etiqueta_estado = None # Muestra el progreso del análisis
+chk_en_vivo = None
+modo_en_vivo = None # tk.BooleanVar: analizar mientras se escribe
+panel_parametros = None # Frame con un deslizador por parámetro (oculto si no hay)
+
+# Análisis en segundo plano
+trabajador = tareas.Trabajador()
+analisis_actual = None # Análisis que se está mostrando
+etapas_mostradas = set() # Etapas de analisis_actual que ya están en pantalla
+revision_pendiente = None # id del after() que revisa el trabajador
+INTERVALO_REVISION = 50 # ms
+
+# Zoom y desplazamiento del gráfico
+remuestreo_pendiente = None # id del after() que vuelve a muestrear la vista
+RETARDO_VISTA = 150 # ms sin mover el gráfico antes de volver a muestrear
+
+# Funciones con parámetros (a*x^3 + b*x)
+familia_actual = None # parametros.Familia que se está mostrando
+preparacion = None # Función con parámetros cuya parte simbólica se está calculando
+revision_familia = None # id del after() que espera a esa parte simbólica
+actualizacion_parametros = None # id del after() que redibuja con los valores nuevos
+INTERVALO_PARAMETROS = 16 # ms: como mucho un redibujo por cuadro al mover un deslizador
+deslizadores = {} # nombre del parámetro -> tk.Scale
+etiquetas_parametros = [] # tk.Label de cada deslizador
+
+# Precarga de módulos
+precarga_lista = threading.Event() # La pone el hilo de precarga al terminar
+error_precarga = None # Excepción del hilo de precarga, si la hubo
+modulos_cargados = False # True cuando la interfaz ya armó el panel y el gráfico
+accion_pendiente = None # Lo que el usuario pidió antes de terminar la precarga
+INTERVALO_PRECARGA = 30 # ms
+
+# Lectura del texto (en un proceso de tareas: 9^9^9^9 tarda en leerse)
+lectura = None # (texto, en_vivo, inicio) de la expresión que se está leyendo
+revision_lectura = None # id del after() que espera la lectura
+TIEMPO_LIMITE_LECTURA = 3.0 # s
+
+# Modo en vivo
+en_vivo_pendiente = None # id del after() que analiza lo que se está escribiendo
+RETARDO_EN_VIVO = 300 # ms sin teclear antes de analizar
 
 def get_theme():
     return THEMES[current_mode]
@@ -94,344 +147,544 @@ def aplicar_tema():
     # Panel superior
     panel_superior.configure(bg=theme["bg_window"])
     etiqueta_funcion.configure(bg=theme["bg_window"], fg=theme["fg_text"])
+    etiqueta_estado.configure(bg=theme["bg_window"], fg=theme["fg_text"])
     entrada_funcion.configure(bg=theme["bg_entry"], fg=theme["fg_entry"], insertbackground=theme["fg_text"])
+    chk_en_vivo.configure(bg=theme["bg_window"], fg=theme["fg_text"], activebackground=theme["bg_window"],
+                          activeforeground=theme["fg_text"], selectcolor=theme["bg_entry"])
     
     # Botones
     btn_analizar.configure(bg=theme["bg_button"], fg=theme["fg_button"])
     btn_limpiar.configure(bg=theme["bg_button_clear"], fg=theme["fg_button_clear"])
     btn_tema.configure(bg=theme["btn_theme_bg"], fg=theme["btn_theme_fg"], text=theme["btn_theme_text"])
+    btn_diagnostico.configure(bg=theme["btn_theme_bg"], fg=theme["btn_theme_fg"])
+    if ventana_diagnostico is not None:
+        ventana_diagnostico.aplicar_tema(theme)
+    
+    aplicar_tema_parametros(theme)
     
     # Panel central y contenedores
     panel_central.configure(bg=theme["bg_window"])
     frame_izq_container.configure(bg=theme["bg_frame"])
     frame_grafico.configure(bg=theme["bg_frame"])
     
-    # Scroll
-    canvas_scroll.configure(bg=theme["bg_frame"])
-    frame_resultados.configure(bg=theme["bg_frame"])
-    
-    # Actualizar resultados si existen (reconstruyendo si es necesario o iterando)
-    # Para simplificar y asegurar consistencia, si hay resultados, re-analizamos
-    # Si no, solo limpiamos visualmente los widgets hijos
-    for widget in frame_resultados.winfo_children():
-        # Recursivamente actualizar colores sería ideal, pero reconstruir es más seguro
-        pass
-        
-    # Re-ejecutar análisis si hay texto, para regenerar los labels con los colores correctos
-    if entrada_funcion.get().strip() != "":
-        analizar_funcion()
-    else:
-        # Si está vacío, asegurar que el frame esté limpio con el color correcto
-        for widget in frame_resultados.winfo_children():
-            widget.destroy()
-            
-    # Actualizar gráfico si existe
-    if figura_grafico:
-        # Regenerar gráfico con nuevos colores
-        # Necesitamos los datos... Si ya se analizó, analizar_funcion lo hará.
-        pass
-
-def crear_seccion_paso(padre, titulo, contenido_lista):
-    # Función auxiliar para crear un marco con título y contenido estructurado
-    theme = get_theme()
-    
-    # Estilos
-    font_titulo = ("Arial", 11, "bold")
-    color_titulo = theme["fg_title"]
-    
-    font_texto = ("Arial", 10)
-    color_texto = theme["fg_text"]
-    
-    font_math = ("Times New Roman", 12, "bold")
-    color_math = theme["math_color"]
-    
-    frame_paso = tk.LabelFrame(padre, text=titulo, font=font_titulo, padx=15, pady=10, bg=theme["bg_frame"], fg=color_titulo)
-    frame_paso.pack(fill=tk.X, expand=True, padx=10, pady=10)
+    # Panel de pasos y gráfico se recolorean en el lugar, con el último
+    # análisis que ya está en pantalla: no se vuelve a calcular nada
+    # (durante la precarga todavía no existen)
+    if modulos_cargados:
+        pasos_ventana.aplicar_tema(theme)
+        grafico_ventana.aplicar_tema(theme)
+
+def aplicar_tema_parametros(theme):
+    # Deslizadores de los parámetros (se crean con cada función)
+    panel_parametros.configure(bg=theme["bg_window"])
+    for etiqueta in etiquetas_parametros:
+        etiqueta.configure(bg=theme["bg_window"], fg=theme["fg_text"])
+    for deslizador in deslizadores.values():
+        deslizador.configure(bg=theme["bg_window"], fg=theme["fg_text"], troughcolor=theme["bg_entry"],
+                             activebackground=theme["bg_button"])
+
+def precargar_modulos():
+    # Corre en un hilo aparte: solo importa, nunca toca Tk
+    global operations, steps, grafico, muestreo, panel_pasos, parametros, error_precarga
+    try:
+        import matplotlib # Herramientas de grafiación
+        matplotlib.use('TkAgg')
+        from matplotlib.backends import backend_tkagg # noqa: F401  (lo usa grafico.Grafico)
+        import operations
+        import steps
+        import muestreo
+        import grafico
+        import panel_pasos
+        import parametros
+    except Exception as e:
+        error_precarga = e
+    precarga_lista.set()
+
+def revisar_precarga():
+    if not precarga_lista.is_set():
+        ventana.after(INTERVALO_PRECARGA, revisar_precarga)
+        return
+    terminar_precarga()
+
+def terminar_precarga():
+    # Ya en el hilo de Tk: se arman el panel de pasos y el gráfico
+    global modulos_cargados, pasos_ventana, grafico_ventana, accion_pendiente
+    if error_precarga is not None:
+        etiqueta_estado.configure(text="")
+        messagebox.showerror("Error", f"No se pudieron cargar los módulos: {error_precarga}")
+        return
     
-    if isinstance(contenido_lista, str):
-        lineas = contenido_lista.split('\n')
-    else:
-        lineas = contenido_lista
-        
-    for linea in lineas:
-        if linea.strip() != "":
-            # --- CASO 1: Intervalos con colores ---
-            es_intervalo_coloreado = False
-            palabras_estado = ["CRECIENTE", "DECRECIENTE", "CÓNCAVA ARRIBA", "CÓNCAVA ABAJO"]
-            
-            for estado in palabras_estado:
-                if estado in linea:
-                    es_intervalo_coloreado = True
-                    break
-            
-            if es_intervalo_coloreado and ("Intervalo" in linea or "Dominio" in linea):
-                 frame_linea = tk.Frame(frame_paso, bg=theme["bg_frame"])
-                 frame_linea.pack(fill=tk.X, pady=1)
-                 
-                 match = re.search(r"(CRECIENTE.*|DECRECIENTE.*|CÓNCAVA ARRIBA.*|CÓNCAVA ABAJO.*)$", linea)
-                 
-                 if match:
-                     parte_estado = match.group(1)
-                     parte_izq = linea[:match.start()].strip()
-                     
-                     # Procesamos la parte izquierda
-                     if parte_izq.startswith("Intervalo") and ":" in parte_izq:
-                         try:
-                             p1, resto = parte_izq.split("(", 1)
-                             intervalo_str, p3 = resto.split(")", 1)
-                             
-                             tk.Label(frame_linea, text=p1 + "(", font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-                             tk.Label(frame_linea, text=intervalo_str, font=font_math, bg=theme["bg_frame"], fg=color_math).pack(side=tk.LEFT)
-                             
-                             if ":" in p3:
-                                 sep, formula = p3.split(":", 1)
-                                 tk.Label(frame_linea, text=")" + sep + ": ", font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-                                 tk.Label(frame_linea, text=formula.strip(), font=font_math, bg=theme["bg_frame"], fg=color_math).pack(side=tk.LEFT)
-                             else:
-                                 tk.Label(frame_linea, text=")" + p3, font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-                         except:
-                             tk.Label(frame_linea, text=parte_izq, font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-                     else:
-                         # Caso Dominio
-                         if "Dominio" in parte_izq and ":" in parte_izq:
-                             try:
-                                 p1, resto = parte_izq.split("(", 1)
-                                 intervalo_str, p3 = resto.split(")", 1)
-                                 
-                                 tk.Label(frame_linea, text=p1 + "(", font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-                                 tk.Label(frame_linea, text=intervalo_str, font=font_math, bg=theme["bg_frame"], fg=color_math).pack(side=tk.LEFT)
-                                 
-                                 if ":" in p3:
-                                     sep, formula = p3.split(":", 1)
-                                     tk.Label(frame_linea, text=")" + sep + ": ", font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-                                     tk.Label(frame_linea, text=formula.strip(), font=font_math, bg=theme["bg_frame"], fg=color_math).pack(side=tk.LEFT)
-                                 else:
-                                     tk.Label(frame_linea, text=")" + p3, font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-                             except:
-                                 tk.Label(frame_linea, text=parte_izq, font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-                         else:
-                             tk.Label(frame_linea, text=parte_izq, font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-                     
-                     tk.Label(frame_linea, text="   ", font=font_texto, bg=theme["bg_frame"]).pack(side=tk.LEFT)
-                     
-                     color_estado = color_texto
-                     # Colores específicos para estados (Red/Blue se mantienen igual o ajustados?)
-                     # En dark mode, Blue oscuro no se ve bien. Usaremos un azul más claro (Cyan/LightBlue) si es dark mode?
-                     # El usuario pidió "azul" y "rojo".
-                     # Ajustemos ligeramente para dark mode si es necesario, pero "blue" y "red" standard suelen ser legibles.
-                     # Para asegurar legibilidad en dark mode:
-                     c_red = "red"
-                     c_blue = "blue"
-                     if current_mode == "dark":
-                         c_red = "#ff5555" # Rojo más claro
-                         c_blue = "#5555ff" # Azul más claro
-                     
-                     if "DECRECIENTE" in parte_estado:
-                         color_estado = c_blue
-                     elif "CRECIENTE" in parte_estado:
-                         color_estado = c_red
-                     elif "CÓNCAVA ARRIBA" in parte_estado:
-                         color_estado = c_red
-                     elif "CÓNCAVA ABAJO" in parte_estado:
-                         color_estado = c_blue
-                         
-                     tk.Label(frame_linea, text=parte_estado, font=font_texto, bg=theme["bg_frame"], fg=color_estado).pack(side=tk.LEFT)
-                 else:
-                     tk.Label(frame_paso, text=linea, font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(anchor="w")
-
-            # --- CASO 2: Puntos Críticos ---
-            elif "Ecuación:" in linea:
-                frame_linea = tk.Frame(frame_paso, bg=theme["bg_frame"])
-                frame_linea.pack(fill=tk.X, pady=1)
-                tk.Label(frame_linea, text="Ecuación: ", font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-                tk.Label(frame_linea, text=linea.replace("Ecuación: ", ""), font=font_math, bg=theme["bg_frame"], fg=color_math).pack(side=tk.LEFT)
-            
-            elif "Puntos críticos encontrados" in linea:
-                frame_linea = tk.Frame(frame_paso, bg=theme["bg_frame"])
-                frame_linea.pack(fill=tk.X, pady=1)
-                if ":" in linea:
-                    texto_izq, lista_nums = linea.split(":", 1)
-                    tk.Label(frame_linea, text=texto_izq + ": ", font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-                    tk.Label(frame_linea, text=lista_nums.strip(), font=font_math, bg=theme["bg_frame"], fg=color_math).pack(side=tk.LEFT)
-                else:
-                    tk.Label(frame_linea, text=linea, font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-
-            elif "Evaluando x =" in linea:
-                frame_linea = tk.Frame(frame_paso, bg=theme["bg_frame"])
-                frame_linea.pack(fill=tk.X, pady=1)
-                match = re.search(r"x = ([\d\.\-]+)", linea)
-                val_x = match.group(1) if match else "?"
-                tk.Label(frame_linea, text="Evaluando ", font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-                tk.Label(frame_linea, text=f"x = {val_x}", font=font_math, bg=theme["bg_frame"], fg=color_math).pack(side=tk.LEFT)
-                tk.Label(frame_linea, text=" en ", font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-                tk.Label(frame_linea, text="f''(x)", font=font_math, bg=theme["bg_frame"], fg=color_math).pack(side=tk.LEFT)
-                tk.Label(frame_linea, text=":", font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-
-            elif "Resultado:" in linea:
-                frame_linea = tk.Frame(frame_paso, bg=theme["bg_frame"])
-                frame_linea.pack(fill=tk.X, pady=1)
-                tk.Label(frame_linea, text="Resultado: ", font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-                if "< 0" in linea:
-                    tk.Label(frame_linea, text="< 0", font=font_math, bg=theme["bg_frame"], fg=color_math).pack(side=tk.LEFT)
-                    resto = linea.split("< 0")[1]
-                elif "> 0" in linea:
-                    tk.Label(frame_linea, text="> 0", font=font_math, bg=theme["bg_frame"], fg=color_math).pack(side=tk.LEFT)
-                    resto = linea.split("> 0")[1]
-                elif "= 0" in linea:
-                    tk.Label(frame_linea, text="= 0", font=font_math, bg=theme["bg_frame"], fg=color_math).pack(side=tk.LEFT)
-                    resto = linea.split("= 0")[1]
-                else:
-                    resto = linea.replace("Resultado: ", "")
-                tk.Label(frame_linea, text=resto, font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-
-            # --- CASO 3: Puntos de Inflexión ---
-            elif "Igualando f''(x) = 0:" in linea:
-                frame_linea = tk.Frame(frame_paso, bg=theme["bg_frame"])
-                frame_linea.pack(fill=tk.X, pady=1)
-                tk.Label(frame_linea, text="Igualando ", font=font_texto, bg=theme["bg_frame"], fg=color_texto).pack(side=tk.LEFT)
-                tk.Label(frame_linea, text=linea.replace("Igualando ", ""), font=font_math, bg=theme["bg_frame"], fg=color_math).pack(side=tk.LEFT)
-
-            # --- CASO DEFAULT ---
-            else:
-                estilo_actual = font_texto
-                fg_color = color_texto
-                es_texto_explicativo = False
-                palabras_clave_texto = ["Paso", "Puntos críticos encontrados"]
-                for palabra in palabras_clave_texto:
-                    if linea.strip().startswith(palabra):
-                        es_texto_explicativo = True
-                        break
-                if not es_texto_explicativo:
-                    if "=" in linea or "f'(" in linea or "f''(" in linea:
-                        estilo_actual = font_math
-                        fg_color = color_math
-                
-                label = tk.Label(frame_paso, text=linea, justify=tk.LEFT, font=estilo_actual, bg=theme["bg_frame"], fg=fg_color, anchor="w", wraplength=400)
-                label.pack(fill=tk.X, anchor="w", pady=1)
-                def update_wrap(event, l=label):
-                    l.config(wraplength=event.width - 20)
-                frame_paso.bind("<Configure>", update_wrap)
+    # Cache en disco de análisis entre sesiones (si no se puede, seguimos sin ella)
+    try:
+        operations.activar_cache_disco()
+    except Exception as e:
+        print(f"No se pudo abrir la cache en disco: {e}")
+    
+    pasos_ventana = panel_pasos.PanelPasos(frame_izq_container, get_theme())
+    grafico_ventana = grafico.Grafico(get_theme(), master=frame_grafico)
+    grafico_ventana.conectar_navegacion(vista_cambiada)
+    modulos_cargados = True
+    etiqueta_estado.configure(text="")
+    
+    if accion_pendiente is not None:
+        accion = accion_pendiente
+        accion_pendiente = None
+        accion()
+
+def esperar_precarga(accion):
+    # Si la precarga no terminó, la acción queda pendiente (solo la última)
+    # y se ejecuta en cuanto terminar_precarga arma la interfaz
+    global accion_pendiente
+    if modulos_cargados:
+        return False
+    accion_pendiente = accion
+    etiqueta_estado.configure(text="Cargando módulos...")
+    return True
 
 def analizar_funcion():
+    # El primer análisis espera a la precarga si todavía no terminó
+    if esperar_precarga(analizar_funcion):
+        return
     texto_ingresado = entrada_funcion.get()
     
-    # Limpiamos
-    for widget in frame_resultados.winfo_children():
-        widget.destroy()
+    # Si había un análisis en curso, lo cancelamos
+    cancelar_en_vivo()
+    cancelar_analisis()
+    cancelar_remuestreo()
     
-    funcion = operations.convertir_texto_a_funcion(texto_ingresado)
+    # Limpiamos
+    pasos_ventana.limpiar()
+    leer_expresion(texto_ingresado, en_vivo=False)
+
+def leer_expresion(texto, en_vivo):
+    # El texto se convierte a expresión en un proceso de tareas, no aquí: una
+    # potencia como 9^9^9^9 se calcula al leerla y congelaría la ventana.
+    # Lo que no pasa el filtro de caracteres y nombres ni se manda. Una
+    # lectura anterior que siga en curso no se mata (el proceso tarda en
+    # arrancar): el pedido nuevo espera y, si vence el plazo, se corta todo.
+    global lectura
+    cancelar_lectura()
+    if not operations.texto_permitido(texto):
+        expresion_leida(texto, None, en_vivo)
+        return
+    trabajador.enviar_aparte(tareas.NODO_LECTURA, texto, reemplazar=True)
+    lectura = (texto, en_vivo, time.perf_counter())
+    revisar_lectura()
+
+def revisar_lectura():
+    global lectura, revision_lectura
+    revision_lectura = None
+    texto, en_vivo, inicio = lectura
+    mensaje = trabajador.recibir_aparte(tareas.NODO_LECTURA)
+    if mensaje is None:
+        if time.perf_counter() - inicio < TIEMPO_LIMITE_LECTURA:
+            revision_lectura = ventana.after(INTERVALO_REVISION, revisar_lectura)
+            return
+        # Se corta matando el proceso de lectura
+        trabajador.cancelar_aparte(tareas.NODO_LECTURA)
+        lectura = None
+        if en_vivo:
+            etiqueta_estado.configure(text="La expresión tarda demasiado en leerse")
+        else:
+            messagebox.showerror("Error", "La expresión tarda demasiado en leerse (¿una potencia muy grande?).")
+        return
+    lectura = None
+    estado, funcion = mensaje
+    expresion_leida(texto, funcion if estado == "ok" else None, en_vivo)
+
+def expresion_leida(texto, funcion, en_vivo):
+    if en_vivo:
+        analizar_leida_en_vivo(funcion)
+        return
     if funcion is None:
         messagebox.showerror("Error", "La función ingresada no es válida.")
         return
+    iniciar_analisis(funcion)
 
-    # Cálculos
-    txt_deriv = steps.explicar_derivadas(funcion)
-    crear_seccion_paso(frame_resultados, "1. Cálculo de Derivadas", txt_deriv)
-    
-    d1 = operations.calcular_derivada(funcion)
-    d2 = operations.calcular_derivada(d1)
-    txt_criticos, maximos, minimos, inflexion = steps.explicar_puntos_criticos(funcion, d1, d2)
-    crear_seccion_paso(frame_resultados, "2. Puntos Críticos y Clasificación", txt_criticos)
-    
-    txt_inflexion, pts_inflexion = steps.obtener_texto_inflexion(d2)
-    crear_seccion_paso(frame_resultados, "3. Puntos de Inflexión", txt_inflexion)
-    
-    txt_crecimiento = steps.obtener_intervalos_crecimiento(d1, maximos, minimos)
-    crear_seccion_paso(frame_resultados, "4. Intervalos de Crecimiento/Decrecimiento", txt_crecimiento)
-    
-    txt_concavidad = steps.obtener_intervalos_concavidad(d2, pts_inflexion)
-    crear_seccion_paso(frame_resultados, "5. Intervalos de Concavidad", txt_concavidad)
-    
-    frame_resultados.update_idletasks()
-    canvas_scroll.config(scrollregion=canvas_scroll.bbox("all"))
-    
-    graficar_en_ventana(funcion, maximos, minimos, pts_inflexion)
+def cancelar_lectura():
+    # La lectura en curso, si sigue, termina sola y su resultado se descarta
+    global lectura, revision_lectura
+    if lectura is not None:
+        trabajador.cancelar_aparte(tareas.NODO_LECTURA, matar=False)
+        lectura = None
+    if revision_lectura is not None:
+        ventana.after_cancel(revision_lectura)
+        revision_lectura = None
 
-def graficar_en_ventana(funcion, maximos, minimos, inflexion):
-    global canvas_grafico, figura_grafico
-    theme = get_theme()
-    
-    for widget in frame_grafico.winfo_children():
-        widget.destroy()
-    
-    # Configuración de colores de matplotlib
-    plt.rcParams['figure.facecolor'] = theme["graph_bg"]
-    plt.rcParams['axes.facecolor'] = theme["graph_bg"]
-    plt.rcParams['axes.edgecolor'] = theme["graph_fg"]
-    plt.rcParams['axes.labelcolor'] = theme["graph_fg"]
-    plt.rcParams['xtick.color'] = theme["graph_fg"]
-    plt.rcParams['ytick.color'] = theme["graph_fg"]
-    plt.rcParams['text.color'] = theme["graph_fg"]
-    plt.rcParams['grid.color'] = theme["graph_grid"]
-    
-    figura_grafico = plt.figure(figsize=(5, 4), dpi=100)
-    ax = figura_grafico.add_subplot(111)
-    
-    rango_x = [-10, 10]
-    puntos_x = []
-    for m in maximos: puntos_x.append(float(m[0]))
-    for m in minimos: puntos_x.append(float(m[0]))
-    for p in inflexion: puntos_x.append(float(p))
-    
-    if len(puntos_x) > 0:
-        rango_x[0] = min(puntos_x) - 2
-        rango_x[1] = max(puntos_x) + 2
-        
-    import numpy as np
-    x_vals = np.linspace(rango_x[0], rango_x[1], 400)
-    y_vals = []
+def iniciar_analisis(funcion, en_vivo=False):
+    global analisis_actual
+    if en_vivo:
+        # No matamos al trabajador: el pedido nuevo reemplaza al anterior
+        detener_revision()
+    else:
+        cancelar_analisis()
+    cancelar_remuestreo()
+    cancelar_familia()
+    pasos_ventana.limpiar()
     
-    for val in x_vals:
-        y = operations.evaluar_funcion(funcion, val)
-        y_vals.append(float(y))
-        
-    ax.plot(x_vals, y_vals, label='f(x)', linewidth=2)
+    if parametros.parametros_de(funcion):
+        iniciar_familia(funcion, en_vivo)
+        return
+    quitar_deslizadores()
+
+    # Un solo análisis que steps y el gráfico solo consultan
+    analisis = operations.analizar(funcion)
+    analisis_actual = analisis
+    etapas_mostradas.clear()
+    
+    # Las etapas que ya están calculadas (cache) se muestran de inmediato
+    completas = tareas.etapas_completas(analisis)
+    for etapa, _ in tareas.ETAPAS[:completas]:
+        mostrar_etapa(analisis, etapa)
+    if completas == len(tareas.ETAPAS):
+        terminar_analisis(analisis)
+        return
     
-    for m in maximos:
-        ax.plot(float(m[0]), float(m[1]), 'ro', markersize=8)
-        ax.text(float(m[0]), float(m[1]), 'Max', fontsize=9, color='red', verticalalignment='bottom')
-        
-    for m in minimos:
-        ax.plot(float(m[0]), float(m[1]), 'bo', markersize=8)
-        ax.text(float(m[0]), float(m[1]), 'Min', fontsize=9, color='blue', verticalalignment='top')
-        
-    for p in inflexion:
-        y = operations.evaluar_funcion(funcion, p)
-        ax.plot(float(p), float(y), 'go', markersize=8)
-        ax.text(float(p), float(y), 'Inf', fontsize=9, color='green', verticalalignment='bottom')
+    if en_vivo:
+        # Lo barato va ya, en este hilo: derivadas (por término, con cache) y
+        # la curva en la ventana por defecto. Resolver y las tablas de
+        # intervalos quedan para el trabajador.
+        mostrar_etapa(analisis, "derivadas")
+        mostrar_previa(analisis)
+    
+    # El resto se calcula en el proceso trabajador, sin congelar la ventana
+    conocidas = dict(analisis.__dict__)
+    del conocidas["funcion"]
+    trabajador.enviar(funcion, conocidas, reemplazar=en_vivo)
+    mostrar_progreso(tareas.etapas_completas(analisis))
+    programar_revision()
+
+def programar_en_vivo(event=None):
+    # Se llama en cada tecla: esperamos a que el usuario deje de escribir
+    global en_vivo_pendiente
+    if not modo_en_vivo.get():
+        return
+    cancelar_en_vivo()
+    en_vivo_pendiente = ventana.after(RETARDO_EN_VIVO, analizar_en_vivo)
+
+def analizar_en_vivo():
+    global en_vivo_pendiente
+    en_vivo_pendiente = None
+    if esperar_precarga(analizar_en_vivo):
+        return
+    leer_expresion(entrada_funcion.get(), en_vivo=True)
+
+def analizar_leida_en_vivo(funcion):
+    if funcion is None:
+        # Expresión a medio escribir: dejamos en pantalla el último resultado
+        etiqueta_estado.configure(text="Expresión incompleta...")
+        return
+    if analisis_actual is not None and analisis_actual.funcion == funcion:
+        # Misma función (una flecha, un espacio...): no hay nada que rehacer
+        if not trabajador.ocupado():
+            etiqueta_estado.configure(text="")
+        return
+    if funcion_con_parametros() == funcion:
+        return
+    iniciar_analisis(funcion, en_vivo=True)
+
+def cancelar_en_vivo():
+    global en_vivo_pendiente
+    if en_vivo_pendiente is not None:
+        ventana.after_cancel(en_vivo_pendiente)
+        en_vivo_pendiente = None
+
+def programar_revision():
+    global revision_pendiente
+    revision_pendiente = ventana.after(INTERVALO_REVISION, revisar_trabajo)
+
+def revisar_trabajo():
+    # Revisamos si el trabajador terminó alguna etapa y la mostramos
+    global revision_pendiente
+    revision_pendiente = None
+    analisis = analisis_actual
+    
+    for etapa, datos in trabajador.recibir():
+        if etapa == "error":
+            if modo_en_vivo.get():
+                # Mientras se escribe no interrumpimos con un diálogo
+                etiqueta_estado.configure(text="No se pudo analizar la función")
+                return
+            etiqueta_estado.configure(text="")
+            messagebox.showerror("Error", "No se pudo analizar la función: " + datos)
+            return
+        if etapa == "fin":
+            terminar_analisis(analisis)
+            return
+        analisis.incorporar(datos)
+        mostrar_etapa(analisis, etapa)
         
-    ax.grid(True, linestyle='--', alpha=0.7)
-    ax.axhline(0, color=theme["graph_fg"], linewidth=1)
-    ax.axvline(0, color=theme["graph_fg"], linewidth=1)
-    
-    # Leyenda con texto correcto
-    leg = ax.legend(facecolor=theme["graph_bg"], edgecolor=theme["graph_fg"])
-    for text in leg.get_texts():
-        text.set_color(theme["graph_fg"])
-    
-    figura_grafico.tight_layout()
-    
-    canvas_grafico = FigureCanvasTkAgg(figura_grafico, master=frame_grafico)
-    canvas_grafico.draw()
-    canvas_grafico.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+    if trabajador.ocupado():
+        mostrar_progreso(len(etapas_mostradas))
+        programar_revision()
+
+def mostrar_progreso(completas):
+    total = len(tareas.ETAPAS)
+    if completas < total:
+        siguiente = tareas.NOMBRES_ETAPAS[tareas.ETAPAS[completas][0]]
+        etiqueta_estado.configure(text=f"Calculando {siguiente}... ({completas}/{total})")
+
+def cancelar_analisis():
+    trabajador.cancelar()
+    detener_revision()
+    etiqueta_estado.configure(text="")
+
+def detener_revision():
+    global revision_pendiente
+    if revision_pendiente is not None:
+        ventana.after_cancel(revision_pendiente)
+        revision_pendiente = None
+
+def terminar_analisis(analisis):
+    etiqueta_estado.configure(text="")
+    # Guardamos lo calculado en la cache en disco (si está activa)
+    operations.persistir(analisis)
+
+def mostrar_etapa(analisis, etapa):
+    # Dibuja en pantalla el resultado de una etapa del análisis (una sola vez)
+    if etapa in etapas_mostradas:
+        return
+    etapas_mostradas.add(etapa)
+    with instrumentacion.medir("gui." + etapa):
+        dibujar_etapa(analisis, etapa)
+
+def dibujar_etapa(analisis, etapa):
+    if etapa == "derivadas":
+        pasos_ventana.agregar_seccion("1. Cálculo de Derivadas", steps.pasos_derivadas(analisis))
+    elif etapa == "criticos":
+        pasos_ventana.agregar_seccion("2. Puntos Críticos y Clasificación", steps.pasos_puntos_criticos(analisis))
+    elif etapa == "inflexion":
+        pasos_ventana.agregar_seccion("3. Puntos de Inflexión", steps.pasos_inflexion(analisis))
+    elif etapa == "intervalos":
+        pasos_ventana.agregar_seccion("4. Intervalos de Crecimiento/Decrecimiento", steps.pasos_crecimiento(analisis))
+        pasos_ventana.agregar_seccion("5. Intervalos de Concavidad", steps.pasos_concavidad(analisis))
+    elif etapa == "grafico":
+        graficar_en_ventana(analisis)
+
+def graficar_en_ventana(analisis):
+    # La figura y el canvas son siempre los mismos: solo cambian los datos
+    grafico_ventana.mostrar(analisis)
+    if not grafico_ventana.widget.winfo_ismapped():
+        grafico_ventana.widget.pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+
+def mostrar_previa(analisis):
+    # Curva sin marcadores en la ventana por defecto, mientras el trabajador
+    # busca los puntos de interés (modo en vivo)
+    a, b = operations.VENTANA_NUMERICA
+    grafico_ventana.mostrar_previa(operations.muestrear_funcion(analisis.funcion, a, b), (a, b))
+    if not grafico_ventana.widget.winfo_ismapped():
+        grafico_ventana.widget.pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+
+def vista_cambiada(a, b):
+    # Se llama en cada paso del zoom o del arrastre. Esperamos a que el
+    # usuario se detenga (RETARDO_VISTA) antes de volver a muestrear.
+    global remuestreo_pendiente
+    cancelar_remuestreo()
+    if familia_actual is not None:
+        remuestreo_pendiente = ventana.after(RETARDO_VISTA, remuestrear_familia)
+        return
+    if "grafico" not in etapas_mostradas:
+        return
+    tramos = muestreo.tramos_de_vista(a, b)
+    remuestreo_pendiente = ventana.after(RETARDO_VISTA, remuestrear_vista, a, b, tramos, [])
+
+def remuestrear_vista(a, b, tramos, muestras):
+    # Muestreamos un tramo por vuelta del bucle de Tk, así la ventana sigue
+    # respondiendo aunque la función sea cara; los tramos ya vistos salen de
+    # la cache de operations.muestra_de_tramo
+    global remuestreo_pendiente
+    funcion = analisis_actual.funcion
+    nivel, indice = tramos[len(muestras)]
+    muestras.append(operations.muestra_de_tramo(funcion, nivel, indice))
+    if len(muestras) < len(tramos):
+        remuestreo_pendiente = ventana.after(1, remuestrear_vista, a, b, tramos, muestras)
+        return
+    x_vals, y_vals = muestreo.unir_tramos(muestras)
+    grafico_ventana.mostrar_curva(x_vals, y_vals)
+    # Los marcadores van después del redibujo de la curva, con blitting
+    remuestreo_pendiente = ventana.after_idle(actualizar_marcadores_vista, a, b)
+
+def actualizar_marcadores_vista(a, b):
+    global remuestreo_pendiente
+    remuestreo_pendiente = None
+    grafico_ventana.mostrar_marcadores(*analisis_actual.marcadores_en(a, b))
+
+def cancelar_remuestreo():
+    global remuestreo_pendiente
+    if remuestreo_pendiente is not None:
+        ventana.after_cancel(remuestreo_pendiente)
+        remuestreo_pendiente = None
 
 def limpiar_todo():
+    global accion_pendiente
+    cancelar_en_vivo()
+    cancelar_lectura()
+    cancelar_analisis()
+    cancelar_remuestreo()
+    cancelar_familia()
+    quitar_deslizadores()
     entrada_funcion.delete(0, tk.END)
-    for widget in frame_resultados.winfo_children():
-        widget.destroy()
-    for widget in frame_grafico.winfo_children():
+    if not modulos_cargados:
+        accion_pendiente = None
+        return
+    pasos_ventana.limpiar()
+    grafico_ventana.limpiar()
+    grafico_ventana.widget.pack_forget()
+
+def iniciar_familia(funcion, en_vivo=False):
+    # Función con parámetros: la parte simbólica (derivadas y soluciones
+    # generales) va en un proceso de tareas porque puede tardar lo que tarda
+    # solve; después cada movimiento de un deslizador solo vuelve a evaluar
+    global analisis_actual, preparacion, revision_familia
+    analisis_actual = None
+    etapas_mostradas.clear()
+    if len(parametros.parametros_de(funcion)) > parametros.MAX_PARAMETROS:
+        quitar_deslizadores()
+        etiqueta_estado.configure(text=f"Demasiados parámetros (como máximo {parametros.MAX_PARAMETROS})")
+        return
+    trabajador.enviar_aparte(tareas.NODO_FAMILIA, funcion, reemplazar=en_vivo)
+    preparacion = funcion
+    etiqueta_estado.configure(text="Resolviendo en función de los parámetros...")
+    revisar_familia()
+
+def revisar_familia():
+    global preparacion, revision_familia, familia_actual
+    revision_familia = None
+    mensaje = trabajador.recibir_aparte(tareas.NODO_FAMILIA)
+    if mensaje is None:
+        revision_familia = ventana.after(INTERVALO_REVISION, revisar_familia)
+        return
+    funcion = preparacion
+    preparacion = None
+    estado, datos = mensaje
+    try:
+        if estado == "error":
+            raise RuntimeError(datos)
+        # Solo se compila aquí (lambdify): sympy ya no resuelve nada
+        familia_actual = parametros.preparar(funcion, datos)
+    except Exception:
+        etiqueta_estado.configure(text="No se pudo analizar la función")
+        return
+    etiqueta_estado.configure(text="")
+    crear_deslizadores(familia_actual)
+    pasos_ventana.agregar_seccion("Función con parámetros", steps.pasos_parametricos(familia_actual))
+    valores = valores_parametros()
+    a, b = familia_actual.rango_grafico(valores)
+    grafico_ventana.mostrar_variacion(familia_actual.evaluar(valores, a, b), (a, b))
+    if not grafico_ventana.widget.winfo_ismapped():
+        grafico_ventana.widget.pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+
+def funcion_con_parametros():
+    # La función con parámetros que se muestra o se está preparando (o None)
+    if preparacion is not None:
+        return preparacion
+    if familia_actual is not None:
+        return familia_actual.funcion
+    return None
+
+def cancelar_familia():
+    # Deja de mostrar la función con parámetros. Si la parte simbólica sigue
+    # en su proceso, termina sola y su resultado se descarta (el proceso se
+    # reinicia si quedó un solve abandonado).
+    global familia_actual, preparacion, revision_familia, actualizacion_parametros
+    familia_actual = None
+    if preparacion is not None:
+        trabajador.cancelar_aparte(tareas.NODO_FAMILIA, matar=False)
+    preparacion = None
+    if revision_familia is not None:
+        ventana.after_cancel(revision_familia)
+        revision_familia = None
+    if actualizacion_parametros is not None:
+        ventana.after_cancel(actualizacion_parametros)
+        actualizacion_parametros = None
+
+def crear_deslizadores(familia):
+    # Un deslizador por parámetro; los que ya estaban (en modo en vivo, al
+    # seguir escribiendo) conservan su valor
+    anteriores = valores_parametros()
+    quitar_deslizadores()
+    desde, hasta = parametros.RANGO_PARAMETRO
+    for simbolo in familia.parametros:
+        etiqueta = tk.Label(panel_parametros, text=simbolo.name + ":", font=("Arial", 12, "bold"))
+        etiqueta.pack(side=tk.LEFT, padx=(10, 0))
+        deslizador = tk.Scale(panel_parametros, from_=desde, to=hasta, resolution=parametros.PASO_PARAMETRO,
+                              orient=tk.HORIZONTAL, length=160, font=("Arial", 9), bd=0,
+                              highlightthickness=0, command=parametro_movido)
+        deslizador.set(anteriores.get(simbolo.name, parametros.VALOR_INICIAL))
+        deslizador.pack(side=tk.LEFT, padx=(5, 10))
+        etiquetas_parametros.append(etiqueta)
+        deslizadores[simbolo.name] = deslizador
+    aplicar_tema_parametros(get_theme())
+    panel_parametros.pack(side=tk.TOP, fill=tk.X, padx=20, pady=(0, 10), before=panel_central)
+
+def quitar_deslizadores():
+    for widget in etiquetas_parametros + list(deslizadores.values()):
         widget.destroy()
-    canvas_scroll.config(scrollregion=canvas_scroll.bbox("all"))
+    etiquetas_parametros.clear()
+    deslizadores.clear()
+    panel_parametros.pack_forget()
+
+def valores_parametros():
+    return {nombre: float(deslizador.get()) for nombre, deslizador in deslizadores.items()}
+
+def parametro_movido(valor=None):
+    # Se llama en cada paso de un deslizador: juntamos los movimientos y
+    # redibujamos como mucho una vez cada INTERVALO_PARAMETROS
+    global actualizacion_parametros
+    if familia_actual is None or actualizacion_parametros is not None:
+        return
+    actualizacion_parametros = ventana.after(INTERVALO_PARAMETROS, actualizar_parametros)
+
+def actualizar_parametros():
+    # Solo números en las funciones ya compiladas: nada de sympy aquí
+    global actualizacion_parametros
+    actualizacion_parametros = None
+    a, b = grafico_ventana.vista()
+    grafico_ventana.mostrar_variacion(familia_actual.evaluar(valores_parametros(), a, b))
+
+def remuestrear_familia():
+    global remuestreo_pendiente
+    remuestreo_pendiente = None
+    actualizar_parametros()
+
+def toggle_diagnostico():
+    # Abre o cierra la ventana de tiempos; la instrumentación solo está
+    # encendida mientras está abierta
+    global ventana_diagnostico
+    if ventana_diagnostico is not None:
+        ventana_diagnostico.cerrar()
+        return
+    import diagnostico
+    def funcion_actual():
+        return analisis_actual.funcion if analisis_actual is not None else None
+    ventana_diagnostico = diagnostico.VentanaDiagnostico(ventana, get_theme(), trabajador, funcion_actual,
+                                                         al_cerrar=diagnostico_cerrado)
+
+def diagnostico_cerrado():
+    global ventana_diagnostico
+    ventana_diagnostico = None
 
 def validar_entrada(char):
     # Solo permite caracteres válidos para expresiones matemáticas
-    # Números, operadores, paréntesis, x, y letras para funciones (sin, cos, etc.)
-    permitidos = "0123456789+-*/^(). xyzsincotaelgqpr"
+    # Números, operadores, paréntesis y letras: x, funciones (sin, cos, etc.)
+    # y parámetros (a, b, k...; la e es el número de Euler)
+    permitidos = "0123456789+-*/^(). abcdefghijklmnopqrstuvwxyz"
     return char.lower() in permitidos
 
+def cerrar_ventana():
+    trabajador.cerrar()
+    ventana.destroy()
+
 def iniciar_gui():
-    global ventana, entrada_funcion, frame_resultados, frame_grafico, canvas_scroll
+    construir_ventana()
+    ventana.mainloop()
+
+def construir_ventana():
+    # Arma la ventana sin esperar a sympy ni a matplotlib: el panel de pasos y
+    # el gráfico se agregan cuando termina la precarga (terminar_precarga)
+    global ventana, entrada_funcion, pasos_ventana, frame_grafico
     global panel_superior, panel_central, frame_izq_container, etiqueta_funcion, btn_analizar, btn_limpiar, btn_tema
+    global etiqueta_estado, chk_en_vivo, modo_en_vivo, btn_diagnostico, panel_parametros
     
     ventana = tk.Tk()
     ventana.title("grafi")
@@ -481,6 +734,8 @@ def iniciar_gui():
     entrada_funcion.pack(side=tk.LEFT, padx=10)
     # Analizar al presionar Enter
     entrada_funcion.bind('<Return>', lambda event: analizar_funcion())
+    # En modo en vivo se analiza al dejar de escribir
+    entrada_funcion.bind('<KeyRelease>', programar_en_vivo)
     
     btn_analizar = tk.Button(panel_superior, text="ANALIZAR", command=analizar_funcion, 
                              font=("Arial", 10, "bold"), relief=tk.FLAT, padx=15, pady=5, cursor="hand2")
@@ -490,11 +745,28 @@ def iniciar_gui():
                             font=("Arial", 10, "bold"), relief=tk.FLAT, padx=15, pady=5, cursor="hand2")
     btn_limpiar.pack(side=tk.LEFT, padx=10)
     
+    modo_en_vivo = tk.BooleanVar(value=False)
+    chk_en_vivo = tk.Checkbutton(panel_superior, text="En vivo", variable=modo_en_vivo,
+                                 font=("Arial", 10), relief=tk.FLAT, cursor="hand2")
+    chk_en_vivo.pack(side=tk.LEFT, padx=10)
+    
     # Botón de Tema (Derecha)
     btn_tema = tk.Button(panel_superior, text="Modo: Oscuro", command=toggle_theme,
                          font=("Arial", 10, "bold"), relief=tk.FLAT, padx=15, pady=5, cursor="hand2")
     btn_tema.pack(side=tk.RIGHT, padx=10)
     
+    # Tiempos por etapa (ventana aparte)
+    btn_diagnostico = tk.Button(panel_superior, text="Diagnóstico", command=toggle_diagnostico,
+                                font=("Arial", 10, "bold"), relief=tk.FLAT, padx=15, pady=5, cursor="hand2")
+    btn_diagnostico.pack(side=tk.RIGHT, padx=10)
+    
+    # Progreso del análisis en segundo plano
+    etiqueta_estado = tk.Label(panel_superior, text="Cargando módulos...", font=("Arial", 10, "italic"))
+    etiqueta_estado.pack(side=tk.LEFT, padx=10)
+    
+    # Deslizadores de los parámetros (se muestra solo si la función tiene)
+    panel_parametros = tk.Frame(ventana)
+    
     # Panel central
     panel_central = tk.PanedWindow(ventana, orient=tk.HORIZONTAL, sashwidth=6, sashrelief=tk.RAISED)
     panel_central.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
@@ -503,22 +775,6 @@ def iniciar_gui():
     frame_izq_container = tk.Frame(panel_central, bd=1, relief=tk.SOLID)
     panel_central.add(frame_izq_container, width=450, minsize=300)
     
-    canvas_scroll = tk.Canvas(frame_izq_container, highlightthickness=0)
-    scrollbar = tk.Scrollbar(frame_izq_container, orient="vertical", command=canvas_scroll.yview)
-    frame_resultados = tk.Frame(canvas_scroll)
-    
-    frame_resultados_id = canvas_scroll.create_window((0, 0), window=frame_resultados, anchor="nw")
-    
-    def on_canvas_configure(event):
-        canvas_scroll.itemconfig(frame_resultados_id, width=event.width)
-    
-    canvas_scroll.bind("<Configure>", on_canvas_configure)
-    frame_resultados.bind("<Configure>", lambda e: canvas_scroll.configure(scrollregion=canvas_scroll.bbox("all")))
-    canvas_scroll.configure(yscrollcommand=scrollbar.set)
-    
-    canvas_scroll.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-    
     # Lado Derecho
     frame_grafico = tk.Frame(panel_central, bd=1, relief=tk.SOLID)
     panel_central.add(frame_grafico, minsize=300)
@@ -526,7 +782,16 @@ def iniciar_gui():
     # Aplicar tema inicial (Dark)
     aplicar_tema()
     
-    ventana.mainloop()
+    # sympy y matplotlib se cargan en segundo plano; la ventana ya responde
+    threading.Thread(target=precargar_modulos, daemon=True).start()
+    ventana.after(INTERVALO_PRECARGA, revisar_precarga)
+    
+    # Arrancamos el proceso trabajador de antemano para que el primer análisis
+    # no espere (él importa operations por su cuenta)
+    trabajador.iniciar()
+    trabajador.iniciar_aparte(tareas.NODO_LECTURA)
+    ventana.protocol("WM_DELETE_WINDOW", cerrar_ventana)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support() # Necesario para el proceso trabajador en PyInstaller
     iniciar_gui()
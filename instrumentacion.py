@@ -0,0 +1,246 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+# Aquí medimos cuánto tarda cada etapa del análisis (parseo, derivadas,
+# solve, clasificación, intervalos, pasos, panel, dibujo del gráfico).
+# Apagada (lo normal) cuesta casi nada: medido() solo revisa una variable y
+# medir() devuelve siempre el mismo objeto vacío. Encendida guarda, por
+# etapa, llamadas, tiempo total y máximo, y los últimos eventos con su
+# inicio para exportarlos en el formato de trazas de Chrome
+# (chrome://tracing o https://ui.perfetto.dev).
+# Los procesos de tareas miden por su cuenta y mandan su registro con cada
+# resultado (ver incorporar).
+# Uso sin interfaz: python instrumentacion.py "x^3 - 3*x" [--chrome traza.json] [--perfil salida.prof]
+
+MAX_EVENTOS = 20000
+
+activo = False
+_candado = threading.Lock()
+_etapas = {} # nombre -> [llamadas, segundos totales, segundos máximo]
+_contadores = {} # nombre -> cantidad
+_eventos = deque(maxlen=MAX_EVENTOS) # (nombre, inicio, duración, origen, hilo)
+_caches = {} # nombre -> función que devuelve (aciertos, fallos)
+_caches_remotas = {} # origen -> {nombre: (aciertos, fallos)}
+
+def activar():
+    global activo
+    activo = True
+
+def desactivar():
+    global activo
+    activo = False
+
+def reiniciar():
+    with _candado:
+        _etapas.clear()
+        _contadores.clear()
+        _eventos.clear()
+        _caches_remotas.clear()
+
+def _registrar(nombre, inicio, duracion, origen=None, hilo=None):
+    with _candado:
+        etapa = _etapas.get(nombre)
+        if etapa is None:
+            _etapas[nombre] = [1, duracion, duracion]
+        else:
+            etapa[0] += 1
+            etapa[1] += duracion
+            etapa[2] = max(etapa[2], duracion)
+        _eventos.append((nombre, inicio, duracion, origen or os.getpid(), hilo or threading.get_ident()))
+
+class _Medicion:
+    # Contexto que mide un bloque (solo se crea con la instrumentación encendida)
+    __slots__ = ("nombre", "inicio")
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *error):
+        _registrar(self.nombre, self.inicio, time.perf_counter() - self.inicio)
+        return False
+
+class _SinMedicion:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *error):
+        return False
+
+_SIN_MEDICION = _SinMedicion()
+
+def medir(nombre):
+    # with instrumentacion.medir("etapa"): ...
+    if not activo:
+        return _SIN_MEDICION
+    return _Medicion(nombre)
+
+def medido(nombre):
+    # Decorador: mide cada llamada a la función con el nombre de etapa dado
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not activo:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                _registrar(nombre, inicio, time.perf_counter() - inicio)
+        return envoltura
+    return decorador
+
+def contar(nombre, cantidad=1):
+    if not activo:
+        return
+    with _candado:
+        _contadores[nombre] = _contadores.get(nombre, 0) + cantidad
+
+def registrar_cache(nombre, consulta):
+    # `consulta()` devuelve (aciertos, fallos); para un lru_cache basta con
+    # registrar_cache("x", lambda: lru_info(funcion))
+    _caches[nombre] = consulta
+
+def lru_info(funcion):
+    info = funcion.cache_info()
+    return info.hits, info.misses
+
+def exportar():
+    # Registro de este proceso (se puede mandar a otro con pickle o JSON)
+    with _candado:
+        return {
+            "origen": os.getpid(),
+            "etapas": {nombre: list(valores) for nombre, valores in _etapas.items()},
+            "contadores": dict(_contadores),
+            "eventos": list(_eventos),
+            "caches": {nombre: tuple(consulta()) for nombre, consulta in _caches.items()},
+        }
+
+def incorporar(registro):
+    # Suma el registro de otro proceso (por ejemplo, un nodo de tareas)
+    for nombre, inicio, duracion, origen, hilo in registro["eventos"]:
+        _registrar(nombre, inicio, duracion, origen, hilo)
+    with _candado:
+        for nombre, cantidad in registro["contadores"].items():
+            _contadores[nombre] = _contadores.get(nombre, 0) + cantidad
+        # Las caches son acumuladas por proceso: vale la última foto
+        _caches_remotas[registro["origen"]] = registro["caches"]
+
+def resumen():
+    # Etapas ordenadas por tiempo total, contadores y caches (locales y de
+    # los otros procesos)
+    with _candado:
+        etapas = sorted(((nombre, v[0], v[1], v[2]) for nombre, v in _etapas.items()), key=lambda e: -e[2])
+        contadores = dict(_contadores)
+        remotas = {origen: dict(caches) for origen, caches in _caches_remotas.items()}
+    caches = {nombre: tuple(consulta()) for nombre, consulta in _caches.items()}
+    return {"etapas": etapas, "contadores": contadores, "caches": caches, "caches_remotas": remotas}
+
+def texto_resumen():
+    datos = resumen()
+    lineas = [f"{'etapa':<28}{'llamadas':>9}{'total (ms)':>12}{'máx (ms)':>11}"]
+    for nombre, llamadas, total, maximo in datos["etapas"]:
+        lineas.append(f"{nombre:<28}{llamadas:>9}{total * 1000:>12.1f}{maximo * 1000:>11.1f}")
+    if datos["contadores"]:
+        lineas.append("")
+        for nombre, cantidad in sorted(datos["contadores"].items()):
+            lineas.append(f"{nombre:<28}{cantidad:>9}")
+    grupos = [("caches", datos["caches"])]
+    grupos += [(f"caches (proceso {origen})", caches) for origen, caches in sorted(datos["caches_remotas"].items())]
+    for titulo, caches in grupos:
+        if not caches:
+            continue
+        lineas.append("")
+        lineas.append(f"{titulo:<28}{'aciertos':>9}{'fallos':>12}")
+        for nombre, (aciertos, fallos) in sorted(caches.items()):
+            lineas.append(f"{nombre:<28}{aciertos:>9}{fallos:>12}")
+    return "\n".join(lineas)
+
+def exportar_json(ruta):
+    datos = resumen()
+    datos["etapas"] = [{"etapa": n, "llamadas": c, "total_s": t, "maximo_s": m} for n, c, t, m in datos["etapas"]]
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(datos, archivo, indent=2, ensure_ascii=False)
+
+def exportar_chrome(ruta):
+    # Formato "Trace Event" de Chrome: un evento completo ("X") por medición,
+    # con tiempos en microsegundos
+    with _candado:
+        eventos = list(_eventos)
+    traza = [{"name": nombre, "ph": "X", "ts": inicio * 1e6, "dur": duracion * 1e6, "pid": origen, "tid": hilo}
+             for nombre, inicio, duracion, origen, hilo in eventos]
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump({"traceEvents": traza, "displayTimeUnit": "ms"}, archivo)
+
+def perfilar(funcion, *args, ruta=None, lineas=30):
+    # Corre funcion(*args) con cProfile. Devuelve (resultado, texto con las
+    # funciones de más tiempo acumulado); con `ruta` guarda también el .prof
+    # (se abre con snakeviz o pstats)
+    perfil = cProfile.Profile()
+    resultado = perfil.runcall(funcion, *args)
+    if ruta is not None:
+        perfil.dump_stats(ruta)
+    salida = io.StringIO()
+    pstats.Stats(perfil, stream=salida).sort_stats("cumulative").print_stats(lineas)
+    return resultado, salida.getvalue()
+
+def analisis_completo(funcion):
+    # Todas las partes del análisis y todos los pasos de `funcion`, en este
+    # proceso y sin la cache de análisis (lo que se mide o se perfila)
+    import operations
+    import steps
+    import tareas
+    analisis = operations.Analisis(funcion)
+    for _, _, partes in tareas.NODOS:
+        for parte in partes:
+            getattr(analisis, parte)
+    steps.pasos_derivadas(analisis)
+    steps.pasos_puntos_criticos(analisis)
+    steps.pasos_inflexion(analisis)
+    steps.pasos_crecimiento(analisis)
+    steps.pasos_concavidad(analisis)
+    return analisis
+
+def main(argumentos=None):
+    import argparse
+    # Como script este archivo es __main__: operations y steps usan el módulo
+    # importado, así que se trabaja con ese
+    import instrumentacion as modulo
+    import operations
+    parser = argparse.ArgumentParser(description="Tiempos por etapa del análisis de una función")
+    parser.add_argument("expresion")
+    parser.add_argument("--json", help="guardar el resumen en este archivo")
+    parser.add_argument("--chrome", help="guardar la traza (formato de Chrome) en este archivo")
+    parser.add_argument("--perfil", help="correr el análisis con cProfile y guardar el .prof aquí")
+    args = parser.parse_args(argumentos)
+
+    modulo.activar()
+    funcion = operations.convertir_texto_a_funcion(args.expresion)
+    if funcion is None:
+        raise SystemExit("La función ingresada no es válida.")
+    if args.perfil:
+        _, texto = modulo.perfilar(modulo.analisis_completo, funcion, ruta=args.perfil)
+        print(texto)
+    else:
+        with modulo.medir("analisis"):
+            modulo.analisis_completo(funcion)
+    print(modulo.texto_resumen())
+    if args.json:
+        modulo.exportar_json(args.json)
+    if args.chrome:
+        modulo.exportar_chrome(args.chrome)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import math
+import sympy
+import numpy as np
+from collections import namedtuple
+from functools import lru_cache
+
+# Aquí está el muestreo adaptativo de la curva para el gráfico.
+# En lugar de una grilla fija de 400 puntos empezamos con pocos puntos y
+# agregamos más solo donde la curva se dobla (el punto del medio se aleja de
+# la cuerda entre sus vecinos). La ventana se corta en las singularidades y
+# bordes del dominio, que se calculan una sola vez, para no unir con una
+# línea vertical los dos lados de un polo (1/x, tan(x)).
+# Este módulo solo hace cuentas numéricas: recibe una función que evalúa
+# arreglos (operations.evaluar_en_arreglo) y los puntos de corte ya calculados.
+
+# Puntos de la grilla inicial en toda la ventana
+PUNTOS_INICIALES = 65
+# Desvío máximo permitido entre la curva y la línea dibujada, como fracción
+# de la altura visible del gráfico (un píxel, más o menos)
+TOLERANCIA = 2e-3
+# Cuántas veces se puede partir a la mitad un intervalo de la grilla inicial
+PROFUNDIDAD_MAXIMA = 12
+# Tope de puntos del gráfico, por complicada que sea la curva
+MAX_PUNTOS = 4000
+
+# Para el gráfico interactivo la recta se divide en tramos de ancho 2^nivel;
+# cada vista usa unos TRAMOS_POR_VISTA tramos del nivel que le corresponde, y
+# los tramos ya muestreados se reutilizan al volver a pasar por ahí
+TRAMOS_POR_VISTA = 4
+
+# Resultado del muestreo: xs e ys listos para plot (con NaN donde la curva
+# se corta) y los límites verticales sugeridos, o None si no hay valores
+Muestra = namedtuple("Muestra", "xs ys limites_y")
+
+@lru_cache(maxsize=256)
+def fronteras(funcion):
+    # Expresiones cuyos ceros son singularidades o bordes del dominio:
+    # denominadores, argumentos de log y de raíces, y los cos/sin que
+    # anulan tan, sec, cot y csc. Devuelve una tupla sin repetidos.
+    resultado = []
+    for sub in sympy.preorder_traversal(funcion):
+        if isinstance(sub, sympy.Pow):
+            exponente = sub.exp
+            # x^n con n entero positivo está definida en todos lados; con n
+            # negativo hay un polo y con n fraccionario un borde del dominio
+            if not (exponente.is_integer and exponente.is_positive):
+                resultado.append(sub.base)
+        elif isinstance(sub, (sympy.tan, sympy.sec)):
+            resultado.append(sympy.cos(sub.args[0]))
+        elif isinstance(sub, (sympy.cot, sympy.csc)):
+            resultado.append(sympy.sin(sub.args[0]))
+        elif isinstance(sub, sympy.log):
+            resultado.append(sub.args[0])
+        elif isinstance(sub, (sympy.asin, sympy.acos)):
+            resultado.append(sub.args[0] - 1)
+            resultado.append(sub.args[0] + 1)
+    sin_repetir = []
+    for expresion in resultado:
+        if not expresion.is_number and expresion not in sin_repetir:
+            sin_repetir.append(expresion)
+    return tuple(sin_repetir)
+
+def limites_verticales(ys, confiables=None):
+    # Rango vertical que vale la pena mostrar. Normalmente es el rango de los
+    # valores, pero si algunos son enormes (cerca de un polo) lo recortamos a
+    # partir de los percentiles de los valores confiables (lejos de los cortes).
+    finitos = ys[np.isfinite(ys)]
+    if confiables is not None:
+        confiables = confiables[np.isfinite(confiables)]
+    if confiables is None or len(confiables) == 0:
+        confiables = finitos
+    if len(finitos) == 0:
+        return None
+    bajo, alto = (float(v) for v in np.percentile(confiables, [5, 95]))
+    ancho = max(alto - bajo, 1e-9 * max(1.0, abs(alto)))
+    minimo, maximo = float(finitos.min()), float(finitos.max())
+    if minimo < bajo - 10 * ancho:
+        minimo = bajo - ancho
+    if maximo > alto + 10 * ancho:
+        maximo = alto + ancho
+    if maximo - minimo < 1e-12:
+        # Curva constante: le damos una altura de 1 alrededor del valor
+        return (minimo - 0.5, maximo + 0.5)
+    margen = 0.05 * (maximo - minimo)
+    return (minimo - margen, maximo + margen)
+
+def _grilla_inicial(a, b, cortes):
+    # Grilla uniforme partida en segmentos por los puntos de corte. Cada
+    # segmento se acerca a los cortes sin tocarlos (ahí la función no está
+    # definida). Devuelve los x y el número de segmento de cada uno.
+    separacion = 1e-7 * (b - a)
+    bordes = [a] + sorted(c for c in cortes if a + separacion < c < b - separacion) + [b]
+    xs = []
+    segmentos = []
+    for i in range(len(bordes) - 1):
+        inicio = bordes[i] if i == 0 else bordes[i] + separacion
+        fin = bordes[i + 1] if i == len(bordes) - 2 else bordes[i + 1] - separacion
+        if fin <= inicio:
+            continue
+        cantidad = max(5, int(round(PUNTOS_INICIALES * (fin - inicio) / (b - a))) + 1)
+        xs.append(np.linspace(inicio, fin, cantidad))
+        segmentos.append(np.full(cantidad, i))
+    return np.concatenate(xs), np.concatenate(segmentos)
+
+def _errores(xs, ys, segmentos, limites):
+    # Para cada intervalo [x_i, x_i+1], cuánto necesita refinarse: el desvío
+    # (relativo a la altura visible) de sus extremos respecto de la cuerda de
+    # sus vecinos, o infinito si de un lado la función existe y del otro no.
+    # Lo que queda fuera de la pantalla no se refina.
+    finitos = np.isfinite(ys)
+    bajo, tope = limites
+    alto = tope - bajo
+    fuera = (ys < bajo) | (ys > tope)
+    ys = np.clip(ys, bajo - alto, tope + alto)
+    error_punto = np.zeros(len(xs))
+    with np.errstate(all='ignore'):
+        t = (xs[1:-1] - xs[:-2]) / (xs[2:] - xs[:-2])
+        cuerda = ys[:-2] + t * (ys[2:] - ys[:-2])
+        desvio = np.abs(ys[1:-1] - cuerda) / alto
+    mismo = (segmentos[:-2] == segmentos[1:-1]) & (segmentos[1:-1] == segmentos[2:])
+    desvio = np.where(mismo & np.isfinite(desvio), desvio, 0.0)
+    error_punto[1:-1] = desvio
+    error = np.maximum(error_punto[:-1], error_punto[1:])
+    mismo_lado = np.sign(ys[:-1] - bajo) == np.sign(ys[1:] - bajo)
+    error[fuera[:-1] & fuera[1:] & mismo_lado] = 0.0
+    error[finitos[:-1] != finitos[1:]] = np.inf
+    error[segmentos[:-1] != segmentos[1:]] = 0.0
+    return error
+
+def muestrear(evaluar, a, b, cortes=()):
+    # Aquí muestreamos la curva en [a, b]. `evaluar` recibe un arreglo de x y
+    # devuelve los y (NaN donde no está definida); `cortes` son los x de
+    # singularidades y bordes del dominio. Cada pasada evalúa de una sola vez
+    # los puntos medios de todos los intervalos que necesitan refinarse.
+    a, b = float(a), float(b)
+    xs, segmentos = _grilla_inicial(a, b, cortes)
+    ys = np.asarray(evaluar(xs), dtype=float)
+    # Los puntos pegados a un corte valen enormidades cerca de un polo: no
+    # los usamos para decidir la altura del gráfico
+    lejos = np.ones(len(xs), dtype=bool)
+    for c in cortes:
+        lejos &= np.abs(xs - c) > 0.01 * (b - a)
+    limites = limites_verticales(ys, ys[lejos])
+    escala = (-0.5, 0.5) if limites is None else limites
+    alto = escala[1] - escala[0]
+    ancho_minimo = (b - a) / (PUNTOS_INICIALES * 2 ** PROFUNDIDAD_MAXIMA)
+
+    while len(xs) < MAX_PUNTOS:
+        error = _errores(xs, ys, segmentos, escala)
+        refinar = (error > TOLERANCIA) & (np.diff(xs) > ancho_minimo)
+        indices = np.nonzero(refinar)[0]
+        if len(indices) == 0:
+            break
+        disponibles = MAX_PUNTOS - len(xs)
+        if len(indices) > disponibles:
+            # No alcanzan los puntos: refinamos primero lo que está peor
+            orden = np.argsort(-error[indices], kind="stable")
+            indices = np.sort(indices[orden[:disponibles]])
+        nuevos_x = (xs[indices] + xs[indices + 1]) / 2
+        nuevos_y = np.asarray(evaluar(nuevos_x), dtype=float)
+        xs = np.insert(xs, indices + 1, nuevos_x)
+        ys = np.insert(ys, indices + 1, nuevos_y)
+        segmentos = np.insert(segmentos, indices + 1, segmentos[indices])
+
+    # Cortamos la línea entre segmentos y en los saltos que siguen siendo
+    # grandes al llegar al ancho mínimo (discontinuidades no detectadas antes)
+    ys = np.where(np.isfinite(ys), ys, np.nan)
+    with np.errstate(invalid='ignore'):
+        salto = (np.abs(np.diff(ys)) > 0.5 * alto) & (np.diff(xs) <= 2 * ancho_minimo)
+    cortar = np.nonzero((segmentos[:-1] != segmentos[1:]) | salto)[0]
+    xs = np.insert(xs, cortar + 1, (xs[cortar] + xs[cortar + 1]) / 2)
+    ys = np.insert(ys, cortar + 1, np.nan)
+    return Muestra(xs, ys, limites)
+
+def tramos_de_vista(a, b):
+    # Tramos (nivel, índice) que cubren la vista [a, b]
+    nivel = math.floor(math.log2((b - a) / TRAMOS_POR_VISTA))
+    ancho = 2.0 ** nivel
+    return [(nivel, i) for i in range(math.floor(a / ancho), math.floor(b / ancho) + 1)]
+
+def limites_de_tramo(nivel, indice):
+    ancho = 2.0 ** nivel
+    return indice * ancho, (indice + 1) * ancho
+
+def unir_tramos(muestras):
+    # Junta las muestras de tramos consecutivos en un solo par (xs, ys)
+    if len(muestras) == 0:
+        return np.array([]), np.array([])
+    return np.concatenate([m.xs for m in muestras]), np.concatenate([m.ys for m in muestras])
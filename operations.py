@@ -1,44 +1,315 @@
+import os
+import re
 import sympy
+from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor
 import numpy as np
+import mpmath
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import lru_cache, cached_property
+import polinomios # polinomios.py --> Camino rápido para polinomios
+import muestreo # muestreo.py --> Muestreo adaptativo del gráfico
+import instrumentacion # instrumentacion.py --> Tiempos por etapa (apagada por defecto)
 
 # Aquí definimos las funciones matemáticas puras que usaremos en el programa.
 # No dependemos de ninguna interfaz gráfica aquí, solo cálculos.
 
+# Lo único que se acepta al leer una expresión: sympify usa eval, así que un
+# texto como __import__('os').getpid() se ejecutaría. Leemos con parse_expr
+# sobre un espacio de nombres cerrado (sin builtins) y antes revisamos los
+# caracteres y los nombres: funciones conocidas, pi, E y variables de una letra.
+# La e minúscula también es el número de Euler (e^x), no un parámetro.
+MAX_LARGO_EXPRESION = 500
+CARACTERES_PERMITIDOS = set("0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ+-*/^()., \t")
+NOMBRES_PERMITIDOS = {
+    "sin": sympy.sin, "cos": sympy.cos, "tan": sympy.tan,
+    "cot": sympy.cot, "sec": sympy.sec, "csc": sympy.csc,
+    "asin": sympy.asin, "acos": sympy.acos, "atan": sympy.atan,
+    "sinh": sympy.sinh, "cosh": sympy.cosh, "tanh": sympy.tanh,
+    "exp": sympy.exp, "log": sympy.log, "ln": sympy.log,
+    "sqrt": sympy.sqrt, "abs": sympy.Abs,
+    "pi": sympy.pi, "E": sympy.E, "e": sympy.E,
+}
+# Lo que generan las transformaciones de parse_expr (números y símbolos)
+_GLOBALES_PARSEO = {"Integer": sympy.Integer, "Float": sympy.Float, "Rational": sympy.Rational,
+                    "Symbol": sympy.Symbol, "__builtins__": {}}
+_TRANSFORMACIONES = standard_transformations + (convert_xor,)
+
+def texto_permitido(texto_funcion):
+    # True si el texto solo tiene caracteres y nombres permitidos
+    if len(texto_funcion) > MAX_LARGO_EXPRESION or not set(texto_funcion) <= CARACTERES_PERMITIDOS:
+        return False
+    if re.search(r"\.\s*[A-Za-z]", texto_funcion):
+        # El punto solo va en los decimales, nunca para pedir un atributo (x.n)
+        return False
+    for nombre in re.findall(r"[A-Za-z]+", texto_funcion):
+        if len(nombre) > 1 and nombre not in NOMBRES_PERMITIDOS:
+            return False
+    return True
+
+@lru_cache(maxsize=512)
+@instrumentacion.medido("parseo")
 def convertir_texto_a_funcion(texto_funcion):
     # Aquí intentamos convertir el texto que ingresó el usuario a una expresión de SymPy.
     # Usamos try-except para que el programa no se rompa si el usuario escribe algo mal.
+    # Se guarda el resultado de cada texto (en modo en vivo se repiten mucho).
+    if not texto_permitido(texto_funcion):
+        return None
     try:
-        x = sympy.symbols('x')
-        # sympify convierte el string a expresión matemática
-        funcion = sympy.sympify(texto_funcion)
-        return funcion
-    except:
+        funcion = parse_expr(texto_funcion, local_dict=dict(NOMBRES_PERMITIDOS),
+                             global_dict=dict(_GLOBALES_PARSEO), transformations=_TRANSFORMACIONES)
+    except Exception:
         # Si falla, devolvemos None para indicar error
         return None
+    if not isinstance(funcion, sympy.Expr):
+        # Una tupla ("x, 2"), una función sin argumentos ("sin"), etc.
+        return None
+    return funcion
 
+@lru_cache(maxsize=1024)
+def _derivar_termino(termino):
+    x = sympy.symbols('x')
+    return sympy.diff(termino, x)
+
+@instrumentacion.medido("derivada")
 def calcular_derivada(funcion):
     # Aquí calculamos la derivada de la función con respecto a x.
-    x = sympy.symbols('x')
-    derivada = sympy.diff(funcion, x)
-    return derivada
+    # Los polinomios se derivan directamente sobre sus coeficientes
+    coefs = polinomios.coeficientes(funcion)
+    if coefs is not None:
+        return polinomios.a_expresion(polinomios.derivar(coefs))
+    # Una suma se deriva término por término: al editar la expresión casi
+    # todos los términos siguen iguales y su derivada sale de la cache
+    if isinstance(funcion, sympy.Add):
+        return sympy.Add(*[_derivar_termino(t) for t in funcion.args])
+    return _derivar_termino(funcion)
 
-def encontrar_puntos_criticos(primera_derivada):
-    # Aquí buscamos los valores de x donde la derivada es 0.
+# Tiempo máximo (en segundos) que esperamos a sympy.solve antes de pasar al
+# método numérico, y el intervalo de x donde buscamos raíces numéricamente
+TIEMPO_LIMITE_SOLVE = 2.0
+VENTANA_NUMERICA = (-10.0, 10.0)
+
+# Máximo de soluciones que sacamos de una familia periódica (sin(x) = 0 tiene
+# infinitas); solo se generan las que caen dentro de la ventana
+MAX_SOLUCIONES_PERIODICAS = 200
+
+# Hilos de solve que pasaron el tiempo límite y siguen corriendo
+_hilos_abandonados = []
+
+def correr_con_limite(trabajo, limite):
+    # Corremos trabajo() en un hilo aparte y esperamos como máximo `limite`.
+    # Devuelve lo que devolvió trabajo(), o None si se pasó del tiempo o falló.
+    resultado = {}
+    
+    def correr():
+        try:
+            resultado["valor"] = trabajo()
+        except Exception:
+            pass
+    
+    hilo = threading.Thread(target=correr, daemon=True)
+    hilo.start()
+    hilo.join(limite)
+    if hilo.is_alive():
+        # Python no permite matar un hilo: lo dejamos terminar por su cuenta
+        _hilos_abandonados.append(hilo)
+        return None
+    return resultado.get("valor")
+
+def _solve_con_limite(expresion, limite, ventana):
+    # sympy.solve con tiempo límite (ver correr_con_limite).
+    # Si la expresión es periódica usamos solveset (solución general) y
+    # enumeramos solo las soluciones dentro de la ventana.
+    # Devuelve (lista de soluciones, metodo), o None si se pasó del tiempo o falló.
     x = sympy.symbols('x')
-    try:
-        # solve nos devuelve una lista de soluciones
-        puntos = sympy.solve(primera_derivada, x)
-        
+    
+    def trabajo():
+        periodo = sympy.periodicity(expresion, x)
+        if periodo is not None and periodo != 0:
+            conjunto = sympy.solveset(expresion, x, sympy.S.Reals)
+            generador = enumerar_soluciones(conjunto, ventana[0], ventana[1])
+            puntos = list(itertools.islice(generador, MAX_SOLUCIONES_PERIODICAS))
+            return puntos, "periodico"
+        return sympy.solve(expresion, x), "exacto"
+    
+    return correr_con_limite(trabajo, limite)
+
+def _enumerar_familia(familia, a, b):
+    # Genera en orden creciente los elementos de un ImageSet (por ejemplo
+    # {2*n*pi + pi/2 : n entero}) que caen en [a, b]
+    if familia.base_sets != (sympy.S.Integers,):
+        raise ValueError("Familia de soluciones no soportada")
+    n = familia.lamda.variables[0]
+    expresion = familia.lamda.expr
+    paso = sympy.diff(expresion, n)
+    if not paso.is_number or paso == 0 or sympy.diff(paso, n) != 0:
+        raise ValueError("Familia de soluciones no lineal")
+    inicio = expresion.subs(n, 0)
+    # x = inicio + paso*n está en [a, b] para n entre estos dos valores
+    n1 = (a - float(inicio)) / float(paso)
+    n2 = (b - float(inicio)) / float(paso)
+    indices = range(math.ceil(min(n1, n2)), math.floor(max(n1, n2)) + 1)
+    if paso < 0:
+        indices = reversed(indices)
+    for k in indices:
+        yield inicio + paso * k
+
+def enumerar_soluciones(conjunto, a, b):
+    # Aquí recorremos de forma perezosa un conjunto de soluciones de solveset,
+    # en orden creciente y solo dentro de [a, b]. Las familias infinitas
+    # (ImageSet) nunca se expanden fuera de la ventana.
+    if isinstance(conjunto, sympy.FiniteSet):
+        dentro = [p for p in conjunto if p.is_real and a <= float(p) <= b]
+        yield from sorted(dentro, key=float)
+    elif isinstance(conjunto, sympy.ImageSet):
+        yield from _enumerar_familia(conjunto, a, b)
+    elif isinstance(conjunto, sympy.Union):
+        partes = [enumerar_soluciones(c, a, b) for c in conjunto.args]
+        anterior = None
+        for p in heapq.merge(*partes, key=float):
+            # Dos familias pueden compartir soluciones
+            if anterior is None or abs(float(p) - anterior) > 1e-12:
+                yield p
+            anterior = float(p)
+    elif conjunto == sympy.S.EmptySet:
+        return
+    else:
+        # ConditionSet, Intersection, etc.: no sabemos enumerarlo
+        raise ValueError("Conjunto de soluciones no soportado")
+
+def hay_calculos_abandonados():
+    # True si queda algún solve corriendo en segundo plano (gastando CPU)
+    _hilos_abandonados[:] = [h for h in _hilos_abandonados if h.is_alive()]
+    return len(_hilos_abandonados) > 0
+
+def _biseccion(evaluar, lo, hi, f_lo, iteraciones=60):
+    # Bisección vectorizada: refina todos los intervalos con cambio de signo a la vez
+    for _ in range(iteraciones):
+        medio = (lo + hi) / 2
+        f_medio = evaluar(medio)
+        mismo_signo = np.sign(f_medio) == np.sign(f_lo)
+        lo = np.where(mismo_signo, medio, lo)
+        f_lo = np.where(mismo_signo, f_medio, f_lo)
+        hi = np.where(mismo_signo, hi, medio)
+    return (lo + hi) / 2
+
+def _minimo_abs(evaluar, lo, hi, iteraciones=80):
+    # Búsqueda ternaria vectorizada del mínimo de |f| en cada intervalo.
+    # Sirve para raíces dobles (como 3x^2 en 0), donde f no cambia de signo.
+    for _ in range(iteraciones):
+        m1 = lo + (hi - lo) / 3
+        m2 = hi - (hi - lo) / 3
+        f1 = np.abs(evaluar(m1))
+        f2 = np.abs(evaluar(m2))
+        izquierda = f1 < f2
+        hi = np.where(izquierda, m2, hi)
+        lo = np.where(izquierda, lo, m1)
+    return (lo + hi) / 2
+
+def raices_en_arreglo(evaluar, a, b, cantidad=4001):
+    # Aquí buscamos las raíces reales en [a, b] de una función ya compilada
+    # (evaluar(xs) devuelve floats, con NaN donde no está definida):
+    # evaluamos en una grilla densa, encerramos cada cambio de signo y lo
+    # refinamos por bisección; los mínimos de |f| cercanos a 0 se refinan
+    # aparte (raíces dobles). Al final quitamos las raíces repetidas.
+    # Devuelve un arreglo de floats ordenado.
+    xs = np.linspace(a, b, cantidad)
+    ys = evaluar(xs)
+    finitos = np.isfinite(ys)
+    if not finitos.any():
+        return np.array([])
+    abs_y = np.abs(ys)
+    escala = max(1.0, float(np.median(abs_y[finitos])))
+    tolerancia = 1e-9 * escala
+    if np.all(abs_y[finitos] <= tolerancia):
+        # La expresión es idénticamente 0: no hay raíces aisladas
+        return np.array([])
+    
+    candidatos = [xs[finitos & (ys == 0)]]
+    
+    # Cambios de signo entre puntos vecinos
+    cambio = finitos[:-1] & finitos[1:] & (np.sign(ys[:-1]) * np.sign(ys[1:]) < 0)
+    if cambio.any():
+        candidatos.append(_biseccion(evaluar, xs[:-1][cambio], xs[1:][cambio], ys[:-1][cambio]))
+    
+    # Mínimos locales de |f| (raíces que tocan el eje sin cruzarlo)
+    vecinos_finitos = finitos[:-2] & finitos[1:-1] & finitos[2:]
+    minimo_local = vecinos_finitos & (abs_y[1:-1] <= abs_y[:-2]) & (abs_y[1:-1] <= abs_y[2:])
+    indices = np.nonzero(minimo_local)[0] + 1
+    if len(indices) > 0:
+        candidatos.append(_minimo_abs(evaluar, xs[indices - 1], xs[indices + 1]))
+    
+    candidatos = np.concatenate(candidatos)
+    valores = np.abs(evaluar(candidatos))
+    # En los polos (1/x, tan(x)) también cambia el signo, pero ahí |f| es enorme
+    cerca = valores <= 1e-6 * escala
+    candidatos, valores = candidatos[cerca], valores[cerca]
+    orden = np.argsort(candidatos)
+    
+    # De varias aproximaciones de la misma raíz nos quedamos con la mejor
+    raices = []
+    mejores = []
+    for r, v in zip(candidatos[orden], valores[orden]):
+        if len(raices) > 0 and abs(r - raices[-1]) <= 1e-6 * (1 + abs(r)):
+            if v < mejores[-1]:
+                raices[-1], mejores[-1] = r, v
+            continue
+        raices.append(r)
+        mejores.append(v)
+    
+    # Redondeamos lo que es un entero salvo error numérico (por ejemplo 0)
+    raices = np.array(raices, dtype=float)
+    enteras = np.abs(raices - np.round(raices)) < 1e-8
+    raices[enteras] = np.round(raices[enteras])
+    return raices
+
+def raices_numericas(expresion, a, b, cantidad=4001):
+    # Raíces reales de una expresión de SymPy en [a, b] (ver raices_en_arreglo),
+    # como decimales de SymPy
+    def evaluar(valores_x):
+        return evaluar_en_arreglo(expresion, valores_x)
+    return [sympy.Float(float(r), 10) for r in raices_en_arreglo(evaluar, a, b, cantidad)]
+
+@instrumentacion.medido("solve")
+def resolver_ecuacion(expresion, limite=None, ventana=None):
+    # Aquí buscamos los x reales donde la expresión vale 0.
+    # Primero intentamos con sympy.solve (exacto) con un tiempo límite; si se
+    # pasa del tiempo o falla, usamos el método numérico en la ventana.
+    # Devuelve (puntos, metodo) con metodo "exacto", "periodico" (solución
+    # general, solo los puntos dentro de la ventana), "aproximado" (raíces de
+    # un polinomio de grado alto) o "numerico".
+    if limite is None:
+        limite = TIEMPO_LIMITE_SOLVE
+    if ventana is None:
+        ventana = VENTANA_NUMERICA
+    
+    # Camino rápido: las raíces de un polinomio salen de sus coeficientes
+    coefs = polinomios.coeficientes(expresion)
+    if coefs is not None:
+        resultado = polinomios.raices_reales(coefs)
+        if resultado is not None:
+            return resultado
+    
+    resultado = _solve_con_limite(expresion, limite, ventana)
+    if resultado is not None:
+        puntos, metodo = resultado
         # Filtramos para quedarnos solo con números reales (no imaginarios)
         puntos_reales = []
         for p in puntos:
             if p.is_real:
                 puntos_reales.append(p)
-                
-        return puntos_reales
-    except:
-        # Si no podemos resolver, devolvemos lista vacía
-        return []
+        return puntos_reales, metodo
+    
+    return raices_numericas(expresion, ventana[0], ventana[1]), "numerico"
+
+def encontrar_puntos_criticos(primera_derivada):
+    # Aquí buscamos los valores de x donde la derivada es 0.
+    puntos, metodo = resolver_ecuacion(primera_derivada)
+    return puntos
 
 def evaluar_funcion(funcion, valor_x):
     # Aquí evaluamos la función en un punto específico x.
@@ -49,15 +320,859 @@ def evaluar_funcion(funcion, valor_x):
     except:
         return 0
 
+@lru_cache(maxsize=256)
+@instrumentacion.medido("compilar")
+def compilar_funcion(funcion):
+    # Aquí convertimos la expresión de SymPy en una función de NumPy que evalúa
+    # arreglos completos en una sola llamada. Se compila una vez por expresión
+    # y se reutiliza (lru_cache), en lugar de hacer subs punto por punto.
+    # Los polinomios se evalúan con Horner sobre sus coeficientes
+    coefs = polinomios.coeficientes(funcion)
+    if coefs is not None:
+        return polinomios.compilar(coefs)
+    x = sympy.symbols('x')
+    try:
+        compilada = sympy.lambdify(x, funcion, modules="numpy")
+    except:
+        # Si lambdify no sabe traducir algo, evaluamos con subs (lento pero seguro)
+        def compilada(valores):
+            return np.array([complex(funcion.subs(x, v).evalf()) for v in valores])
+    return compilada
+
+def evaluar_en_arreglo(funcion, valores_x):
+    # Aquí evaluamos la función en todo un arreglo de valores de x a la vez.
+    # Devolvemos siempre un arreglo de floats; los valores no reales o no
+    # definidos (división entre 0, raíz de negativos, etc.) quedan como NaN.
+    return evaluar_compilada(compilar_funcion(funcion), valores_x)
+
+def evaluar_compilada(compilada, valores_x, *argumentos):
+    # Igual que evaluar_en_arreglo, con una función ya compilada que recibe
+    # x y, después, los `argumentos` (los parámetros de parametros.Familia).
+    # Con compilada None (lambdify no pudo) todo queda como NaN.
+    valores_x = np.asarray(valores_x, dtype=float)
+    if compilada is None:
+        return np.full(valores_x.shape, np.nan)
+    with np.errstate(all='ignore'):
+        try:
+            resultado = np.asarray(compilada(valores_x, *argumentos))
+        except:
+            return np.full(valores_x.shape, np.nan)
+        # Si la expresión es constante, lambdify devuelve un solo número
+        resultado = np.broadcast_to(resultado, valores_x.shape)
+        if np.iscomplexobj(resultado):
+            reales = resultado.real.astype(float)
+            reales[np.abs(resultado.imag) > 1e-12] = np.nan
+            return reales
+        try:
+            return resultado.astype(float)
+        except:
+            return np.full(valores_x.shape, np.nan)
+
+def evaluar_numerico(funcion, valor_x):
+    # Igual que evaluar_en_arreglo, pero para un solo valor; devuelve un float.
+    return float(evaluar_en_arreglo(funcion, [float(valor_x)])[0])
+
+@lru_cache(maxsize=256)
+def singularidades(funcion, a, b):
+    # Aquí buscamos, una sola vez por función y ventana, los x de [a, b] donde
+    # la función tiene un polo o empieza/termina su dominio (ver muestreo.fronteras)
+    cortes = set()
+    for frontera in muestreo.fronteras(funcion):
+        def evaluar(valores_x):
+            return evaluar_en_arreglo(frontera, valores_x)
+        cortes.update(float(r) for r in raices_en_arreglo(evaluar, a, b))
+    return tuple(sorted(cortes))
+
+@instrumentacion.medido("muestreo")
+def muestrear_funcion(funcion, a, b):
+    # Muestreo adaptativo de la curva en [a, b], cortado en las singularidades
+    def evaluar(valores_x):
+        return evaluar_en_arreglo(funcion, valores_x)
+    return muestreo.muestrear(evaluar, a, b, singularidades(funcion, float(a), float(b)))
+
+@lru_cache(maxsize=512)
+def muestra_de_tramo(funcion, nivel, indice):
+    # Muestra de un tramo del gráfico interactivo (ver muestreo.tramos_de_vista);
+    # la cache hace que volver a una zona ya vista no cueste nada
+    a, b = muestreo.limites_de_tramo(nivel, indice)
+    return muestrear_funcion(funcion, a, b)
+
 def resolver_puntos_inflexion(segunda_derivada):
     # Aquí buscamos donde la segunda derivada se hace 0.
+    puntos, metodo = resolver_ecuacion(segunda_derivada)
+    return puntos
+
+# Por debajo de este valor absoluto no confiamos en el signo de una
+# evaluación en float y pasamos a aritmética de intervalos
+TOLERANCIA_SIGNO = 1e-9
+# Precisiones (en bits) que probamos con aritmética de intervalos
+PRECISIONES_INTERVALO = (53, 113, 233, 473)
+
+_FUNCIONES_INTERVALO = {
+    sympy.sin: "sin",
+    sympy.cos: "cos",
+    sympy.tan: "tan",
+    sympy.exp: "exp",
+    sympy.log: "log",
+}
+# El contexto de intervalos de mpmath es global: lo protegemos al cambiar la precisión
+_lock_intervalos = threading.Lock()
+
+def _a_intervalo(expresion):
+    # Evalúa una expresión constante de SymPy con mpmath.iv; el resultado es
+    # un intervalo que contiene con seguridad al valor exacto
+    iv = mpmath.iv
+    if expresion.is_Rational:
+        return iv.mpf(int(expresion.p)) / iv.mpf(int(expresion.q))
+    if expresion.is_Float:
+        return _a_intervalo(sympy.Rational(expresion))
+    if expresion == sympy.pi:
+        return iv.pi
+    if expresion == sympy.E:
+        return iv.e
+    if expresion.is_Add:
+        total = iv.mpf(0)
+        for termino in expresion.args:
+            total = total + _a_intervalo(termino)
+        return total
+    if expresion.is_Mul:
+        producto = iv.mpf(1)
+        for factor in expresion.args:
+            producto = producto * _a_intervalo(factor)
+        return producto
+    if expresion.is_Pow:
+        base, exponente = expresion.args
+        if exponente.is_Integer:
+            return _a_intervalo(base) ** int(exponente)
+        if exponente == sympy.Rational(1, 2):
+            return iv.sqrt(_a_intervalo(base))
+        return iv.exp(_a_intervalo(exponente) * iv.log(_a_intervalo(base)))
+    if expresion.func in _FUNCIONES_INTERVALO:
+        funcion = getattr(iv, _FUNCIONES_INTERVALO[expresion.func])
+        return funcion(_a_intervalo(expresion.args[0]))
+    raise ValueError("No se puede evaluar con intervalos: " + str(expresion.func))
+
+def _signo_por_intervalos(expresion):
+    # Subimos la precisión hasta que el intervalo quede de un solo lado del 0
+    iv = mpmath.iv
+    with _lock_intervalos:
+        precision_original = iv.prec
+        try:
+            for precision in PRECISIONES_INTERVALO:
+                iv.prec = precision
+                intervalo = _a_intervalo(expresion)
+                if intervalo.a > 0:
+                    return 1
+                if intervalo.b < 0:
+                    return -1
+        except Exception:
+            # Función no soportada, log de negativo, etc.
+            pass
+        finally:
+            iv.prec = precision_original
+    return None
+
+def signo_certificado(expresion, valor=None):
+    # Aquí decidimos el signo de una expresión (o de la expresión evaluada en
+    # x = valor) sin compararla simbólicamente, que es lento y a veces falla:
+    #   1) evaluación rápida en float: si está lejos de 0, ya sabemos el signo
+    #   2) aritmética de intervalos con precisión creciente
+    #   3) solo si el intervalo sigue tocando el 0, simplificación simbólica
+    # Devuelve 1, -1, 0, o None si no está definida o no se pudo decidir.
     x = sympy.symbols('x')
+    if valor is not None:
+        if isinstance(valor, float):
+            # El float exacto, para que los intervalos partan de un valor exacto
+            valor = sympy.Rational(valor)
+        try:
+            aproximado = evaluar_numerico(expresion, valor)
+        except Exception:
+            aproximado = float("nan")
+        exacta = evaluar_funcion(expresion, valor)
+    else:
+        exacta = expresion
+        try:
+            aproximado = complex(exacta.evalf(15))
+            aproximado = aproximado.real if aproximado.imag == 0 else float("nan")
+        except Exception:
+            aproximado = float("nan")
+    
+    if np.isfinite(aproximado) and abs(aproximado) > TOLERANCIA_SIGNO:
+        return 1 if aproximado > 0 else -1
+    
+    if not isinstance(exacta, sympy.Basic) or exacta.has(sympy.zoo, sympy.nan, sympy.oo, -sympy.oo):
+        return None
+    if exacta.is_zero:
+        return 0
+    
+    signo = _signo_por_intervalos(exacta)
+    if signo is not None:
+        return signo
+    
     try:
-        puntos = sympy.solve(segunda_derivada, x)
-        puntos_reales = []
-        for p in puntos:
-            if p.is_real:
-                puntos_reales.append(p)
-        return puntos_reales
-    except:
-        return []
\ No newline at end of file
+        if sympy.simplify(exacta) == 0 or exacta.equals(0):
+            return 0
+        precisa = exacta.evalf(50)
+        if precisa.is_real and precisa != 0:
+            return 1 if precisa > 0 else -1
+    except Exception:
+        pass
+    return None
+
+# Criterio de orden superior: hasta qué derivada probamos y cuánto tiempo
+# (en segundos, para todos los puntos críticos juntos) le dedicamos
+ORDEN_MAXIMO_DERIVADAS = 12
+TIEMPO_LIMITE_ORDEN_SUPERIOR = 2.0
+
+# Métodos de resolver_ecuacion que dan todas las soluciones reales (no solo
+# las de la ventana numérica), y tope de marcadores por tipo en una vista
+METODOS_COMPLETOS = ("exacto", "aproximado")
+MAX_MARCADORES = 200
+
+# Fila de una tabla de signos: intervalo (inicio, fin), donde None significa
+# -∞ o ∞; el punto de prueba usado, el valor de la derivada ahí y el signo
+# (1, -1, 0 si la derivada es 0 en todo el intervalo, None si no está definida)
+FilaSigno = namedtuple("FilaSigno", "inicio fin x_prueba valor signo")
+
+def _candidatos_prueba(puntos):
+    # Para cada intervalo, varios puntos de prueba en orden de preferencia.
+    # El primero es el de siempre (punto medio, o 1 más allá en los extremos);
+    # los demás se usan si la derivada vale 0 o no está definida ahí.
+    if len(puntos) == 0:
+        return np.array([[0.0, 1.0, -1.0, 0.5, 10.0]])
+    fracciones = np.array([0.5, 0.25, 0.75, 0.1, 0.9])
+    desplazamientos = np.array([1.0, 0.5, 2.0, 0.1, 10.0])
+    inicio = puntos[:-1, None]
+    ancho = (puntos[1:] - puntos[:-1])[:, None]
+    return np.vstack([
+        puntos[0] - desplazamientos,
+        inicio + fracciones * ancho,
+        puntos[-1] + desplazamientos,
+    ])
+
+def _separar_puntos(puntos):
+    # Ordena los puntos y junta los que son el mismo salvo error numérico
+    # (pi/2 exacto y el polo de tan encontrado numéricamente, por ejemplo)
+    separados = []
+    for p in np.sort(np.array(puntos, dtype=float)):
+        if len(separados) > 0 and abs(p - separados[-1]) <= 1e-9 * (1 + abs(p)):
+            continue
+        separados.append(p)
+    return np.array(separados, dtype=float)
+
+def tabla_de_signos_numerica(evaluar, puntos, certificar=None, evaluar_funcion=None):
+    # Tabla de signos de una derivada ya compilada: evaluar(xs) da sus
+    # valores (floats, NaN donde no está definida). Los intervalos van entre
+    # los puntos dados; certificar(x) decide el signo cuando el valor está
+    # muy cerca de 0 (sin certificar, se toma como 0). Con evaluar_funcion,
+    # los puntos de prueba donde la función no está definida no sirven (la
+    # derivada de log(x) sí lo está en x < 0).
+    # Todos los puntos de prueba de todos los intervalos se evalúan en una
+    # sola llamada vectorizada.
+    puntos = _separar_puntos(puntos)
+    candidatos = _candidatos_prueba(puntos)
+    valores = np.array(evaluar(candidatos.ravel()), dtype=float).reshape(candidatos.shape)
+    # Un punto de prueba nunca puede ser uno de los puntos que separan
+    # intervalos (ni estar pegado a uno)
+    if len(puntos) > 0:
+        indices = np.clip(np.searchsorted(puntos, candidatos), 1, len(puntos))
+        distancia = np.minimum(np.abs(candidatos - puntos[indices - 1]),
+                               np.abs(candidatos - puntos[np.minimum(indices, len(puntos) - 1)]))
+        valores[distancia <= 1e-9 * (1 + np.abs(candidatos))] = np.nan
+    if evaluar_funcion is not None:
+        definida = np.isfinite(evaluar_funcion(candidatos.ravel())).reshape(candidatos.shape)
+        valores[~definida] = np.nan
+    
+    extremos = [None] + [float(p) for p in puntos] + [None]
+    tabla = []
+    for i in range(len(candidatos)):
+        # Nos quedamos con el primer punto de prueba cuyo signo sea seguro.
+        # Los valores cercanos a 0 se confirman con certificar.
+        signo = None
+        j_elegido = None
+        j_cero = None
+        for j in range(candidatos.shape[1]):
+            valor = valores[i, j]
+            if not np.isfinite(valor):
+                continue
+            if abs(valor) > TOLERANCIA_SIGNO:
+                signo = 1 if valor > 0 else -1
+            elif certificar is not None:
+                signo = certificar(float(candidatos[i, j]))
+            else:
+                signo = 0
+            if signo == 0 and j_cero is None:
+                j_cero = j
+            if signo:
+                j_elegido = j
+                break
+        if j_elegido is None:
+            if j_cero is not None:
+                # La derivada vale 0 en todos los puntos de prueba
+                j_elegido = j_cero
+                signo = 0
+            else:
+                j_elegido = 0
+                signo = None
+        j = j_elegido
+        tabla.append(FilaSigno(extremos[i], extremos[i + 1], float(candidatos[i, j]), float(valores[i, j]), signo))
+    return tabla
+
+@instrumentacion.medido("intervalos")
+def tabla_de_signos(derivada, puntos, cortes=(), funcion=None):
+    # Aquí armamos la tabla de signos de una derivada de SymPy: los intervalos
+    # entre los puntos dados y el signo en cada uno (ver tabla_de_signos_numerica).
+    # `cortes` son los polos y bordes del dominio (ver singularidades): también
+    # separan intervalos, porque el signo puede cambiar ahí.
+    # Los valores cercanos a 0 se confirman con signo_certificado.
+    def evaluar(valores_x):
+        return evaluar_en_arreglo(derivada, valores_x)
+    
+    def certificar(valor_x):
+        return signo_certificado(derivada, valor_x)
+    
+    evaluar_funcion = None
+    if funcion is not None:
+        def evaluar_funcion(valores_x):
+            return evaluar_en_arreglo(funcion, valores_x)
+    puntos = [float(p) for p in puntos] + [float(c) for c in cortes]
+    return tabla_de_signos_numerica(evaluar, puntos, certificar, evaluar_funcion)
+
+def signos_alrededor(tabla, puntos):
+    # De los `puntos` que separan filas de la tabla, el signo de la derivada
+    # a cada lado: ((punto, signo antes, signo después), ...)
+    fronteras = np.array([fila.fin for fila in tabla[:-1]], dtype=float)
+    resultado = []
+    if len(fronteras) == 0:
+        return resultado
+    for p in puntos:
+        i = int(np.argmin(np.abs(fronteras - float(p))))
+        if abs(fronteras[i] - float(p)) > 1e-9 * (1 + abs(float(p))):
+            continue
+        resultado.append((p, tabla[i].signo, tabla[i + 1].signo))
+    return resultado
+
+def cambios_de_signo(tabla, puntos):
+    # De signos_alrededor, los puntos con un signo a cada lado y distinto
+    # (1 y -1): ahí cambia de verdad el signo de la derivada.
+    # En x^4, f''(0) = 0 pero f'' es positiva a los dos lados: no cuenta.
+    return [s for s in signos_alrededor(tabla, puntos) if s[1] and s[2] and s[1] != s[2]]
+
+def cambios_en_arreglo(evaluar, candidatos, cortes=(), certificar=None, evaluar_funcion=None):
+    # cambios_de_signo de una derivada ya compilada (ver tabla_de_signos_numerica)
+    # en sus raíces `candidatos`; los `cortes` (polos, bordes del dominio)
+    # también separan intervalos. Es la clasificación de marcadores_en y de
+    # parametros.Familia: máximo si f' pasa de + a -, inflexión si f'' cambia.
+    if len(candidatos) > 2 * MAX_MARCADORES:
+        # Demasiados para marcarlos (ver marcadores_en): no clasificamos
+        return []
+    puntos = [float(c) for c in candidatos] + [float(c) for c in cortes]
+    tabla = tabla_de_signos_numerica(evaluar, puntos, certificar, evaluar_funcion)
+    return cambios_de_signo(tabla, candidatos)
+
+def fusionar_filas(tabla, separadores):
+    # Junta las filas vecinas con el mismo signo cuyo borde no es uno de los
+    # `separadores` (un punto que resultó no ser de inflexión, por ejemplo)
+    separadores = [float(s) for s in separadores]
+    
+    def separa(x):
+        return any(abs(x - s) <= 1e-9 * (1 + abs(x)) for s in separadores)
+    
+    resultado = []
+    for fila in tabla:
+        if len(resultado) > 0:
+            anterior = resultado[-1]
+            if anterior.signo == fila.signo and not separa(anterior.fin):
+                resultado[-1] = anterior._replace(fin=fila.fin)
+                continue
+        resultado.append(fila)
+    return resultado
+
+class Analisis:
+    # Resultado del análisis completo de una función.
+    # Cada parte (derivadas, puntos, intervalos, datos del gráfico) se calcula
+    # una sola vez y solo la primera vez que alguien la pide. El objeto es
+    # inmutable: steps.py y gui.py solo leen de él.
+
+    def __init__(self, funcion, partes=None):
+        object.__setattr__(self, "funcion", funcion)
+        # Partes ya calculadas en otro lado (por ejemplo, la cache en disco)
+        if partes:
+            self.__dict__.update(partes)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("Analisis es inmutable")
+
+    def incorporar(self, partes):
+        # Agrega partes calculadas en otro lado (por ejemplo, en el proceso
+        # trabajador de tareas.py). Las que ya estaban no se reemplazan.
+        for nombre, valor in partes.items():
+            self.__dict__.setdefault(nombre, valor)
+
+    def __delattr__(self, nombre):
+        raise AttributeError("Analisis es inmutable")
+
+    @cached_property
+    def primera_derivada(self):
+        return calcular_derivada(self.funcion)
+
+    @cached_property
+    def segunda_derivada(self):
+        return calcular_derivada(self.primera_derivada)
+
+    @cached_property
+    def solucion_criticos(self):
+        # (puntos, metodo): metodo es "exacto" o "numerico"
+        puntos, metodo = resolver_ecuacion(self.primera_derivada)
+        return tuple(puntos), metodo
+
+    @cached_property
+    def puntos_criticos(self):
+        return self.solucion_criticos[0]
+
+    @cached_property
+    def metodo_criticos(self):
+        return self.solucion_criticos[1]
+
+    def derivada(self, orden):
+        # Torre de derivadas f, f', f'', f''', ... que crece solo cuando se pide
+        # un orden nuevo; cada derivada se calcula una sola vez
+        torre = self.__dict__.get("torre_derivadas")
+        if torre is None:
+            torre = [self.funcion, self.primera_derivada, self.segunda_derivada]
+            self.__dict__["torre_derivadas"] = torre
+        while len(torre) <= orden:
+            torre.append(calcular_derivada(torre[-1]))
+        return torre[orden]
+
+    def _criterio_orden_superior(self, punto, limite_tiempo):
+        # Cuando f''(punto) = 0, buscamos la primera derivada que no se anula.
+        # Si su orden es par, hay un extremo (mínimo si es > 0); si es impar,
+        # es un punto de inflexión con tangente horizontal.
+        # Devuelve (tipo, evaluaciones) con evaluaciones = ((orden, valor), ...).
+        evaluaciones = []
+        for orden in range(3, ORDEN_MAXIMO_DERIVADAS + 1):
+            if time.perf_counter() > limite_tiempo:
+                break
+            valor = evaluar_funcion(self.derivada(orden), punto)
+            evaluaciones.append((orden, valor))
+            signo = signo_certificado(valor)
+            if signo is None:
+                break
+            if signo != 0:
+                if orden % 2 == 1:
+                    return "inflexion", tuple(evaluaciones)
+                return ("minimo" if signo > 0 else "maximo"), tuple(evaluaciones)
+        return "indeciso", tuple(evaluaciones)
+
+    @cached_property
+    @instrumentacion.medido("clasificacion")
+    def clasificacion_derivadas(self):
+        # Criterio de la segunda derivada para cada punto crítico, y si no
+        # decide, criterio de las derivadas de orden superior.
+        # Cada elemento es (punto, f''(punto), tipo, evaluaciones) con tipo
+        # "minimo", "maximo", "inflexion" (no es extremo) o "indeciso", y
+        # evaluaciones = ((orden, valor), ...) de las derivadas de orden >= 3 usadas.
+        limite_tiempo = time.perf_counter() + TIEMPO_LIMITE_ORDEN_SUPERIOR
+        resultado = []
+        for punto in self.puntos_criticos:
+            evaluacion = evaluar_funcion(self.segunda_derivada, punto)
+            signo = signo_certificado(evaluacion)
+            evaluaciones = ()
+            if signo == 1:
+                tipo = "minimo"
+            elif signo == -1:
+                tipo = "maximo"
+            elif signo == 0:
+                tipo, evaluaciones = self._criterio_orden_superior(punto, limite_tiempo)
+            else:
+                tipo = "indeciso"
+            resultado.append((punto, evaluacion, tipo, evaluaciones))
+        return tuple(resultado)
+
+    @cached_property
+    def tabla_crecimiento(self):
+        # Signo de f' entre todos los puntos críticos (también los que no son
+        # extremos o no se pudieron clasificar), los polos y los bordes del dominio
+        return tuple(tabla_de_signos(self.primera_derivada, self.puntos_criticos, self.cortes_dominio,
+                                     self.funcion))
+
+    @cached_property
+    def criterio_primera_derivada(self):
+        # Para los puntos que las derivadas no deciden (x^14: la torre llega
+        # hasta ORDEN_MAXIMO_DERIVADAS), el signo de f' a cada lado:
+        # ((punto, signo antes, signo después), ...), solo los que tienen los dos
+        indecisos = [c[0] for c in self.clasificacion_derivadas if c[2] == "indeciso"]
+        if len(indecisos) == 0:
+            return ()
+        return tuple(s for s in signos_alrededor(self.tabla_crecimiento, indecisos) if s[1] and s[2])
+
+    @cached_property
+    def clasificacion(self):
+        # clasificacion_derivadas, con los indecisos resueltos por el criterio
+        # de la primera derivada: máximo si f' pasa de + a -, mínimo si pasa
+        # de - a +, y si no cambia de signo no es extremo ("inflexion")
+        signos = {s[0]: s for s in self.criterio_primera_derivada}
+        resultado = []
+        for punto, evaluacion, tipo, evaluaciones in self.clasificacion_derivadas:
+            if tipo == "indeciso" and punto in signos:
+                _, antes, despues = signos[punto]
+                if antes == despues:
+                    tipo = "inflexion"
+                elif antes > 0:
+                    tipo = "maximo"
+                else:
+                    tipo = "minimo"
+            resultado.append((punto, evaluacion, tipo, evaluaciones))
+        return tuple(resultado)
+
+    @cached_property
+    def derivadas_superiores(self):
+        # Derivadas de orden >= 3 que hizo falta calcular: ((orden, expresión), ...)
+        usados = set()
+        for _, _, _, evaluaciones in self.clasificacion_derivadas:
+            for orden, _ in evaluaciones:
+                usados.add(orden)
+        return tuple((orden, self.derivada(orden)) for orden in sorted(usados))
+
+    @cached_property
+    def maximos(self):
+        return tuple((c[0], evaluar_funcion(self.funcion, c[0])) for c in self.clasificacion if c[2] == "maximo")
+
+    @cached_property
+    def minimos(self):
+        return tuple((c[0], evaluar_funcion(self.funcion, c[0])) for c in self.clasificacion if c[2] == "minimo")
+
+    @cached_property
+    def criticos_indecisos(self):
+        # Puntos críticos que ningún criterio pudo clasificar
+        return tuple(c[0] for c in self.clasificacion if c[2] == "indeciso")
+
+    @cached_property
+    def solucion_inflexion(self):
+        puntos, metodo = resolver_ecuacion(self.segunda_derivada)
+        return tuple(puntos), metodo
+
+    @cached_property
+    def candidatos_inflexion(self):
+        # Soluciones de f''(x) = 0: puntos de inflexión solo si f'' cambia de signo
+        return self.solucion_inflexion[0]
+
+    @cached_property
+    def metodo_inflexion(self):
+        return self.solucion_inflexion[1]
+
+    @cached_property
+    def tabla_concavidad(self):
+        # Signo de f'' entre los candidatos, los polos y los bordes del dominio
+        return tuple(tabla_de_signos(self.segunda_derivada, self.candidatos_inflexion, self.cortes_dominio,
+                                     self.funcion))
+
+    @cached_property
+    def puntos_inflexion(self):
+        # Los candidatos donde f'' cambia de signo y la función está definida
+        cambios = [c[0] for c in cambios_de_signo(self.tabla_concavidad, self.candidatos_inflexion)]
+        definidos = np.isfinite(evaluar_en_arreglo(self.funcion, [float(p) for p in cambios]))
+        return tuple(p for p, definido in zip(cambios, definidos) if definido)
+
+    def _marcadores(self, puntos):
+        # (x, y) en float de cada punto, listos para graficar; se omiten los
+        # que no tienen un valor real (la función no está definida ahí)
+        xs = np.array([float(p) for p in puntos], dtype=float)
+        ys = evaluar_en_arreglo(self.funcion, xs)
+        return tuple((float(x), float(y)) for x, y in zip(xs, ys) if np.isfinite(y))
+
+    @cached_property
+    def marcadores_inflexion(self):
+        return self._marcadores(self.puntos_inflexion)
+
+    def _raices_en(self, derivada, a, b):
+        # Raíces de la derivada en [a, b] como floats (solo para marcar)
+        def evaluar(valores_x):
+            return evaluar_en_arreglo(derivada, valores_x)
+        return raices_en_arreglo(evaluar, a, b)
+
+    def _cambios_en(self, derivada, candidatos, a, b):
+        # cambios_de_signo de la derivada en los candidatos de [a, b]
+        def evaluar(valores_x):
+            return evaluar_en_arreglo(derivada, valores_x)
+        
+        def certificar(valor_x):
+            return signo_certificado(derivada, valor_x)
+        
+        def evaluar_funcion(valores_x):
+            return evaluar_en_arreglo(self.funcion, valores_x)
+        cortes = singularidades(self.funcion, float(a), float(b))
+        return cambios_en_arreglo(evaluar, candidatos, cortes, certificar, evaluar_funcion)
+
+    def marcadores_en(self, a, b):
+        # Marcadores (maximos, minimos, inflexion) dentro de [a, b] para el
+        # gráfico interactivo. Si las soluciones ya calculadas son todas, solo
+        # se filtran; si dependían de la ventana (numéricas o periódicas) se
+        # buscan de nuevo numéricamente en [a, b], sin SymPy.
+        if self.metodo_criticos in METODOS_COMPLETOS:
+            dentro = [c for c in self.clasificacion if a <= float(c[0]) <= b]
+            maximos = [c[0] for c in dentro if c[2] == "maximo"]
+            minimos = [c[0] for c in dentro if c[2] == "minimo"]
+        else:
+            # Criterio de la primera derivada: máximo si f' pasa de + a -
+            criticos = self._raices_en(self.primera_derivada, a, b)
+            cambios = self._cambios_en(self.primera_derivada, criticos, a, b)
+            maximos = [p for p, antes, _ in cambios if antes > 0]
+            minimos = [p for p, antes, _ in cambios if antes < 0]
+        if self.metodo_inflexion in METODOS_COMPLETOS:
+            inflexion = [p for p in self.puntos_inflexion if a <= float(p) <= b]
+        else:
+            candidatos = self._raices_en(self.segunda_derivada, a, b)
+            inflexion = [c[0] for c in self._cambios_en(self.segunda_derivada, candidatos, a, b)]
+        resultado = []
+        for puntos in (maximos, minimos, inflexion):
+            if len(puntos) > MAX_MARCADORES:
+                # Demasiados para verse: no marcamos ninguno
+                puntos = []
+            resultado.append(self._marcadores(puntos))
+        return tuple(resultado)
+
+    @cached_property
+    def marcadores_maximos(self):
+        return self._marcadores([m[0] for m in self.maximos])
+
+    @cached_property
+    def marcadores_minimos(self):
+        return self._marcadores([m[0] for m in self.minimos])
+
+    @cached_property
+    def cortes_dominio(self):
+        # Polos y bordes del dominio en la ventana numérica: separan
+        # intervalos aunque no sean extremos ni puntos de inflexión
+        return singularidades(self.funcion, *VENTANA_NUMERICA)
+
+    @cached_property
+    def intervalos_crecimiento(self):
+        # Los puntos críticos que no son extremos no separan intervalos
+        separadores = [m[0] for m in self.maximos] + [m[0] for m in self.minimos] + list(self.cortes_dominio)
+        return tuple(fusionar_filas(self.tabla_crecimiento, separadores))
+
+    @cached_property
+    def intervalos_concavidad(self):
+        # Los candidatos que no son de inflexión no separan intervalos
+        separadores = list(self.puntos_inflexion) + list(self.cortes_dominio)
+        return tuple(fusionar_filas(self.tabla_concavidad, separadores))
+
+    @cached_property
+    def rango_grafico(self):
+        # Por defecto [-10, 10]; si hay puntos de interés, los rodeamos con margen 2
+        puntos_x = [float(m[0]) for m in self.maximos + self.minimos]
+        puntos_x += [float(p) for p in self.puntos_inflexion]
+        if len(puntos_x) == 0:
+            return (-10.0, 10.0)
+        return (min(puntos_x) - 2, max(puntos_x) + 2)
+
+    @cached_property
+    def muestra_grafico(self):
+        muestra = muestrear_funcion(self.funcion, self.rango_grafico[0], self.rango_grafico[1])
+        muestra.xs.flags.writeable = False
+        muestra.ys.flags.writeable = False
+        return muestra
+
+    @cached_property
+    def datos_grafico(self):
+        # Valores (x, y) de la curva, con NaN donde hay que cortar la línea
+        return self.muestra_grafico.xs, self.muestra_grafico.ys
+
+    @cached_property
+    def limites_y(self):
+        # Rango vertical sugerido (recorta los valores enormes cerca de un polo)
+        return self.muestra_grafico.limites_y
+
+def forma_canonica(funcion):
+    # Aquí obtenemos un texto único para cada expresión. Como sympify ya
+    # normaliza la expresión, "x^2", "x**2" y "x*x" dan el mismo resultado.
+    return sympy.srepr(funcion)
+
+def _estimar_bytes(valor):
+    # Estimación aproximada de la memoria que ocupa una parte del análisis
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, (tuple, list)):
+        return 64 + sum(_estimar_bytes(v) for v in valor)
+    if isinstance(valor, sympy.Basic):
+        return 64 + 8 * len(str(valor))
+    return 32
+
+class CacheAnalisis:
+    # Cache LRU de análisis, compartida por todo el proceso.
+    # La clave es la forma canónica de la expresión. Se limita tanto por
+    # cantidad de entradas como por bytes (estimados) y lleva contadores de
+    # aciertos, fallos y desalojos.
+
+    def __init__(self, max_entradas=64, max_bytes=16 * 1024 * 1024):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self._entradas = OrderedDict() # clave -> Analisis
+        self._tamanos = {} # clave -> (partes medidas, bytes)
+        self._lock = threading.Lock()
+
+    def obtener(self, funcion):
+        # Devuelve el análisis de la función, creándolo si no está en la cache
+        clave = forma_canonica(funcion)
+        with self._lock:
+            analisis = self._entradas.get(clave)
+            if analisis is not None:
+                self.aciertos += 1
+                self._entradas.move_to_end(clave)
+            else:
+                self.fallos += 1
+                analisis = Analisis(funcion, _leer_de_disco(clave))
+                self._entradas[clave] = analisis
+            self._ajustar()
+            return analisis
+
+    def configurar(self, max_entradas=None, max_bytes=None):
+        with self._lock:
+            if max_entradas is not None:
+                self.max_entradas = max_entradas
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._ajustar()
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._tamanos.clear()
+
+    def bytes_usados(self):
+        with self._lock:
+            self._medir()
+            return sum(t[1] for t in self._tamanos.values())
+
+    def estadisticas(self):
+        return {
+            "entradas": len(self._entradas),
+            "bytes": self.bytes_usados(),
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "desalojos": self.desalojos,
+        }
+
+    def _medir(self):
+        # Los análisis se llenan de forma perezosa, así que volvemos a medir
+        # solo las entradas que calcularon partes nuevas desde la última vez
+        for clave, analisis in self._entradas.items():
+            partes = len(analisis.__dict__)
+            medido = self._tamanos.get(clave)
+            if medido is None or medido[0] != partes:
+                total = sum(_estimar_bytes(v) for v in analisis.__dict__.values())
+                self._tamanos[clave] = (partes, total)
+
+    def _ajustar(self):
+        # Desalojamos las entradas menos usadas hasta cumplir ambos límites.
+        # La entrada más reciente nunca se desaloja.
+        self._medir()
+        total = sum(t[1] for t in self._tamanos.values())
+        while len(self._entradas) > 1 and (len(self._entradas) > self.max_entradas or total > self.max_bytes):
+            clave, _ = self._entradas.popitem(last=False)
+            total -= self._tamanos.pop(clave)[1]
+            self.desalojos += 1
+
+cache_analisis = CacheAnalisis()
+
+# Aciertos y fallos de las caches, para instrumentacion.resumen()
+instrumentacion.registrar_cache("analisis", lambda: (cache_analisis.aciertos, cache_analisis.fallos))
+instrumentacion.registrar_cache("parseo", lambda: instrumentacion.lru_info(convertir_texto_a_funcion))
+instrumentacion.registrar_cache("derivada", lambda: instrumentacion.lru_info(_derivar_termino))
+instrumentacion.registrar_cache("compilar", lambda: instrumentacion.lru_info(compilar_funcion))
+instrumentacion.registrar_cache("singularidades", lambda: instrumentacion.lru_info(singularidades))
+instrumentacion.registrar_cache("tramos", lambda: instrumentacion.lru_info(muestra_de_tramo))
+
+def configurar_cache(max_entradas=None, max_bytes=None):
+    cache_analisis.configurar(max_entradas, max_bytes)
+
+def limpiar_caches():
+    # Vacía todas las caches en memoria (análisis, parseo, derivadas,
+    # compilación, muestreo, polinomios y la de sympy): lo siguiente se
+    # calcula desde cero, como en un proceso nuevo. La cache en disco no se toca.
+    cache_analisis.limpiar()
+    for funcion in (convertir_texto_a_funcion, _derivar_termino, compilar_funcion, singularidades,
+                    muestra_de_tramo, muestreo.fronteras, polinomios.coeficientes):
+        funcion.cache_clear()
+    sympy.core.cache.clear_cache()
+
+# Cache en disco opcional (ver cache_disco.py); None si está desactivada
+cache_en_disco = None
+_partes_persistidas = {} # forma canónica -> cantidad de partes ya guardadas
+
+def activar_cache_disco(ruta=None, max_bytes=None):
+    # Activa la cache en disco. Sin ruta, se usa $GRAFI_CACHE o la ruta por defecto.
+    global cache_en_disco
+    import cache_disco as modulo
+    if ruta is None:
+        ruta = os.environ.get("GRAFI_CACHE", modulo.RUTA_POR_DEFECTO)
+    if max_bytes is None:
+        max_bytes = modulo.MAX_BYTES_POR_DEFECTO
+    cache_en_disco = modulo.CacheDisco(ruta, max_bytes)
+    _partes_persistidas.clear()
+
+def desactivar_cache_disco():
+    global cache_en_disco
+    cache_en_disco = None
+
+def _leer_de_disco(clave):
+    if cache_en_disco is None:
+        return None
+    try:
+        partes = cache_en_disco.leer(clave)
+    except Exception:
+        return None
+    if partes:
+        _partes_persistidas[clave] = len(partes)
+    return partes
+
+# Partes que salen de resolver f'(x) = 0 y f''(x) = 0 (con lo que depende de ellas)
+PARTES_CRITICOS = ("puntos_criticos", "metodo_criticos", "clasificacion", "criterio_primera_derivada",
+                   "derivadas_superiores", "maximos", "minimos", "intervalos_crecimiento")
+PARTES_INFLEXION = ("candidatos_inflexion", "puntos_inflexion", "metodo_inflexion", "intervalos_concavidad")
+
+def _depende_de_plazos(analisis):
+    # Partes del análisis cuyo resultado dependió de un tiempo límite: si
+    # solve no terminó a tiempo (método "numerico") o el criterio de orden
+    # superior se cortó ("indeciso"), con más tiempo saldría otra cosa
+    partes = analisis.__dict__
+    excluidas = set()
+    indeciso = any(c[2] == "indeciso" for c in partes.get("clasificacion", ()))
+    if partes.get("metodo_criticos") == "numerico" or indeciso:
+        excluidas.update(PARTES_CRITICOS)
+    if partes.get("metodo_inflexion") == "numerico":
+        excluidas.update(PARTES_INFLEXION)
+    return excluidas
+
+def persistir(analisis):
+    # Guarda en disco las partes del análisis que ya se calcularon.
+    # Si desde la última vez no se calculó nada nuevo, no escribe nada.
+    # Lo que dependió de un tiempo límite no se guarda: un solve que se
+    # venció una vez (por ejemplo, con la máquina ocupada) quedaría así para siempre.
+    if cache_en_disco is None:
+        return
+    import cache_disco as modulo
+    excluidas = _depende_de_plazos(analisis)
+    partes = {}
+    for nombre in modulo.PARTES_GUARDADAS:
+        if nombre in analisis.__dict__ and nombre not in excluidas:
+            partes[nombre] = analisis.__dict__[nombre]
+    clave = forma_canonica(analisis.funcion)
+    if len(partes) == 0 or _partes_persistidas.get(clave) == len(partes):
+        return
+    try:
+        cache_en_disco.escribir(clave, str(analisis.funcion), partes)
+        _partes_persistidas[clave] = len(partes)
+    except Exception:
+        # La cache en disco es solo una ayuda: si falla, seguimos sin ella
+        pass
+
+def analizar(funcion):
+    # Punto de entrada único: devuelve el análisis (perezoso) de la función.
+    # Si ya se analizó la misma expresión, se reutiliza desde la cache.
+    return cache_analisis.obtener(funcion)
@@ -0,0 +1,139 @@
+import tkinter as tk
+
+import instrumentacion
+import steps
+
+# Aquí está el panel de pasos (lado izquierdo de la ventana).
+# Es un solo tk.Text con etiquetas de estilo (tags) en lugar de un LabelFrame
+# con decenas de Frames y Labels por análisis: cambiar de tema es volver a
+# configurar las etiquetas, y limpiar es borrar el texto.
+# Las líneas se insertan por bloques: al principio solo las que llenan la
+# vista, y el resto a medida que el usuario se acerca al final con el scroll.
+
+# Líneas que se insertan de una vez
+LINEAS_POR_BLOQUE = 150
+# Cuando la parte visible llega a esta fracción de lo ya insertado, se inserta
+# el siguiente bloque
+MARGEN_CARGA = 0.8
+
+FUENTE_SECCION = ("Arial", 11, "bold")
+FUENTE_TEXTO = ("Arial", 10)
+FUENTE_MATH = ("Times New Roman", 12, "bold")
+
+def piezas_de_paso(paso):
+    # Aquí traducimos un paso de steps a pedazos (texto, estilo) para dibujarlos.
+    # Estilos: "texto", "math", "positivo" y "negativo" (estado de un intervalo).
+    if isinstance(paso, steps.Titulo):
+        return [(paso.texto_titulo, "texto")]
+    if isinstance(paso, steps.Texto):
+        return [(paso.contenido, "texto")]
+    if isinstance(paso, steps.Nota):
+        return [("(" + paso.contenido + ")", "texto")]
+    if isinstance(paso, steps.Ecuacion):
+        if paso.etiqueta:
+            return [(paso.etiqueta + ": ", "texto"), (paso.formula(), "math")]
+        return [(paso.formula(), "math")]
+    if isinstance(paso, steps.ListaPuntos):
+        return [(paso.etiqueta + ": ", "texto"), (paso.lista(), "math")]
+    if isinstance(paso, steps.Evaluando):
+        return [("Evaluando ", "texto"), (f"x = {paso.punto}", "math"), (" en ", "texto"),
+                (paso.derivada + "(x)", "math"), (":", "texto")]
+    if isinstance(paso, steps.Evaluacion):
+        return [(paso.formula(), "math")]
+    if isinstance(paso, steps.Clasificacion):
+        if paso.comparacion is None:
+            return [(paso.conclusion, "texto")]
+        return [("Resultado: ", "texto"), (paso.comparacion, "math"), (paso.conclusion, "texto")]
+    if isinstance(paso, steps.FilaIntervalo):
+        inicio = "Dominio (" if paso.es_dominio() else "Intervalo ("
+        piezas = [(inicio, "texto"), (paso.intervalo(), "math"), ("): ", "texto"), (paso.prueba(), "math")]
+        if paso.estado:
+            estilo = "positivo" if paso.signo is not None and paso.signo > 0 else "negativo"
+            if paso.signo == 0:
+                estilo = "texto"
+            piezas += [("   ", "texto"), (paso.estado, estilo)]
+        return piezas
+    # Espacio (o un tipo de paso desconocido): nada que dibujar
+    return []
+
+class PanelPasos:
+    # Texto de solo lectura con las secciones del análisis
+
+    def __init__(self, master, tema):
+        # Líneas (listas de pedazos) que todavía no se insertaron
+        self.pendientes = []
+        self.carga_programada = None
+
+        self.scrollbar = tk.Scrollbar(master, orient="vertical")
+        self.texto = tk.Text(master, wrap="word", bd=0, highlightthickness=0, padx=15, pady=10,
+                             cursor="arrow", state="disabled", yscrollcommand=self._al_desplazar)
+        self.scrollbar.configure(command=self.texto.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.texto.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        self.texto.tag_configure("seccion", font=FUENTE_SECCION, spacing1=14, spacing3=6)
+        self.texto.tag_configure("texto", font=FUENTE_TEXTO)
+        self.texto.tag_configure("math", font=FUENTE_MATH)
+        self.texto.tag_configure("positivo", font=FUENTE_TEXTO)
+        self.texto.tag_configure("negativo", font=FUENTE_TEXTO)
+        # Sangría de las líneas dentro de una sección
+        self.texto.tag_configure("linea", lmargin1=12, lmargin2=12, spacing1=1, spacing3=1)
+        self.aplicar_tema(tema)
+
+    def aplicar_tema(self, tema):
+        # Cambiar de tema solo reconfigura las etiquetas; no se reconstruye nada
+        self.texto.configure(bg=tema["bg_frame"], fg=tema["fg_text"])
+        self.texto.tag_configure("seccion", foreground=tema["fg_title"])
+        self.texto.tag_configure("texto", foreground=tema["fg_text"])
+        self.texto.tag_configure("math", foreground=tema["math_color"])
+        self.texto.tag_configure("positivo", foreground=tema["fg_positivo"])
+        self.texto.tag_configure("negativo", foreground=tema["fg_negativo"])
+
+    def agregar_seccion(self, titulo, pasos):
+        # Agrega una sección al final; se inserta ya si queda a la vista
+        self.pendientes.append([(titulo, "seccion")])
+        for paso in pasos:
+            piezas = piezas_de_paso(paso)
+            if len(piezas) > 0:
+                self.pendientes.append(piezas)
+        if float(self.texto.yview()[1]) >= MARGEN_CARGA:
+            self._cargar_bloque()
+
+    def limpiar(self):
+        self.pendientes = []
+        if self.carga_programada is not None:
+            self.texto.after_cancel(self.carga_programada)
+            self.carga_programada = None
+        self.texto.configure(state="normal")
+        self.texto.delete("1.0", tk.END)
+        self.texto.configure(state="disabled")
+
+    def lineas_pendientes(self):
+        return len(self.pendientes)
+
+    @instrumentacion.medido("panel.insertar")
+    def _cargar_bloque(self):
+        # Inserta el siguiente bloque de líneas con una sola llamada a insert
+        self.carga_programada = None
+        if len(self.pendientes) == 0:
+            return
+        bloque = self.pendientes[:LINEAS_POR_BLOQUE]
+        self.pendientes = self.pendientes[LINEAS_POR_BLOQUE:]
+        argumentos = []
+        for piezas in bloque:
+            if piezas[0][1] == "seccion":
+                argumentos += [piezas[0][0] + "\n", ("seccion",)]
+                continue
+            for texto, estilo in piezas:
+                argumentos += [texto, (estilo, "linea")]
+            argumentos += ["\n", ("linea",)]
+        self.texto.configure(state="normal")
+        self.texto.insert(tk.END, *argumentos)
+        self.texto.configure(state="disabled")
+
+    def _al_desplazar(self, primero, ultimo):
+        # yscrollcommand del texto: mueve la barra y, si el usuario se acerca
+        # al final de lo insertado, programa el siguiente bloque
+        self.scrollbar.set(primero, ultimo)
+        if len(self.pendientes) > 0 and float(ultimo) >= MARGEN_CARGA and self.carga_programada is None:
+            self.carga_programada = self.texto.after_idle(self._cargar_bloque)
@@ -0,0 +1,188 @@
+import numpy as np
+import sympy
+from sympy.functions.elementary.trigonometric import TrigonometricFunction
+from collections import namedtuple
+from functools import lru_cache
+
+import instrumentacion
+import muestreo
+import operations
+
+# Aquí están las funciones con parámetros libres, como a*x^3 + b*x.
+# Lo simbólico se hace una sola vez por función (parte_simbolica): las
+# derivadas y, si sympy puede, las soluciones generales de f'(x) = 0 y
+# f''(x) = 0 en términos de los parámetros. La interfaz lo pide al proceso de
+# tareas (NODO_FAMILIA), porque un solve que no termina solo se corta matando
+# el proceso. Después Familia compila todo con lambdify sobre (x, *parámetros)
+# y, al mover un deslizador (Familia.evaluar), solo se reemplazan números en
+# esas funciones compiladas: la curva, los puntos críticos y los marcadores
+# salen sin volver a llamar a sympy.
+# Si no hay solución general (o la ecuación tiene funciones trigonométricas,
+# donde solve solo da las soluciones principales) las raíces se buscan
+# numéricamente en la vista (operations.raices_en_arreglo). Los extremos y
+# los puntos de inflexión se clasifican como en Analisis.marcadores_en: por
+# el cambio de signo de f' y de f'' (operations.cambios_en_arreglo).
+
+MAX_PARAMETROS = 4
+RANGO_PARAMETRO = (-5.0, 5.0)
+PASO_PARAMETRO = 0.1
+VALOR_INICIAL = 1.0
+# Más soluciones generales que esto no valen la pena: se busca numéricamente
+MAX_SOLUCIONES_GENERALES = 12
+PUNTOS_GRILLA = 2001
+
+# Marcadores de una familia para ciertos valores de los parámetros
+Variacion = namedtuple("Variacion", "muestra maximos minimos inflexion")
+
+# Lo que calcula sympy para una familia (se puede mandar entre procesos)
+Simbolico = namedtuple("Simbolico", "primera_derivada segunda_derivada soluciones_criticos "
+                                    "soluciones_inflexion fronteras")
+
+def parametros_de(funcion):
+    # Símbolos libres distintos de x, ordenados por nombre
+    x = sympy.symbols('x')
+    return tuple(sorted((s for s in funcion.free_symbols if s != x), key=lambda s: s.name))
+
+def _compilar(expresion, simbolos):
+    try:
+        return sympy.lambdify(simbolos, expresion, modules="numpy")
+    except Exception:
+        return None
+
+def _tiene_trigonometricas(expresion):
+    x = sympy.symbols('x')
+    return any(isinstance(sub, TrigonometricFunction) and sub.has(x)
+               for sub in sympy.preorder_traversal(expresion))
+
+def soluciones_generales(expresion):
+    # Soluciones de expresion = 0 en x, en función de los parámetros, o None
+    # si no hay una lista finita que sirva para todos los valores
+    if _tiene_trigonometricas(expresion):
+        return None
+    x = sympy.symbols('x')
+    soluciones = operations.correr_con_limite(lambda: sympy.solve(expresion, x), operations.TIEMPO_LIMITE_SOLVE)
+    if soluciones is None or len(soluciones) > MAX_SOLUCIONES_GENERALES:
+        return None
+    if not all(isinstance(s, sympy.Expr) and not s.has(x) for s in soluciones):
+        return None
+    return tuple(soluciones)
+
+@lru_cache(maxsize=16)
+@instrumentacion.medido("parametros.simbolico")
+def parte_simbolica(funcion):
+    # Derivadas, soluciones generales y fronteras del dominio (polos y
+    # bordes, que dependen de los parámetros). Corre en el proceso de tareas.
+    x = sympy.symbols('x')
+    primera = sympy.diff(funcion, x)
+    segunda = sympy.diff(primera, x)
+    fronteras = tuple(f for f in muestreo.fronteras(funcion) if f.has(x))
+    return Simbolico(primera, segunda, soluciones_generales(primera), soluciones_generales(segunda), fronteras)
+
+class Familia:
+    # Una función con parámetros, lista para evaluarse con cualquier valor.
+    # Se crea con preparar() a partir de la parte simbólica y después solo
+    # se llama a evaluar().
+
+    def __init__(self, funcion, simbolico=None):
+        x = sympy.symbols('x')
+        if simbolico is None:
+            simbolico = parte_simbolica(funcion)
+        self.funcion = funcion
+        self.parametros = parametros_de(funcion)
+        self.primera_derivada = simbolico.primera_derivada
+        self.segunda_derivada = simbolico.segunda_derivada
+        self.soluciones_criticos = simbolico.soluciones_criticos
+        self.soluciones_inflexion = simbolico.soluciones_inflexion
+
+        simbolos = (x,) + self.parametros
+        self._funcion = _compilar(funcion, simbolos)
+        self._primera = _compilar(self.primera_derivada, simbolos)
+        self._segunda = _compilar(self.segunda_derivada, simbolos)
+        self._criticos = self._compilar_soluciones(self.soluciones_criticos)
+        self._inflexion = self._compilar_soluciones(self.soluciones_inflexion)
+        self._fronteras = [_compilar(f, simbolos) for f in simbolico.fronteras]
+
+    def _compilar_soluciones(self, soluciones):
+        # Una sola función que devuelve todas las soluciones, o None
+        if soluciones is None:
+            return None
+        return _compilar(list(soluciones), self.parametros)
+
+    def valores_iniciales(self):
+        return {p.name: VALOR_INICIAL for p in self.parametros}
+
+    def rango_grafico(self, valores):
+        # Como Analisis.rango_grafico: los puntos de interés de la ventana por
+        # defecto con margen 2, o toda la ventana si no hay ninguno
+        a, b = operations.VENTANA_NUMERICA
+        variacion = self.evaluar(valores, a, b)
+        puntos_x = [p[0] for p in variacion.maximos + variacion.minimos + variacion.inflexion]
+        if len(puntos_x) == 0:
+            return (a, b)
+        return (min(puntos_x) - 2, max(puntos_x) + 2)
+
+    def _raices(self, soluciones, expresion, valores, a, b):
+        # x reales en [a, b] donde `expresion` (compilada) vale 0
+        if soluciones is not None:
+            # Con números complejos: las fórmulas de las raíces de una cúbica
+            # pasan por complejos aunque la raíz sea real
+            try:
+                with np.errstate(all='ignore'):
+                    puntos = np.array(soluciones(*[complex(v) for v in valores]), dtype=complex).ravel()
+            except Exception:
+                puntos = None
+            if puntos is not None:
+                reales = puntos.real[np.abs(puntos.imag) <= 1e-9 * (1 + np.abs(puntos.real))]
+                return np.unique(reales[np.isfinite(reales) & (reales >= a) & (reales <= b)])
+
+        def evaluar(xs):
+            return operations.evaluar_compilada(expresion, xs, *valores)
+        return operations.raices_en_arreglo(evaluar, a, b, PUNTOS_GRILLA)
+
+    def _marcadores(self, xs, valores):
+        ys = operations.evaluar_compilada(self._funcion, xs, *valores)
+        return tuple((float(x), float(y)) for x, y in zip(xs, ys) if np.isfinite(y))
+
+    @instrumentacion.medido("parametros.evaluar")
+    def evaluar(self, valores, a, b):
+        # Curva y marcadores en [a, b] con `valores` ({nombre: número}), sin sympy
+        valores = [float(valores[p.name]) for p in self.parametros]
+
+        def evaluar_curva(xs):
+            return operations.evaluar_compilada(self._funcion, xs, *valores)
+
+        def evaluar_primera(xs):
+            return operations.evaluar_compilada(self._primera, xs, *valores)
+
+        def evaluar_segunda(xs):
+            return operations.evaluar_compilada(self._segunda, xs, *valores)
+
+        cortes = []
+        for frontera in self._fronteras:
+            def evaluar_frontera(xs):
+                return operations.evaluar_compilada(frontera, xs, *valores)
+            cortes.extend(operations.raices_en_arreglo(evaluar_frontera, a, b, PUNTOS_GRILLA))
+        muestra = muestreo.muestrear(evaluar_curva, a, b, cortes)
+
+        # Criterio de la primera derivada: máximo si f' pasa de + a -
+        criticos = self._raices(self._criticos, self._primera, valores, a, b)
+        cambios = operations.cambios_en_arreglo(evaluar_primera, criticos, cortes, evaluar_funcion=evaluar_curva)
+        maximos = [p for p, antes, _ in cambios if antes > 0]
+        minimos = [p for p, antes, _ in cambios if antes < 0]
+        # Inflexión solo donde f'' cambia de signo (no en x^4)
+        candidatos = self._raices(self._inflexion, self._segunda, valores, a, b)
+        cambios = operations.cambios_en_arreglo(evaluar_segunda, candidatos, cortes, evaluar_funcion=evaluar_curva)
+        inflexion = [p for p, _, _ in cambios]
+        marcadores = []
+        for puntos in (maximos, minimos, inflexion):
+            if len(puntos) > operations.MAX_MARCADORES:
+                puntos = []
+            marcadores.append(self._marcadores(np.asarray(puntos, dtype=float), valores))
+        return Variacion(muestra, *marcadores)
+
+@lru_cache(maxsize=16)
+@instrumentacion.medido("parametros.preparar")
+def preparar(funcion, simbolico=None):
+    # Familia lista para evaluar (en modo en vivo se repite la misma función).
+    # Sin `simbolico`, la parte simbólica se calcula aquí mismo.
+    return Familia(funcion, simbolico)
@@ -0,0 +1,149 @@
+import sympy
+import numpy as np
+from functools import lru_cache
+
+# Aquí está el camino rápido para polinomios (x^3 - 3x, cuárticas, etc.).
+# Trabajamos directo con la lista de coeficientes (del mayor grado al menor):
+# derivar es multiplicar y correr los coeficientes, evaluar es Horner con
+# NumPy y las raíces salen de Poly.real_roots, de factorizar, o de numpy.roots refinado.
+# operations.py decide cuándo usar este módulo.
+
+# Hasta este grado buscamos las raíces de forma exacta con Poly.real_roots.
+# Para grados mayores (hasta GRADO_MAXIMO_FACTORIZAR) factorizamos y solo los
+# factores sin fórmula cerrada van a numpy.roots refinado con Newton
+GRADO_MAXIMO_EXACTO = 4
+GRADO_MAXIMO_FACTORIZAR = 60
+
+@lru_cache(maxsize=256)
+def coeficientes(funcion):
+    # Devuelve los coeficientes exactos (tupla, mayor grado primero) si la
+    # función es un polinomio en x con coeficientes numéricos reales; si no, None.
+    x = sympy.symbols('x')
+    if not funcion.is_polynomial(x):
+        return None
+    try:
+        lista = sympy.Poly(funcion, x).all_coeffs()
+    except sympy.PolynomialError:
+        return None
+    for c in lista:
+        if not (c.is_number and c.is_real):
+            return None
+    return tuple(lista)
+
+def derivar(coefs):
+    # Derivada: cada coeficiente se multiplica por su exponente y baja un grado
+    grado = len(coefs) - 1
+    if grado == 0:
+        return (sympy.Integer(0),)
+    return tuple(c * (grado - i) for i, c in enumerate(coefs[:-1]))
+
+def a_expresion(coefs):
+    x = sympy.symbols('x')
+    return sympy.Poly(coefs, x).as_expr()
+
+def horner(coefs_float, valores_x):
+    # Evaluación vectorizada con el método de Horner
+    resultado = np.zeros_like(valores_x, dtype=float)
+    for c in coefs_float:
+        resultado = resultado * valores_x + c
+    return resultado
+
+def compilar(coefs):
+    # Función que evalúa el polinomio en un arreglo, al estilo de lambdify
+    coefs_float = np.array([float(c) for c in coefs])
+
+    def evaluar(valores_x):
+        return horner(coefs_float, np.asarray(valores_x, dtype=float))
+    return evaluar
+
+def _quitar_repetidas(raices):
+    resultado = []
+    for r in raices:
+        if r not in resultado:
+            resultado.append(r)
+    return resultado
+
+def _raices_exactas(polinomio):
+    # Raíces reales distintas de un polinomio de grado <= GRADO_MAXIMO_EXACTO
+    raices = []
+    for r in _quitar_repetidas(polinomio.real_roots()):
+        # Las raíces sin fórmula sencilla vienen como CRootOf: las pasamos a decimal
+        if isinstance(r, sympy.CRootOf):
+            r = sympy.Float(r.evalf(15), 10)
+        raices.append(r)
+    return raices
+
+def _raices_con_formula(factor):
+    # Raíces reales de un factor irreducible de grado alto si sympy.roots
+    # las da todas en forma cerrada (x^6 - 2, polinomios en x^k...), o None
+    try:
+        todas = sympy.roots(factor)
+    except Exception:
+        return None
+    if sum(todas.values()) != factor.degree():
+        return None
+    return [r for r in todas if r.is_real]
+
+def _raices_aproximadas(polinomio):
+    # numpy.roots refinado con Newton. Quitamos las raíces múltiples (parte
+    # libre de cuadrados) para que numpy.roots no tenga que separar raíces pegadas
+    libre = polinomio.sqf_part()
+    coefs_float = np.array([float(c) for c in libre.all_coeffs()])
+    derivada_float = np.array([float(c) for c in derivar(libre.all_coeffs())])
+    candidatas = np.roots(coefs_float)
+    reales = candidatas.real[np.abs(candidatas.imag) <= 1e-7 * (1 + np.abs(candidatas))]
+
+    # Algunos pasos de Newton (vectorizados) para pulir la precisión
+    for _ in range(3):
+        pendiente = horner(derivada_float, reales)
+        seguro = pendiente != 0
+        reales = np.where(seguro, reales - horner(coefs_float, reales) / np.where(seguro, pendiente, 1), reales)
+
+    raices = []
+    for r in np.sort(reales):
+        if len(raices) > 0 and abs(r - raices[-1]) <= 1e-9 * (1 + abs(r)):
+            continue
+        raices.append(r)
+    resultado = []
+    for r in raices:
+        if abs(r - round(r)) < 1e-10:
+            r = float(round(r))
+        resultado.append(sympy.Float(r, 10))
+    return resultado
+
+def raices_reales(coefs):
+    # Raíces reales distintas, en orden creciente.
+    # Devuelve (raices, metodo): "exacto" si todas salen de forma exacta,
+    # "aproximado" si alguna viene de numpy.roots refinado.
+    # Poly.real_roots y factor_list solo sirven con coeficientes racionales:
+    # con sqrt(2)*x^2 + x o E*x^3 - x devuelve None si el grado es bajo (que
+    # resuelva sympy.solve) y usa numpy.roots si es alto.
+    x = sympy.symbols('x')
+    polinomio = sympy.Poly(coefs, x)
+    if polinomio.degree() <= 0:
+        return [], "exacto"
+
+    racional = polinomio.domain.is_ZZ or polinomio.domain.is_QQ
+    if polinomio.degree() <= GRADO_MAXIMO_EXACTO:
+        if not racional:
+            return None
+        return _raices_exactas(polinomio), "exacto"
+
+    # Con coeficientes racionales factorizamos primero: x^6, (x^2 - 2)^3 (x^5 - x - 1)
+    # o x^7 - x tienen raíces exactas aunque el grado sea alto. Solo los
+    # factores sin fórmula cerrada van por el camino numérico.
+    if polinomio.degree() > GRADO_MAXIMO_FACTORIZAR or not racional:
+        return _raices_aproximadas(polinomio), "aproximado"
+    raices = []
+    metodo = "exacto"
+    for factor, _ in polinomio.factor_list()[1]:
+        if factor.degree() <= GRADO_MAXIMO_EXACTO:
+            raices.extend(_raices_exactas(factor))
+            continue
+        exactas = _raices_con_formula(factor)
+        if exactas is None:
+            exactas = _raices_aproximadas(factor)
+            metodo = "aproximado"
+        raices.extend(exactas)
+    # Factores distintos no comparten raíces: solo hay que ordenarlas
+    return sorted(raices, key=float), metodo
@@ -0,0 +1,395 @@
+import argparse
+import asyncio
+import concurrent.futures
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from multiprocessing.connection import wait
+from urllib.parse import urlsplit
+
+import grafi
+import operations
+
+# Aquí está el servidor local de análisis (HTTP/JSON, solo biblioteca estándar)
+# para un front-end web en la misma máquina.
+# Uso: python servidor.py [--puerto 8765] [-j 4] [--origen http://localhost:3000]
+#
+#   POST /analizar  {"expresion": "x^3 - 3*x", "pasos": true, "plazo": 10}
+#   GET  /estado
+#
+# El bucle de asyncio solo atiende conexiones; el parseo y sympy corren en
+# procesos propios (grafi._Ranura), así que el plazo de cada pedido también
+# cubre el parseo. Pedidos iguales que llegan a la vez (30 alumnos mandando
+# x^3 - 3*x) comparten un solo cálculo: la clave es el texto sin espacios y
+# con ^ como **. Cuando se vence el plazo del último pedido que espera un
+# cálculo, el proceso se mata y se reemplaza; también se reemplaza el que
+# quedó con solves abandonados. Si ya hay demasiados cálculos distintos en
+# curso, los nuevos reciben 503.
+#
+# /analizar solo acepta POST con Content-Type: application/json, y el
+# servidor rechaza los pedidos cuyo Host u Origin no sean locales (o los
+# dados con --origen): así una página cualquiera no lo puede usar.
+
+PUERTO_POR_DEFECTO = 8765
+PLAZO_POR_DEFECTO = 10.0 # s por pedido
+PLAZO_MAXIMO = 60.0
+CALCULOS_POR_PROCESO = 4 # cálculos distintos en curso (o en cola) por proceso
+MAX_RESULTADOS = 1024 # resultados terminados que se guardan en memoria
+MAX_CUERPO = 64 * 1024 # bytes
+HOSTS_LOCALES = ("127.0.0.1", "localhost", "::1")
+
+class ErrorHttp(Exception):
+    # Error que se responde al cliente con su código HTTP
+    def __init__(self, estado, mensaje, encabezados=None):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.encabezados = encabezados or {}
+
+MOTIVOS = {200: "OK", 204: "No Content", 400: "Bad Request", 403: "Forbidden", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 415: "Unsupported Media Type",
+           500: "Internal Server Error", 503: "Service Unavailable", 504: "Gateway Timeout"}
+
+def clave_texto(texto):
+    # Misma clave para "x^2 - 1" y "x**2-1"
+    return re.sub(r"\s+", "", texto).replace("^", "**")
+
+class _Tarea:
+    # Un cálculo pedido al pool. `limite` (time.perf_counter) puede crecer
+    # mientras espera, si llega otro pedido igual con más plazo.
+    def __init__(self, texto, con_pasos, limite):
+        self.texto = texto
+        self.con_pasos = con_pasos
+        self.limite = limite
+        self.futuro = concurrent.futures.Future()
+
+    def resolver(self, resultado):
+        try:
+            self.futuro.set_result(resultado)
+        except concurrent.futures.InvalidStateError:
+            pass
+
+class PoolAnalisis:
+    # Procesos de grafi._Ranura atendidos por un hilo propio, que reparte las
+    # tareas, vigila los plazos y mata y reemplaza los procesos vencidos o que
+    # avisan que quedaron con cálculos abandonados.
+
+    def __init__(self, procesos):
+        self.contexto = multiprocessing.get_context("spawn")
+        self.ranuras = [grafi._Ranura(self.contexto) for _ in range(procesos)]
+        self.asignadas = {} # id de tarea -> _Tarea que está en una ranura
+        self.cola = deque()
+        self.ids = itertools.count()
+        self.lock = threading.Lock()
+        self.aviso_lectura, self.aviso_escritura = self.contexto.Pipe(duplex=False)
+        self.reiniciados = 0
+        self.cerrando = False
+        self.hilo = threading.Thread(target=self._bucle, name="pool-analisis", daemon=True)
+        self.hilo.start()
+
+    def enviar(self, texto, con_pasos, limite):
+        tarea = _Tarea(texto, con_pasos, limite)
+        with self.lock:
+            self.cola.append(tarea)
+        self._avisar()
+        return tarea
+
+    def _avisar(self):
+        with self.lock:
+            try:
+                self.aviso_escritura.send_bytes(b"")
+            except OSError:
+                pass
+
+    def _bucle(self):
+        while not self.cerrando:
+            self._repartir()
+            esperando = [self.aviso_lectura]
+            esperando += [r.conexion for r in self.ranuras if not r.listo or r.trabajo is not None]
+            listas = wait(esperando, timeout=grafi.INTERVALO_REVISION)
+            while self.aviso_lectura.poll():
+                self.aviso_lectura.recv_bytes()
+            for i, ranura in enumerate(self.ranuras):
+                if not ranura.listo:
+                    if ranura.conexion in listas:
+                        try:
+                            ranura.conexion.recv()
+                            ranura.listo = True
+                        except EOFError:
+                            self._reemplazar(i)
+                    continue
+                if ranura.trabajo is None:
+                    continue
+                id_tarea, texto = ranura.trabajo
+                tarea = self.asignadas[id_tarea]
+                if ranura.conexion in listas:
+                    try:
+                        _, resultado, reiniciar = ranura.conexion.recv()
+                    except EOFError:
+                        # El proceso murió (por ejemplo, sin memoria)
+                        resultado = {"expresion": texto, "estado": "error", "error": "el proceso terminó inesperadamente"}
+                        reiniciar = True
+                elif time.perf_counter() > tarea.limite:
+                    resultado = {"expresion": texto, "estado": "tiempo_agotado"}
+                    reiniciar = True
+                else:
+                    continue
+                ranura.trabajo = None
+                del self.asignadas[id_tarea]
+                if reiniciar:
+                    self._reemplazar(i)
+                tarea.resolver(resultado)
+
+    def _repartir(self):
+        # Las tareas vencidas en la cola ni se empiezan; las demás van a los
+        # procesos libres
+        ahora = time.perf_counter()
+        with self.lock:
+            vencidas = [t for t in self.cola if t.limite <= ahora]
+            if vencidas:
+                self.cola = deque(t for t in self.cola if t.limite > ahora)
+            for ranura in self.ranuras:
+                if not self.cola:
+                    break
+                if ranura.listo and ranura.trabajo is None:
+                    tarea = self.cola.popleft()
+                    id_tarea = next(self.ids)
+                    self.asignadas[id_tarea] = tarea
+                    ranura.enviar(id_tarea, tarea.texto, tarea.con_pasos)
+        for tarea in vencidas:
+            tarea.resolver({"expresion": tarea.texto, "estado": "tiempo_agotado"})
+
+    def _reemplazar(self, i):
+        self.ranuras[i].matar()
+        self.ranuras[i] = grafi._Ranura(self.contexto)
+        self.reiniciados += 1
+
+    def cerrar(self):
+        self.cerrando = True
+        self._avisar()
+        self.hilo.join()
+        for ranura in self.ranuras:
+            ranura.cerrar()
+        for tarea in list(self.cola) + list(self.asignadas.values()):
+            tarea.futuro.cancel()
+        self.aviso_lectura.close()
+        self.aviso_escritura.close()
+
+class Servidor:
+    # Estado compartido por todas las conexiones: el pool, los cálculos en
+    # curso y los resultados ya terminados. Solo se usa desde el bucle de asyncio.
+
+    def __init__(self, procesos=None, max_pendientes=None, host="127.0.0.1", origenes=()):
+        self.procesos = procesos or os.cpu_count() or 1
+        self.max_pendientes = max_pendientes or self.procesos * CALCULOS_POR_PROCESO
+        self.hosts = set(HOSTS_LOCALES) | {host}
+        self.origenes = {o.rstrip("/") for o in origenes}
+        self.pool = PoolAnalisis(self.procesos)
+        self.en_curso = {} # clave -> (_Tarea, asyncio.Future del cálculo)
+        self.resultados = OrderedDict() # clave -> resultado (LRU)
+        self.contadores = {"pedidos": 0, "calculos": 0, "coalescidos": 0, "guardados": 0,
+                           "rechazados": 0, "vencidos": 0}
+
+    def estado(self):
+        return {"procesos": self.procesos, "en_curso": len(self.en_curso),
+                "max_pendientes": self.max_pendientes, "resultados_guardados": len(self.resultados),
+                "reiniciados": self.pool.reiniciados, **self.contadores}
+
+    async def analizar(self, texto, con_pasos=True, plazo=PLAZO_POR_DEFECTO):
+        # Devuelve el resultado de grafi.analizar_texto para `texto`
+        self.contadores["pedidos"] += 1
+        # Solo el filtro de caracteres y nombres: el parseo va en el pool
+        if not operations.texto_permitido(texto):
+            return {"expresion": texto, "estado": "invalida"}
+        clave = (clave_texto(texto), con_pasos)
+
+        if clave in self.resultados:
+            self.resultados.move_to_end(clave)
+            self.contadores["guardados"] += 1
+            return dict(self.resultados[clave], expresion=texto)
+
+        limite = time.perf_counter() + plazo
+        calculo = self.en_curso.get(clave)
+        if calculo is not None:
+            self.contadores["coalescidos"] += 1
+            # El cálculo dura lo que el plazo del último que lo espera
+            calculo[0].limite = max(calculo[0].limite, limite)
+        else:
+            if len(self.en_curso) >= self.max_pendientes:
+                self.contadores["rechazados"] += 1
+                raise ErrorHttp(503, "servidor ocupado", {"Retry-After": "1"})
+            calculo = self._calcular(clave, texto, con_pasos, limite)
+
+        try:
+            # shield: si vence el plazo de este pedido, el cálculo sigue para
+            # los demás que lo esperan (el pool lo corta en su propio límite)
+            resultado = await asyncio.wait_for(asyncio.shield(calculo[1]), plazo)
+        except asyncio.TimeoutError:
+            resultado = {"estado": "tiempo_agotado"}
+        if resultado["estado"] == "tiempo_agotado":
+            self.contadores["vencidos"] += 1
+            raise ErrorHttp(504, "se venció el plazo del pedido")
+        return dict(resultado, expresion=texto)
+
+    def _calcular(self, clave, texto, con_pasos, limite):
+        self.contadores["calculos"] += 1
+        tarea = self.pool.enviar(texto, con_pasos, limite)
+        futuro = asyncio.wrap_future(tarea.futuro)
+        self.en_curso[clave] = (tarea, futuro)
+
+        def al_terminar(futuro):
+            del self.en_curso[clave]
+            if futuro.cancelled():
+                return
+            if futuro.result()["estado"] not in ("error", "tiempo_agotado"):
+                self.resultados[clave] = futuro.result()
+                while len(self.resultados) > MAX_RESULTADOS:
+                    self.resultados.popitem(last=False)
+        futuro.add_done_callback(al_terminar)
+        return tarea, futuro
+
+    def _revisar_origen(self, encabezados):
+        # Rechaza los pedidos de otros sitios (Origin) y los que llegan con un
+        # nombre que no es el del servidor (Host, contra el DNS rebinding).
+        # Devuelve los encabezados CORS para la respuesta.
+        host = urlsplit("//" + encabezados.get("host", "")).hostname
+        if host not in self.hosts:
+            raise ErrorHttp(403, "host no permitido")
+        origen = encabezados.get("origin")
+        if origen is None:
+            return {}
+        partes = urlsplit(origen)
+        if not (origen.rstrip("/") in self.origenes
+                or (partes.scheme in ("http", "https") and partes.hostname in HOSTS_LOCALES)):
+            raise ErrorHttp(403, "origen no permitido")
+        return {"Access-Control-Allow-Origin": origen, "Vary": "Origin"}
+
+    async def atender(self, lector, escritor):
+        # Una conexión HTTP/1.1; se mantiene abierta mientras el cliente quiera
+        try:
+            while True:
+                try:
+                    linea = await lector.readline()
+                except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                    break
+                if not linea:
+                    break
+                seguir = await self._atender_pedido(linea, lector, escritor)
+                if not seguir:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def _atender_pedido(self, linea, lector, escritor):
+        encabezados = {}
+        while True:
+            campo = await lector.readline()
+            if campo in (b"\r\n", b"\n", b""):
+                break
+            nombre, _, valor = campo.decode("latin-1").partition(":")
+            encabezados[nombre.strip().lower()] = valor.strip()
+        version = "HTTP/1.1"
+        cuerpo_leido = False
+        cors = {}
+        try:
+            metodo, destino, version = linea.decode("latin-1").split()
+            largo = int(encabezados.get("content-length", "0"))
+            if largo > MAX_CUERPO:
+                raise ErrorHttp(413, "cuerpo demasiado grande")
+            cuerpo = await lector.readexactly(largo) if largo else b""
+            cuerpo_leido = True
+            cors = self._revisar_origen(encabezados)
+            if metodo == "OPTIONS":
+                # Preflight de CORS
+                estado, respuesta = 204, None
+                extra = {"Access-Control-Allow-Methods": "GET, POST",
+                         "Access-Control-Allow-Headers": "Content-Type", "Access-Control-Max-Age": "600"}
+            else:
+                estado, extra = 200, {}
+                respuesta = await self._despachar(metodo, destino, encabezados, cuerpo)
+        except ErrorHttp as e:
+            estado, respuesta, extra = e.estado, {"error": str(e)}, e.encabezados
+        except ValueError:
+            estado, respuesta, extra = 400, {"error": "pedido mal formado"}, {}
+        except Exception as e:
+            estado, respuesta, extra = 500, {"error": str(e)}, {}
+
+        # Si el cuerpo quedó sin leer, la conexión no se puede seguir usando
+        mantener = (cuerpo_leido and version == "HTTP/1.1"
+                    and encabezados.get("connection", "").lower() != "close")
+        datos = b"" if respuesta is None else json.dumps(respuesta, ensure_ascii=False).encode("utf-8")
+        cabecera = [f"HTTP/1.1 {estado} {MOTIVOS.get(estado, '')}",
+                    "Content-Type: application/json; charset=utf-8",
+                    f"Content-Length: {len(datos)}",
+                    "Connection: " + ("keep-alive" if mantener else "close")]
+        cabecera += [f"{nombre}: {valor}" for nombre, valor in {**cors, **extra}.items()]
+        escritor.write(("\r\n".join(cabecera) + "\r\n\r\n").encode("latin-1") + datos)
+        await escritor.drain()
+        return mantener
+
+    async def _despachar(self, metodo, destino, encabezados, cuerpo):
+        partes = urlsplit(destino)
+        if partes.path == "/estado":
+            if metodo != "GET":
+                raise ErrorHttp(405, "método no permitido", {"Allow": "GET"})
+            return self.estado()
+        if partes.path != "/analizar":
+            raise ErrorHttp(404, "ruta desconocida")
+        if metodo != "POST":
+            raise ErrorHttp(405, "método no permitido", {"Allow": "POST"})
+        # Un formulario de otro sitio no puede mandar JSON sin preflight
+        tipo = encabezados.get("content-type", "").split(";")[0].strip().lower()
+        if tipo != "application/json":
+            raise ErrorHttp(415, "se esperaba Content-Type: application/json")
+        pedido = json.loads(cuerpo or b"{}")
+        if not isinstance(pedido, dict):
+            raise ErrorHttp(400, "se esperaba un objeto JSON")
+        texto = pedido.get("expresion")
+        if not isinstance(texto, str) or not texto.strip():
+            raise ErrorHttp(400, "falta la expresión")
+        plazo = pedido.get("plazo", PLAZO_POR_DEFECTO)
+        # json.loads acepta NaN e Infinity: con esos el plazo no vencería nunca
+        if isinstance(plazo, bool) or not isinstance(plazo, (int, float)) \
+                or not math.isfinite(plazo) or plazo <= 0:
+            raise ErrorHttp(400, "el plazo debe ser un número de segundos mayor que 0")
+        plazo = min(float(plazo), PLAZO_MAXIMO)
+        return await self.analizar(texto.strip(), bool(pedido.get("pasos", True)), plazo)
+
+    def cerrar(self):
+        self.pool.cerrar()
+
+async def servir(host, puerto, procesos=None, max_pendientes=None, origenes=()):
+    servidor = Servidor(procesos, max_pendientes, host, origenes)
+    escucha = await asyncio.start_server(servidor.atender, host, puerto)
+    print(f"grafi escuchando en http://{host}:{puerto} ({servidor.procesos} procesos)", flush=True)
+    try:
+        async with escucha:
+            await escucha.serve_forever()
+    finally:
+        servidor.cerrar()
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Servidor local de análisis de grafi (HTTP/JSON)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=PUERTO_POR_DEFECTO)
+    parser.add_argument("-j", "--procesos", type=int, default=os.cpu_count(), help="procesos de cálculo")
+    parser.add_argument("--max-pendientes", type=int, default=None,
+                        help="cálculos distintos en curso antes de responder 503")
+    parser.add_argument("--origen", action="append", default=[],
+                        help="origen web permitido además de localhost (por ejemplo https://grafi.ejemplo)")
+    args = parser.parse_args(argumentos)
+    try:
+        asyncio.run(servir(args.host, args.puerto, args.procesos, args.max_pendientes, args.origen))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
@@ -1,67 +1,263 @@
+from collections import namedtuple
+
 import operations
+import instrumentacion
 
-# Este módulo se encarga de generar el texto explicativo paso a paso.
+# Este módulo se encarga de generar la explicación paso a paso.
 # Usamos las funciones de operations.py para obtener los datos.
+# Cada explicación es una lista de pasos con tipo (ecuaciones, evaluaciones,
+# filas de intervalos, clasificaciones...) que la interfaz dibuja sin tener
+# que leer texto. Cada paso sabe escribirse como una línea de texto
+# (paso.texto()), y las funciones explicar_* / obtener_* devuelven la
+# explicación completa en texto para quien la quiera así.
+
+# Sangría de las líneas que van dentro de un paso
+SANGRIA = "   "
+
+class Titulo(namedtuple("Titulo", "texto_titulo")):
+    # Encabezado de un paso ("Paso 1: ...")
+    __slots__ = ()
+
+    def texto(self):
+        return self.texto_titulo
+
+class Texto(namedtuple("Texto", "contenido")):
+    # Línea explicativa sin fórmulas
+    __slots__ = ()
+
+    def texto(self):
+        return SANGRIA + self.contenido
+
+class Nota(namedtuple("Nota", "contenido")):
+    # Aclaración entre paréntesis (por ejemplo, cómo se resolvió una ecuación)
+    __slots__ = ()
+
+    def texto(self):
+        return SANGRIA + "(" + self.contenido + ")"
+
+class Espacio(namedtuple("Espacio", "")):
+    # Línea en blanco entre partes de una explicación
+    __slots__ = ()
+
+    def texto(self):
+        return ""
+
+class Ecuacion(namedtuple("Ecuacion", "etiqueta izquierda derecha")):
+    # izquierda = derecha, con una etiqueta opcional delante ("Ecuación: ")
+    __slots__ = ()
+
+    def formula(self):
+        return self.izquierda + " = " + self.derecha
+
+    def texto(self):
+        if self.etiqueta:
+            return SANGRIA + self.etiqueta + ": " + self.formula()
+        return SANGRIA + self.formula()
+
+class ListaPuntos(namedtuple("ListaPuntos", "etiqueta puntos")):
+    # Soluciones de una ecuación ("Puntos críticos encontrados (x): [...]")
+    __slots__ = ()
+
+    def lista(self):
+        return str(list(self.puntos))
+
+    def texto(self):
+        return SANGRIA + self.etiqueta + ": " + self.lista()
+
+class Evaluando(namedtuple("Evaluando", "punto derivada")):
+    # Anuncia la evaluación de una derivada en un punto crítico
+    __slots__ = ()
+
+    def texto(self):
+        return SANGRIA + "Evaluando x = " + str(self.punto) + " en " + self.derivada + "(x):"
+
+class Evaluacion(namedtuple("Evaluacion", "nombre punto valor")):
+    # nombre(punto) = valor, por ejemplo f''(1) = 6
+    __slots__ = ()
+
+    def formula(self):
+        return self.nombre + "(" + str(self.punto) + ") = " + str(self.valor)
+
+    def texto(self):
+        return SANGRIA + self.formula()
+
+class Clasificacion(namedtuple("Clasificacion", "comparacion tipo conclusion")):
+    # Resultado de un criterio: comparacion es "> 0", "< 0", "= 0" o None,
+    # tipo es "minimo", "maximo", "inflexion" o "indeciso"
+    __slots__ = ()
+
+    def texto(self):
+        if self.comparacion is None:
+            return SANGRIA + self.conclusion
+        return SANGRIA + "Resultado: " + self.comparacion + self.conclusion
+
+class FilaIntervalo(namedtuple("FilaIntervalo", "inicio fin derivada x_prueba signo estado")):
+    # Una fila de intervalos de crecimiento o concavidad. inicio/fin en None
+    # son -∞/∞ (si los dos son None, la fila cubre todo el dominio) y signo
+    # es el de la derivada en x_prueba: 1, -1, 0 o None si no está definida.
+    __slots__ = ()
+
+    def es_dominio(self):
+        return self.inicio is None and self.fin is None
+
+    def intervalo(self):
+        texto_inicio = "-∞" if self.inicio is None else str(self.inicio)
+        texto_fin = "∞" if self.fin is None else str(self.fin)
+        return texto_inicio + ", " + texto_fin
+
+    def prueba(self):
+        if self.signo is None:
+            if self.es_dominio():
+                return f"{self.derivada}(x) no está definida en los puntos de prueba"
+            return f"{self.derivada}(x) no está definida"
+        if self.es_dominio():
+            valor = f"{self.x_prueba:g}"
+        else:
+            valor = f"{self.x_prueba:.1f}"
+        if self.signo == 0:
+            return f"{self.derivada}({valor}) = 0"
+        if self.signo > 0:
+            return f"{self.derivada}({valor}) {'> 0' if self.es_dominio() else ' > 0'}"
+        return f"{self.derivada}({valor}) < 0"
+
+    def texto(self):
+        inicio = "Dominio" if self.es_dominio() else "Intervalo"
+        linea = f"{inicio} ({self.intervalo()}): {self.prueba()}"
+        if self.estado:
+            linea = linea + "   " + self.estado
+        return linea
+
+def a_texto(pasos):
+    # La explicación completa como texto, una línea por paso
+    return "\n".join(paso.texto() for paso in pasos)
+
+@instrumentacion.medido("pasos.derivadas")
+def pasos_derivadas(analisis):
+    # Aquí armamos el paso de derivación
+    return [
+        Titulo("Paso 1: Calcular la Primera Derivada f'(x)"),
+        Ecuacion("", "f(x) ", str(analisis.funcion)),
+        Ecuacion("", "f'(x)", str(analisis.primera_derivada)),
+        Espacio(),
+        Titulo("Paso 2: Calcular la Segunda Derivada f''(x)"),
+        Ecuacion("", "f''(x)", str(analisis.segunda_derivada)),
+    ]
+
+def explicar_derivadas(analisis):
+    return a_texto(pasos_derivadas(analisis))
 
-def explicar_derivadas(funcion):
-    # Aquí construimos el texto del paso de derivación
-    d1 = operations.calcular_derivada(funcion)
-    d2 = operations.calcular_derivada(d1)
-    
-    texto = ""
-    texto = texto + "Paso 1: Calcular la Primera Derivada f'(x)\n"
-    texto = texto + "   f(x)  = " + str(funcion) + "\n"
-    texto = texto + "   f'(x) = " + str(d1) + "\n\n"
-    
-    texto = texto + "Paso 2: Calcular la Segunda Derivada f''(x)\n"
-    texto = texto + "   f''(x) = " + str(d2)
-    return texto
-
-def explicar_puntos_criticos(funcion, d1, d2):
+def _nota_metodo(metodo):
+    # Aclaración sobre cómo se obtuvieron las soluciones de una ecuación,
+    # o None si se resolvió de forma exacta
+    a, b = operations.VENTANA_NUMERICA
+    if metodo == "numerico":
+        return Nota(f"Solución numérica aproximada en [{a:g}, {b:g}]: no se pudo resolver de forma exacta")
+    if metodo == "aproximado":
+        return Nota("Raíces reales del polinomio aproximadas numéricamente")
+    if metodo == "periodico":
+        return Nota(f"La función es periódica: se muestran las soluciones en [{a:g}, {b:g}]")
+    return None
+
+def nombre_derivada(orden):
+    # f', f'', f''' y desde la cuarta f⁽⁴⁾, f⁽⁵⁾, ...
+    if orden <= 3:
+        return "f" + "'" * orden
+    superindices = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
+    return "f⁽" + str(orden).translate(superindices) + "⁾"
+
+@instrumentacion.medido("pasos.puntos_criticos")
+def pasos_puntos_criticos(analisis):
     # Aquí explicamos cómo obtenemos y clasificamos los puntos
-    criticos = operations.encontrar_puntos_criticos(d1)
-    
-    texto = "Paso 3: Igualar f'(x) a 0 para hallar puntos críticos\n"
-    texto = texto + "   Ecuación: " + str(d1) + " = 0\n"
-    
+    # (la clasificación ya viene calculada en el análisis)
+    criticos = analisis.puntos_criticos
+    nota = _nota_metodo(analisis.metodo_criticos)
+
+    pasos = [
+        Titulo("Paso 3: Igualar f'(x) a 0 para hallar puntos críticos"),
+        Ecuacion("Ecuación", str(analisis.primera_derivada), "0"),
+    ]
+
     if len(criticos) == 0:
-        texto = texto + "   No se encontraron puntos críticos reales."
-        return texto, [], [], [] # Retornamos listas vacías
-        
-    texto = texto + "   Puntos críticos encontrados (x): " + str(criticos) + "\n\n"
-    
-    texto = texto + "Paso 4: Criterio de la Segunda Derivada\n"
-    
-    lista_maximos = []
-    lista_minimos = []
-    lista_inflexion = [] # Puntos críticos que fallan el test de 2da derivada
-    
-    for punto in criticos:
-        evaluacion = operations.evaluar_funcion(d2, punto)
-        texto = texto + "   Evaluando x = " + str(punto) + " en f''(x):\n"
-        texto = texto + "   f''(" + str(punto) + ") = " + str(evaluacion) + "\n"
-        
+        pasos.append(Texto("No se encontraron puntos críticos reales."))
+        if analisis.metodo_criticos == "numerico":
+            pasos.append(nota)
+        return pasos
+
+    pasos.append(ListaPuntos("Puntos críticos encontrados (x)", criticos))
+    if nota is not None:
+        pasos.append(nota)
+    pasos.append(Espacio())
+
+    pasos.append(Titulo("Paso 4: Criterio de la Segunda Derivada"))
+
+    # Los que las derivadas no deciden se clasifican por el signo de f'
+    primera = {s[0]: s for s in analisis.criterio_primera_derivada}
+    for punto, evaluacion, tipo, evaluaciones in analisis.clasificacion:
+        pasos.append(Evaluando(punto, "f''"))
+        pasos.append(Evaluacion("f''", punto, evaluacion))
+        if punto in primera:
+            if len(evaluaciones) == 0:
+                pasos.append(Clasificacion("= 0", "indeciso", ", el criterio no decide"))
+            else:
+                pasos.extend(_pasos_orden_superior(punto, "indeciso", evaluaciones))
+            pasos.append(_paso_primera_derivada(*primera[punto], tipo))
+            continue
+
         # Lógica sin ternarios
-        if evaluacion > 0:
-            texto = texto + "   Resultado: > 0, es un MÍNIMO RELATIVO\n"
-            y_val = operations.evaluar_funcion(funcion, punto)
-            lista_minimos.append((punto, y_val))
+        if tipo == "minimo" and len(evaluaciones) == 0:
+            pasos.append(Clasificacion("> 0", tipo, ", es un MÍNIMO RELATIVO"))
+        elif tipo == "maximo" and len(evaluaciones) == 0:
+            pasos.append(Clasificacion("< 0", tipo, ", es un MÁXIMO RELATIVO"))
+        elif len(evaluaciones) == 0:
+            pasos.append(Clasificacion("= 0", tipo, ", el criterio no decide (posible inflexión)"))
         else:
-            if evaluacion < 0:
-                texto = texto + "   Resultado: < 0, es un MÁXIMO RELATIVO\n"
-                y_val = operations.evaluar_funcion(funcion, punto)
-                lista_maximos.append((punto, y_val))
-            else:
-                texto = texto + "   Resultado: = 0, el criterio no decide (posible inflexión)\n"
-                lista_inflexion.append(punto)
-                
-    return texto, lista_maximos, lista_minimos, lista_inflexion
-
-def explicar_evaluacion(funcion, puntos_interes):
-    # Genera texto mostrando la sustitución para graficar
-    texto = "Paso Extra: Evaluar f(x) en puntos de interés para graficar\n"
-    
-    # Unimos listas si hay varias
+            pasos.extend(_pasos_orden_superior(punto, tipo, evaluaciones))
+
+    # Derivadas de orden superior que hubo que calcular
+    if len(analisis.derivadas_superiores) > 0:
+        pasos.append(Espacio())
+        pasos.append(Titulo("Derivadas de orden superior calculadas:"))
+        for orden, derivada in analisis.derivadas_superiores:
+            pasos.append(Ecuacion("", nombre_derivada(orden) + "(x)", str(derivada)))
+
+    return pasos
+
+def _pasos_orden_superior(punto, tipo, evaluaciones):
+    # Criterio de las derivadas de orden superior para un punto
+    pasos = [Clasificacion("= 0", "indeciso", ", el criterio no decide; probamos derivadas de orden superior")]
+    for orden, valor in evaluaciones:
+        pasos.append(Evaluacion(nombre_derivada(orden), punto, valor))
+    orden = evaluaciones[-1][0]
+    if tipo == "minimo":
+        conclusion = f"La primera derivada no nula es de orden {orden} (par) y es positiva: es un MÍNIMO RELATIVO"
+    elif tipo == "maximo":
+        conclusion = f"La primera derivada no nula es de orden {orden} (par) y es negativa: es un MÁXIMO RELATIVO"
+    elif tipo == "inflexion":
+        conclusion = f"La primera derivada no nula es de orden {orden} (impar): no es extremo, es un PUNTO DE INFLEXIÓN"
+    else:
+        conclusion = "Las derivadas de orden superior tampoco deciden"
+    pasos.append(Clasificacion(None, tipo, conclusion))
+    return pasos
+
+def _paso_primera_derivada(punto, antes, despues, tipo):
+    # Criterio de la primera derivada para un punto que las derivadas no deciden
+    lados = f"f'(x) {'> 0' if antes > 0 else '< 0'} antes de x = {punto} y {'> 0' if despues > 0 else '< 0'} después"
+    if tipo == "maximo":
+        conclusion = ": f' pasa de + a -, es un MÁXIMO RELATIVO"
+    elif tipo == "minimo":
+        conclusion = ": f' pasa de - a +, es un MÍNIMO RELATIVO"
+    else:
+        conclusion = ": f' no cambia de signo, no es extremo"
+    return Clasificacion(None, tipo, "Criterio de la primera derivada: " + lados + conclusion)
+
+def explicar_puntos_criticos(analisis):
+    return a_texto(pasos_puntos_criticos(analisis))
+
+@instrumentacion.medido("pasos.evaluacion")
+def pasos_evaluacion(analisis, puntos_interes):
+    # Sustitución en f(x) de los puntos de interés para graficar
+    pasos = [Titulo("Paso Extra: Evaluar f(x) en puntos de interés para graficar")]
+
     for p in puntos_interes:
         # Aseguramos que sea un número (puede venir como tupla a veces)
         valor_x = 0
@@ -69,108 +265,103 @@ def explicar_evaluacion(funcion, puntos_interes):
             valor_x = p[0]
         else:
             valor_x = p
-            
-        valor_y = operations.evaluar_funcion(funcion, valor_x)
-        texto = texto + "   f(" + str(valor_x) + ") = " + str(valor_y) + "\n"
-        
-    return texto
-
-def obtener_texto_inflexion(d2):
-    puntos = operations.resolver_puntos_inflexion(d2)
-    texto = "   Igualando f''(x) = 0: " + str(puntos)
-    return texto, puntos
-
-def obtener_intervalos_crecimiento(d1, maximos, minimos):
-    # Explicación de intervalos de crecimiento
-    # Recibimos d1 para evaluar signos
-    puntos = []
-    for m in maximos: puntos.append(float(m[0]))
-    for m in minimos: puntos.append(float(m[0]))
-    puntos.sort()
-    
-    texto = ""
-    
-    # Caso sin puntos críticos
-    if len(puntos) == 0:
-        val_prueba = 0
-        signo = operations.evaluar_funcion(d1, val_prueba)
-        if signo == 0: signo = operations.evaluar_funcion(d1, 1) # Intento de desempate
-        
-        if signo > 0:
-            texto = "Dominio (-∞, ∞): f'(0) > 0   CRECIENTE ↑"
-        elif signo < 0:
-            texto = "Dominio (-∞, ∞): f'(0) < 0   DECRECIENTE ↓"
-        else:
-            texto = "La función es constante."
-        return texto
-
-    # Caso con puntos críticos
-    # Intervalo inicial (-inf, x0)
-    val_prueba = puntos[0] - 1
-    signo = operations.evaluar_funcion(d1, val_prueba)
-    estado = "CRECIENTE ↑" if signo > 0 else "DECRECIENTE ↓"
-    texto = texto + f"Intervalo (-∞, {puntos[0]}): f'({val_prueba:.1f}) {' > 0' if signo > 0 else '< 0'}   {estado}\n"
-    
-    # Intervalos intermedios
-    for i in range(len(puntos) - 1):
-        x_start = puntos[i]
-        x_end = puntos[i+1]
-        val_prueba = (x_start + x_end) / 2
-        signo = operations.evaluar_funcion(d1, val_prueba)
-        estado = "CRECIENTE ↑" if signo > 0 else "DECRECIENTE ↓"
-        texto = texto + f"Intervalo ({x_start}, {x_end}): f'({val_prueba:.1f}) {' > 0' if signo > 0 else '< 0'}   {estado}\n"
-        
-    # Intervalo final (xn, inf)
-    val_prueba = puntos[-1] + 1
-    signo = operations.evaluar_funcion(d1, val_prueba)
-    estado = "CRECIENTE ↑" if signo > 0 else "DECRECIENTE ↓"
-    texto = texto + f"Intervalo ({puntos[-1]}, ∞): f'({val_prueba:.1f}) {' > 0' if signo > 0 else '< 0'}   {estado}"
-    
-    return texto
-
-def obtener_intervalos_concavidad(d2, puntos_inflexion):
-    # Explicación de intervalos de concavidad
-    # Recibimos d2 para evaluar signos
-    puntos = []
-    for p in puntos_inflexion: puntos.append(float(p))
-    puntos.sort()
-    
-    texto = ""
-    
-    # Caso sin puntos de inflexión
-    if len(puntos) == 0:
-        val_prueba = 0
-        signo = operations.evaluar_funcion(d2, val_prueba)
-        if signo == 0: signo = operations.evaluar_funcion(d2, 1)
-        
-        if signo > 0:
-            texto = "Dominio (-∞, ∞): f''(0) > 0   CÓNCAVA ARRIBA ∪"
-        elif signo < 0:
-            texto = "Dominio (-∞, ∞): f''(0) < 0   CÓNCAVA ABAJO ∩"
+
+        valor_y = operations.evaluar_funcion(analisis.funcion, valor_x)
+        pasos.append(Evaluacion("f", valor_x, valor_y))
+
+    return pasos
+
+def explicar_evaluacion(analisis, puntos_interes):
+    return a_texto(pasos_evaluacion(analisis, puntos_interes))
+
+@instrumentacion.medido("pasos.inflexion")
+def pasos_inflexion(analisis):
+    candidatos = analisis.candidatos_inflexion
+    puntos = analisis.puntos_inflexion
+    pasos = [ListaPuntos("Igualando f''(x) = 0", candidatos)]
+    nota = _nota_metodo(analisis.metodo_inflexion)
+    if nota is not None and (len(candidatos) > 0 or analisis.metodo_inflexion == "numerico"):
+        pasos.append(nota)
+    # Solo son de inflexión los puntos donde f'' cambia de signo (en x^4,
+    # f''(0) = 0 pero la función es cóncava hacia arriba a los dos lados)
+    descartados = [p for p in candidatos if p not in puntos]
+    if len(descartados) > 0:
+        lista = ", ".join(str(p) for p in descartados)
+        pasos.append(Texto(f"En x = {lista}, f''(x) no cambia de signo: no es punto de inflexión."))
+        pasos.append(ListaPuntos("Puntos de inflexión (x)", puntos))
+    return pasos
+
+def obtener_texto_inflexion(analisis):
+    return a_texto(pasos_inflexion(analisis))
+
+def _pasos_intervalos(filas, nombre_derivada, estado_positivo, estado_negativo, estado_nulo, texto_nulo):
+    # Convierte la tabla de signos del análisis (ver operations.tabla_de_signos) en filas
+    # Caso sin puntos: un solo intervalo que cubre todo el dominio
+    if len(filas) == 1:
+        fila = filas[0]
+        if fila.signo == 0:
+            return [Texto(texto_nulo)]
+        estado = ""
+        if fila.signo is not None:
+            estado = estado_positivo if fila.signo > 0 else estado_negativo
+        return [FilaIntervalo(None, None, nombre_derivada, fila.x_prueba, fila.signo, estado)]
+
+    pasos = []
+    for fila in filas:
+        if fila.signo is None:
+            estado = ""
+        elif fila.signo == 0:
+            estado = estado_nulo
         else:
-            texto = "No hay concavidad definida (posible recta)."
-        return texto
-        
-    # Caso con puntos de inflexión
-    # Intervalo inicial (-inf, x0)
-    val_prueba = puntos[0] - 1
-    signo = operations.evaluar_funcion(d2, val_prueba)
-    estado = "CÓNCAVA ARRIBA ∪" if signo > 0 else "CÓNCAVA ABAJO ∩"
-    texto = texto + f"Intervalo (-∞, {puntos[0]}): f''({val_prueba:.1f}) {' > 0' if signo > 0 else '< 0'}   {estado}\n"
-    
-    # Intervalos intermedios
-    for i in range(len(puntos) - 1):
-        x_start = puntos[i]
-        x_end = puntos[i+1]
-        val_prueba = (x_start + x_end) / 2
-        signo = operations.evaluar_funcion(d2, val_prueba)
-        estado = "CÓNCAVA ARRIBA ∪" if signo > 0 else "CÓNCAVA ABAJO ∩"
-        texto = texto + f"Intervalo ({x_start}, {x_end}): f''({val_prueba:.1f}) {' > 0' if signo > 0 else '< 0'}   {estado}\n"
-        
-    # Intervalo final (xn, inf)
-    val_prueba = puntos[-1] + 1
-    signo = operations.evaluar_funcion(d2, val_prueba)
-    estado = "CÓNCAVA ARRIBA ∪" if signo > 0 else "CÓNCAVA ABAJO ∩"
-    texto = texto + f"Intervalo ({puntos[-1]}, ∞): f''({val_prueba:.1f}) {' > 0' if signo > 0 else '< 0'}   {estado}"
-    
-    return texto
\ No newline at end of file
+            estado = estado_positivo if fila.signo > 0 else estado_negativo
+        pasos.append(FilaIntervalo(fila.inicio, fila.fin, nombre_derivada, fila.x_prueba, fila.signo, estado))
+    return pasos
+
+@instrumentacion.medido("pasos.crecimiento")
+def pasos_crecimiento(analisis):
+    # Intervalos de crecimiento
+    return _pasos_intervalos(analisis.intervalos_crecimiento, "f'", "CRECIENTE ↑", "DECRECIENTE ↓",
+                             "CONSTANTE", "La función es constante.")
+
+@instrumentacion.medido("pasos.concavidad")
+def pasos_concavidad(analisis):
+    # Intervalos de concavidad
+    return _pasos_intervalos(analisis.intervalos_concavidad, "f''", "CÓNCAVA ARRIBA ∪", "CÓNCAVA ABAJO ∩",
+                             "RECTA", "No hay concavidad definida (posible recta).")
+
+def obtener_intervalos_crecimiento(analisis):
+    return a_texto(pasos_crecimiento(analisis))
+
+def obtener_intervalos_concavidad(analisis):
+    return a_texto(pasos_concavidad(analisis))
+
+@instrumentacion.medido("pasos.parametros")
+def pasos_parametricos(familia):
+    # Explicación de una función con parámetros (ver parametros.Familia): las
+    # derivadas y las soluciones generales, que valen para cualquier valor
+    nombres = ", ".join(p.name for p in familia.parametros)
+    pasos = [
+        Texto(f"Parámetros: {nombres}. Mueva los deslizadores para ver cómo cambia la función."),
+        Espacio(),
+        Titulo("Paso 1: Derivadas en función de los parámetros"),
+        Ecuacion("", "f(x) ", str(familia.funcion)),
+        Ecuacion("", "f'(x)", str(familia.primera_derivada)),
+        Ecuacion("", "f''(x)", str(familia.segunda_derivada)),
+        Espacio(),
+        Titulo("Paso 2: Igualar f'(x) a 0 para hallar puntos críticos"),
+        Ecuacion("Ecuación", str(familia.primera_derivada), "0"),
+    ]
+    pasos.extend(_pasos_solucion_general(familia.soluciones_criticos))
+    pasos.append(Espacio())
+    pasos.append(Titulo("Paso 3: Igualar f''(x) a 0 para hallar puntos de inflexión"))
+    pasos.append(Ecuacion("Ecuación", str(familia.segunda_derivada), "0"))
+    pasos.extend(_pasos_solucion_general(familia.soluciones_inflexion))
+    return pasos
+
+def _pasos_solucion_general(soluciones):
+    if soluciones is None:
+        return [Nota("Sin solución general: para cada valor de los parámetros se buscan numéricamente en la vista")]
+    if len(soluciones) == 0:
+        return [Texto("No tiene soluciones.")]
+    return [ListaPuntos("Soluciones generales (x)", soluciones),
+            Nota("Solo se marcan las que son reales para los valores elegidos")]
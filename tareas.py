@@ -0,0 +1,406 @@
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+
+import instrumentacion
+
+# Aquí corremos el análisis simbólico fuera del hilo de Tk.
+# Usamos procesos aparte (y no hilos) porque un sympy.solve que no termina
+# solo se puede detener matando el proceso. Los procesos se reutilizan entre
+# análisis y solo se vuelven a crear cuando hay que cancelar uno.
+# Dentro de un análisis, las partes independientes corren a la vez en
+# procesos distintos (ver NODOS): por ejemplo, resolver f'(x) = 0 y
+# f''(x) = 0. Los resultados se juntan siempre en el mismo orden (ETAPAS),
+# sin importar cuál termina primero.
+# En modo en vivo los pedidos nuevos reemplazan a los anteriores sin matar
+# procesos: lo que quedaba del análisis viejo se descarta al llegar, y el
+# nuevo usa los procesos a medida que se liberan.
+# operations (y con él sympy) solo se importa dentro de los procesos: la
+# interfaz importa este módulo antes de mostrar la ventana.
+# Con la instrumentación encendida en la interfaz, cada proceso mide su nodo
+# y manda el registro junto con el resultado.
+# Hay además nodos sueltos, fuera del grafo, que corren cada uno en un
+# proceso propio aparte de los del análisis (enviar_aparte): la lectura del
+# texto que escribe el usuario (NODO_LECTURA: parse_expr calcula 9^9^9^9 al
+# leerlo), el perfil de la ventana de diagnóstico (NODO_PERFIL) y la parte
+# simbólica de una función con parámetros (NODO_FAMILIA).
+
+# Etapas del análisis, en el orden en que se muestran, con las partes de
+# operations.Analisis que calcula cada una
+ETAPAS = (
+    ("derivadas", ("primera_derivada", "segunda_derivada")),
+    ("criticos", ("puntos_criticos", "metodo_criticos", "clasificacion", "criterio_primera_derivada",
+                  "derivadas_superiores", "maximos", "minimos")),
+    ("inflexion", ("candidatos_inflexion", "puntos_inflexion", "metodo_inflexion", "marcadores_inflexion")),
+    ("intervalos", ("intervalos_crecimiento", "intervalos_concavidad")),
+    ("grafico", ("rango_grafico", "datos_grafico", "limites_y",
+                 "marcadores_maximos", "marcadores_minimos")),
+)
+
+NOMBRES_ETAPAS = {
+    "derivadas": "derivadas",
+    "criticos": "puntos críticos",
+    "inflexion": "puntos de inflexión",
+    "intervalos": "intervalos",
+    "grafico": "gráfico",
+}
+
+# Grafo de cálculo: (nodo, nodos de los que depende, partes que calcula).
+# Cada nodo corre entero en un proceso; los que no dependen entre sí corren
+# a la vez. El orden de la tabla es también la prioridad cuando hay más
+# nodos listos que procesos libres.
+NODOS = (
+    ("derivadas", (), ("primera_derivada", "segunda_derivada")),
+    ("criticos", ("derivadas",), ("puntos_criticos", "metodo_criticos", "clasificacion",
+                                  "criterio_primera_derivada", "derivadas_superiores", "maximos", "minimos")),
+    ("inflexion", ("derivadas",), ("candidatos_inflexion", "tabla_concavidad", "puntos_inflexion",
+                                   "metodo_inflexion", "marcadores_inflexion")),
+    ("crecimiento", ("criticos",), ("intervalos_crecimiento",)),
+    ("concavidad", ("inflexion",), ("intervalos_concavidad",)),
+    ("grafico", ("criticos", "inflexion"), ("rango_grafico", "datos_grafico", "limites_y",
+                                            "marcadores_maximos", "marcadores_minimos")),
+)
+
+# Nodos sueltos. En lugar de las partes reciben un argumento:
+# NODO_LECTURA recibe el texto en lugar de la función y devuelve
+# operations.convertir_texto_a_funcion (None si no es válido).
+# NODO_PERFIL corre instrumentacion.analisis_completo con cProfile; recibe la
+# ruta del .prof (o None) y devuelve el texto del perfil.
+# NODO_FAMILIA devuelve parametros.parte_simbolica (no usa el argumento).
+NODO_LECTURA = "lectura"
+NODO_PERFIL = "perfil"
+NODO_FAMILIA = "familia"
+
+# Procesos por defecto: con dos ya corren a la vez las dos ecuaciones
+PROCESOS_POR_DEFECTO = max(1, min(2, os.cpu_count() or 1))
+
+def _etapas_listas(partes):
+    # Cuántas etapas seguidas (desde la primera) tienen todas sus partes
+    completas = 0
+    for etapa, nombres in ETAPAS:
+        if not all(p in partes for p in nombres):
+            break
+        completas += 1
+    return completas
+
+def etapas_completas(analisis):
+    # Cuántas etapas seguidas (desde la primera) ya están calculadas
+    return _etapas_listas(analisis.__dict__)
+
+def _bucle_proceso(conexion):
+    # Corre dentro de cada proceso: recibe un nodo con las partes ya conocidas
+    # y devuelve las partes nuevas junto con lo que tardó
+    import operations
+    import parametros
+    # Calentamiento: la primera compilación y el primer muestreo cargan
+    # módulos internos de sympy y numpy; mejor antes del primer pedido
+    calentamiento = operations.Analisis(operations.convertir_texto_a_funcion("x^3 - x"))
+    for _, _, partes in NODOS:
+        for parte in partes:
+            getattr(calentamiento, parte)
+    conexion.send(None) # Listo
+    while True:
+        try:
+            pedido = conexion.recv()
+        except EOFError:
+            break
+        if pedido is None:
+            break
+        id_trabajo, nodo, funcion, conocidas, partes, medir = pedido
+        if medir:
+            instrumentacion.reiniciar()
+            instrumentacion.activar()
+        else:
+            instrumentacion.desactivar()
+        inicio = time.perf_counter()
+        try:
+            with instrumentacion.medir("nodo." + nodo):
+                if nodo == NODO_LECTURA:
+                    datos = operations.convertir_texto_a_funcion(funcion)
+                elif nodo == NODO_PERFIL:
+                    _, datos = instrumentacion.perfilar(instrumentacion.analisis_completo, funcion, ruta=partes)
+                elif nodo == NODO_FAMILIA:
+                    datos = parametros.parte_simbolica(funcion)
+                else:
+                    analisis = operations.Analisis(funcion, conocidas)
+                    datos = {parte: getattr(analisis, parte) for parte in partes}
+            estado = "ok"
+        except Exception as e:
+            datos = str(e)
+            estado = "error"
+        registro = instrumentacion.exportar() if medir else None
+        # Si quedó un solve abandonado gastando CPU (ver operations.resolver_ecuacion),
+        # terminamos este proceso y se crea uno limpio en su lugar
+        reiniciar = operations.hay_calculos_abandonados()
+        conexion.send((id_trabajo, nodo, estado, datos, time.perf_counter() - inicio, reiniciar, registro))
+        if reiniciar:
+            break
+
+class _Proceso:
+    # Un proceso de cálculo y el nodo que tiene asignado (si hay uno)
+
+    def __init__(self, contexto):
+        self.conexion, extremo_hijo = contexto.Pipe()
+        self.proceso = contexto.Process(target=_bucle_proceso, args=(extremo_hijo,), daemon=True)
+        self.proceso.start()
+        extremo_hijo.close()
+        self.listo = False # Hasta que avisa, está importando
+        self.tarea = None # (id_trabajo, nodo)
+
+    def enviar(self, id_trabajo, nodo, funcion, conocidas, partes):
+        self.tarea = (id_trabajo, nodo)
+        self.conexion.send((id_trabajo, nodo, funcion, conocidas, partes, instrumentacion.activo))
+
+    def matar(self):
+        if self.proceso.is_alive():
+            self.proceso.terminate()
+        self.proceso.join(timeout=1)
+        self.conexion.close()
+
+    def cerrar(self):
+        try:
+            self.conexion.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.proceso.join(timeout=1)
+        self.matar()
+
+class Trabajador:
+    # Procesos de cálculo con un solo análisis en curso a la vez.
+    # Después de cada análisis, `tiempos` tiene por nodo (inicio, fin, segundos
+    # de cálculo), con inicio y fin en segundos desde enviar(): si dos nodos se
+    # solapan, corrieron a la vez.
+
+    def __init__(self, procesos=None):
+        # "spawn" funciona igual en Linux, Windows y macOS, y evita copiar el
+        # estado de Tk con fork
+        self._contexto = multiprocessing.get_context("spawn")
+        self._cantidad = procesos or PROCESOS_POR_DEFECTO
+        self._procesos = []
+        self._id_actual = 0
+        self._ocupado = False
+        self._funcion = None
+        self._partes = {} # Partes conocidas del análisis actual
+        self._hechos = set() # Nodos terminados
+        self._en_curso = set() # Nodos asignados a un proceso
+        self._etapas_enviadas = 0
+        self._inicio = 0.0
+        self.tiempos = {}
+        self._apartes = {} # nodo suelto -> _Proceso
+        self._ids_apartes = {} # nodo suelto -> id del último pedido
+        self._pendientes = {} # nodo suelto -> pedido que espera a su proceso
+
+    def iniciar(self):
+        # Arranca los procesos que falten para que estén listos de antemano
+        self._procesos = [p for p in self._procesos if p.proceso.is_alive()]
+        while len(self._procesos) < self._cantidad:
+            self._procesos.append(_Proceso(self._contexto))
+
+    def enviar(self, funcion, conocidas=None, reemplazar=False):
+        # Pide un análisis nuevo; si había otro en curso, se cancela.
+        # Con reemplazar=True (modo en vivo) no se mata ningún proceso: los
+        # nodos del análisis viejo terminan y sus resultados se descartan.
+        # Las etapas que ya están completas en `conocidas` no se vuelven a
+        # mandar por recibir() (quien llama ya las tiene).
+        if not reemplazar:
+            self.cancelar()
+        self.iniciar()
+        self._id_actual += 1
+        self._ocupado = True
+        self._funcion = funcion
+        self._partes = dict(conocidas or {})
+        self._hechos = {nodo for nodo, _, partes in NODOS if all(p in self._partes for p in partes)}
+        self._en_curso = set()
+        self._etapas_enviadas = _etapas_listas(self._partes)
+        self._inicio = time.perf_counter()
+        self.tiempos = {}
+        self._despachar()
+        return self._id_actual
+
+    def _despachar(self):
+        # Manda a los procesos libres los nodos cuyas dependencias ya terminaron
+        libres = [p for p in self._procesos if p.listo and p.tarea is None]
+        for nodo, dependencias, partes in NODOS:
+            if len(libres) == 0:
+                break
+            if nodo in self._hechos or nodo in self._en_curso:
+                continue
+            if not all(d in self._hechos for d in dependencias):
+                continue
+            self._en_curso.add(nodo)
+            self.tiempos[nodo] = (time.perf_counter() - self._inicio, None, None)
+            libres.pop(0).enviar(self._id_actual, nodo, self._funcion, self._partes, partes)
+
+    def _reemplazar(self, proceso):
+        proceso.matar()
+        self._procesos[self._procesos.index(proceso)] = _Proceso(self._contexto)
+
+    def cancelar(self):
+        # Matamos los procesos que están calculando algo (es la única forma de
+        # cortar un solve); los libres siguen disponibles
+        if not self._ocupado:
+            return
+        self._ocupado = False
+        for proceso in list(self._procesos):
+            if proceso.tarea is not None:
+                self._reemplazar(proceso)
+
+    def recibir(self):
+        # Devuelve, sin bloquear, los mensajes (etapa, datos) del análisis
+        # actual, en el orden de ETAPAS, seguidos de ("fin", {"tiempos": ...})
+        # o ("error", texto). Los resultados de análisis viejos se descartan.
+        mensajes = []
+        por_conexion = {p.conexion: p for p in self._procesos if not p.listo or p.tarea is not None}
+        for conexion in wait(list(por_conexion), timeout=0):
+            proceso = por_conexion[conexion]
+            try:
+                mensaje = conexion.recv()
+            except EOFError:
+                tarea = proceso.tarea
+                if not proceso.listo:
+                    # Murió al arrancar: no lo reemplazamos (volvería a pasar);
+                    # enviar() lo intenta de nuevo con el próximo análisis
+                    proceso.matar()
+                    self._procesos.remove(proceso)
+                    if self._ocupado and not any(p.proceso.is_alive() for p in self._procesos):
+                        self.cancelar()
+                        mensajes.append(("error", "No se pudo iniciar el proceso de análisis."))
+                        return mensajes
+                    continue
+                self._reemplazar(proceso)
+                if self._ocupado and tarea is not None and tarea[0] == self._id_actual:
+                    self.cancelar()
+                    mensajes.append(("error", "El proceso de análisis terminó inesperadamente."))
+                    return mensajes
+                continue
+            if not proceso.listo:
+                proceso.listo = True
+                continue
+            id_trabajo, nodo, estado, datos, segundos, reiniciar, registro = mensaje
+            proceso.tarea = None
+            if registro is not None:
+                instrumentacion.incorporar(registro)
+            if reiniciar:
+                self._reemplazar(proceso)
+            if not self._ocupado or id_trabajo != self._id_actual:
+                continue
+            if estado == "error":
+                self.cancelar()
+                mensajes.append(("error", datos))
+                return mensajes
+            self._en_curso.discard(nodo)
+            self._hechos.add(nodo)
+            for parte, valor in datos.items():
+                self._partes.setdefault(parte, valor)
+            self.tiempos[nodo] = (self.tiempos[nodo][0], time.perf_counter() - self._inicio, segundos)
+
+        if not self._ocupado:
+            return mensajes
+        while self._etapas_enviadas < _etapas_listas(self._partes):
+            etapa, partes = ETAPAS[self._etapas_enviadas]
+            mensajes.append((etapa, {p: self._partes[p] for p in partes}))
+            self._etapas_enviadas += 1
+        if len(self._hechos) == len(NODOS):
+            self._ocupado = False
+            mensajes.append(("fin", {"tiempos": dict(self.tiempos)}))
+        else:
+            self._despachar()
+        return mensajes
+
+    def ocupado(self):
+        return self._ocupado
+
+    def enviar_aparte(self, nodo, funcion, argumento=None, reemplazar=False):
+        # Pide un nodo suelto (NODO_LECTURA, NODO_PERFIL, NODO_FAMILIA) a su propio proceso,
+        # sin tocar el análisis en curso. El resultado llega por
+        # recibir_aparte(). Si el proceso está ocupado, se mata; con
+        # reemplazar=True (modo en vivo) el pedido espera a que se libere y lo
+        # del pedido anterior se descarta al llegar.
+        self.cancelar_aparte(nodo, matar=not reemplazar)
+        self._pendientes[nodo] = (self._ids_apartes[nodo], nodo, funcion, {}, argumento)
+        self._enviar_pendiente(nodo)
+
+    def iniciar_aparte(self, nodo):
+        # Arranca de antemano el proceso de un nodo suelto
+        if nodo not in self._apartes:
+            self._apartes[nodo] = _Proceso(self._contexto)
+
+    def _enviar_pendiente(self, nodo):
+        if nodo not in self._pendientes:
+            return
+        self.iniciar_aparte(nodo)
+        proceso = self._apartes[nodo]
+        if proceso.listo and proceso.tarea is None:
+            proceso.enviar(*self._pendientes.pop(nodo))
+
+    def recibir_aparte(self, nodo):
+        # Sin bloquear: None mientras el último pedido de `nodo` no termina; si
+        # no, ("ok", datos) o ("error", texto). Con la instrumentación
+        # encendida, los tiempos por etapa del proceso quedan sumados.
+        proceso = self._apartes.get(nodo)
+        if proceso is None:
+            return None
+        respuesta = None
+        while respuesta is None and proceso.conexion.poll():
+            try:
+                mensaje = proceso.conexion.recv()
+            except EOFError:
+                tarea = proceso.tarea
+                proceso.matar()
+                del self._apartes[nodo]
+                if not proceso.listo:
+                    # Murió al arrancar: no insistimos hasta el próximo pedido
+                    self._pendientes.pop(nodo, None)
+                    return ("error", "No se pudo iniciar el proceso de análisis.")
+                if tarea is not None and tarea[0] == self._ids_apartes[nodo]:
+                    return ("error", "El proceso de análisis terminó inesperadamente.")
+                break
+            if not proceso.listo:
+                proceso.listo = True
+                continue
+            id_trabajo, _, estado, datos, _, reiniciar, registro = mensaje
+            proceso.tarea = None
+            if registro is not None:
+                instrumentacion.incorporar(registro)
+            if id_trabajo == self._ids_apartes[nodo]:
+                respuesta = (estado, datos)
+            if reiniciar:
+                proceso.matar()
+                del self._apartes[nodo]
+                break
+        self._enviar_pendiente(nodo)
+        return respuesta
+
+    def cancelar_aparte(self, nodo, matar=True):
+        # Lo que llegue de un pedido anterior de `nodo` se descarta; con
+        # matar=True también se corta (matando su proceso)
+        self._ids_apartes[nodo] = self._ids_apartes.get(nodo, 0) + 1
+        self._pendientes.pop(nodo, None)
+        proceso = self._apartes.get(nodo)
+        if matar and proceso is not None and proceso.tarea is not None:
+            proceso.matar()
+            del self._apartes[nodo]
+
+    def cerrar(self):
+        self.cancelar()
+        for nodo in list(self._apartes):
+            self.cancelar_aparte(nodo)
+        for proceso in self._procesos + list(self._apartes.values()):
+            proceso.cerrar()
+        self._procesos = []
+        self._apartes = {}
+
+def analizar_esperando(trabajador, funcion, conocidas=None, intervalo=0.005):
+    # Análisis completo bloqueando hasta el final (scripts y benchmarks).
+    # Devuelve (partes, tiempos); lanza RuntimeError si el análisis falla.
+    trabajador.enviar(funcion, conocidas)
+    partes = dict(conocidas or {})
+    while True:
+        for etapa, datos in trabajador.recibir():
+            if etapa == "error":
+                raise RuntimeError(datos)
+            if etapa == "fin":
+                return partes, datos["tiempos"]
+            partes.update(datos)
+        time.sleep(intervalo)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los módulos de grafi están en la raíz del repositorio (sin paquete)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,123 @@
+import sqlite3
+
+import pytest
+import sympy
+
+import cache_disco
+import grafi
+import operations
+import steps
+
+
+@pytest.fixture
+def cache(tmp_path):
+    operations.activar_cache_disco(str(tmp_path / "analisis.sqlite3"))
+    operations.cache_analisis.limpiar()
+    yield operations.cache_en_disco
+    operations.desactivar_cache_disco()
+    operations.cache_analisis.limpiar()
+
+
+def _accesos(cache):
+    with sqlite3.connect(cache.ruta) as conexion:
+        return dict(conexion.execute("SELECT expresion, ultimo_acceso FROM analisis").fetchall())
+
+
+def test_filas_de_signos_vuelven_como_tuplas_con_nombre(cache):
+    funcion = operations.convertir_texto_a_funcion("x^3 - 3*x")
+    analisis = operations.Analisis(funcion)
+    analisis.intervalos_crecimiento
+    analisis.intervalos_concavidad
+    operations.persistir(analisis)
+
+    partes = cache.leer(operations.forma_canonica(funcion))
+    for fila in partes["intervalos_crecimiento"] + partes["intervalos_concavidad"]:
+        assert isinstance(fila, operations.FilaSigno)
+    assert partes["intervalos_crecimiento"] == analisis.intervalos_crecimiento
+
+    # Lo que usa las filas por nombre funciona igual con un análisis leído del disco
+    desde_disco = operations.Analisis(funcion, partes)
+    assert grafi._fila(desde_disco.intervalos_crecimiento[0])["fin"] == -1.0
+    assert steps.obtener_intervalos_concavidad(desde_disco) == steps.obtener_intervalos_concavidad(analisis)
+
+
+def test_leer_no_escribe_en_cada_acceso(cache):
+    funcion = operations.convertir_texto_a_funcion("x^2")
+    clave = operations.forma_canonica(funcion)
+    cache.escribir(clave, "x**2", {"primera_derivada": operations.calcular_derivada(funcion)})
+    antes = _accesos(cache)["x**2"]
+
+    assert cache.leer(clave) is not None
+    assert _accesos(cache)["x**2"] == antes
+
+    cache.guardar_accesos()
+    assert _accesos(cache)["x**2"] > antes
+
+
+def test_accesos_se_guardan_por_lote(cache, monkeypatch):
+    monkeypatch.setattr(cache_disco, "ACCESOS_POR_LOTE", 2)
+    claves = []
+    for texto in ("x^2", "x^3"):
+        funcion = operations.convertir_texto_a_funcion(texto)
+        claves.append(operations.forma_canonica(funcion))
+        cache.escribir(claves[-1], texto, {"primera_derivada": operations.calcular_derivada(funcion)})
+    antes = _accesos(cache)
+
+    cache.leer(claves[0])
+    assert _accesos(cache) == antes
+    cache.leer(claves[1])
+    despues = _accesos(cache)
+    assert all(despues[texto] > antes[texto] for texto in antes)
+
+
+def test_no_persiste_soluciones_numericas(cache):
+    # Un solve que se venció (método "numerico") no debe quedar guardado
+    funcion = operations.convertir_texto_a_funcion("exp(x) - x^3")
+    analisis = operations.Analisis(funcion, {
+        "primera_derivada": operations.calcular_derivada(funcion),
+        "puntos_criticos": (operations.sympy.Float(1.0),),
+        "metodo_criticos": "numerico",
+        "puntos_inflexion": (operations.sympy.Float(2.0),),
+        "metodo_inflexion": "exacto",
+    })
+    operations.persistir(analisis)
+
+    partes = cache.leer(operations.forma_canonica(funcion))
+    assert "primera_derivada" in partes
+    assert "puntos_criticos" not in partes and "metodo_criticos" not in partes
+    assert partes["metodo_inflexion"] == "exacto"
+    assert partes["puntos_inflexion"] == (operations.sympy.Float(2.0),)
+
+
+def test_no_persiste_clasificacion_indecisa(cache):
+    funcion = operations.convertir_texto_a_funcion("x^3")
+    punto = operations.sympy.Integer(0)
+    analisis = operations.Analisis(funcion, {
+        "puntos_criticos": (punto,),
+        "metodo_criticos": "exacto",
+        "clasificacion": ((punto, punto, "indeciso", ()),),
+    })
+    operations.persistir(analisis)
+    assert cache.leer(operations.forma_canonica(funcion)) is None
+
+
+@pytest.mark.parametrize("texto", ["x^3 - 3*x", "sqrt(2)*x + pi", "exp(-x^2)*E", "1.5*x + 0.1",
+                                   "abs(x) + log(x)", "sin(x)/x"])
+def test_expresiones_vuelven_iguales(texto):
+    expresion = operations.convertir_texto_a_funcion(texto)
+    leida = cache_disco.deserializar(cache_disco.serializar({"f": expresion}))["f"]
+    assert leida == expresion
+    assert sympy.srepr(leida) == sympy.srepr(expresion)
+
+
+@pytest.mark.parametrize("datos", [
+    '{"f": {"s": "__import__(\'os\').getpid()"}}',
+    '{"f": {"e": ["eval", {"e": ["Integer", "1"]}]}}',
+    '{"f": {"e": ["S", "__class__"]}}',
+])
+def test_entrada_ajena_no_se_evalua(cache, datos):
+    clave = operations.forma_canonica(operations.convertir_texto_a_funcion("x^2"))
+    with sqlite3.connect(cache.ruta) as conexion:
+        conexion.execute("INSERT INTO analisis VALUES (?, ?, ?, ?, ?)",
+                         (cache_disco.calcular_clave(clave), "x**2", datos, len(datos), 0.0))
+    assert cache.leer(clave) is None
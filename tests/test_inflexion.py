@@ -0,0 +1,50 @@
+import sympy
+
+import operations
+import steps
+
+
+def _analisis(texto):
+    return operations.Analisis(operations.convertir_texto_a_funcion(texto))
+
+
+def test_x4_no_tiene_punto_de_inflexion():
+    analisis = _analisis("x^4")
+    assert analisis.candidatos_inflexion == (0,)
+    assert analisis.puntos_inflexion == ()
+    assert analisis.marcadores_inflexion == ()
+    assert analisis.minimos == ((0, 0),)
+    # La concavidad no se parte en 0
+    assert [(f.inicio, f.fin, f.signo) for f in analisis.intervalos_concavidad] == [(None, None, 1)]
+    assert "no es punto de inflexión" in steps.obtener_texto_inflexion(analisis)
+
+
+def test_candidato_que_no_es_critico():
+    # f''(0) = 0 en x^4 + x, pero 0 no es crítico ni de inflexión
+    analisis = _analisis("x^4 + x")
+    assert analisis.puntos_inflexion == ()
+
+
+def test_cambios_de_signo_se_conservan():
+    assert _analisis("x^3").puntos_inflexion == (0,)
+    assert _analisis("x^5").puntos_inflexion == (0,)
+    analisis = _analisis("sin(x)")
+    assert analisis.puntos_inflexion == analisis.candidatos_inflexion
+    assert len(analisis.puntos_inflexion) == 7
+
+
+def test_concavidad_se_parte_solo_en_inflexiones_y_polos():
+    filas = _analisis("x^6 - 2*x^3").intervalos_concavidad
+    assert [f.signo for f in filas] == [1, -1, 1]
+    filas = _analisis("1/x^2").intervalos_concavidad
+    assert [(f.fin, f.signo) for f in filas] == [(0.0, 1), (None, 1)]
+
+
+def test_marcadores_en_vista_numerica():
+    # Métodos que dependen de la ventana: se buscan en la vista y se
+    # clasifican por cambio de signo
+    x = sympy.symbols("x")
+    analisis = operations.Analisis(x**4, {"metodo_criticos": "numerico", "metodo_inflexion": "numerico"})
+    maximos, minimos, inflexion = analisis.marcadores_en(-3, 3)
+    assert maximos == () and inflexion == ()
+    assert len(minimos) == 1 and abs(minimos[0][0]) < 1e-6
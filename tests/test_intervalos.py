@@ -0,0 +1,77 @@
+import math
+
+import sympy
+
+import operations
+
+x = sympy.symbols("x")
+
+
+def _analisis(texto):
+    return operations.Analisis(operations.convertir_texto_a_funcion(texto))
+
+
+def _resumen(filas):
+    return [(f.inicio, f.fin, f.signo) for f in filas]
+
+
+def test_polo_separa_intervalos():
+    analisis = _analisis("1/x")
+    assert _resumen(analisis.intervalos_concavidad) == [(None, 0.0, -1), (0.0, None, 1)]
+    assert _resumen(analisis.intervalos_crecimiento) == [(None, 0.0, -1), (0.0, None, -1)]
+
+
+def test_tan_cambia_de_concavidad_en_cada_polo():
+    filas = _analisis("tan(x)").intervalos_concavidad
+    for fila in filas:
+        assert fila.inicio is None or fila.inicio < fila.x_prueba
+        assert fila.fin is None or fila.x_prueba < fila.fin
+        # Arriba donde tan(x) > 0, abajo donde tan(x) < 0
+        assert fila.signo == (1 if math.tan(fila.x_prueba) > 0 else -1)
+    polos = [f.fin for f in filas if f.fin is not None and abs(math.cos(f.fin)) < 1e-9]
+    assert len(polos) == 6
+    assert any(abs(p + math.pi / 2) < 1e-12 for p in polos)
+
+
+def test_punto_de_prueba_nunca_es_un_corte():
+    # El punto medio de (-pi, 0) es el polo -pi/2
+    filas = operations.tabla_de_signos(sympy.diff(sympy.tan(x), x, 2), [-sympy.pi, 0],
+                                       operations.singularidades(sympy.tan(x), -10.0, 10.0))
+    cortes = {f.inicio for f in filas} | {f.fin for f in filas}
+    for fila in filas:
+        assert all(c is None or abs(fila.x_prueba - c) > 1e-6 for c in cortes)
+
+
+def test_fuera_del_dominio_no_hay_signo():
+    analisis = _analisis("log(x)")
+    assert _resumen(analisis.intervalos_crecimiento) == [(None, 0.0, None), (0.0, None, 1)]
+    analisis = _analisis("sqrt(4 - x^2)")
+    assert _resumen(analisis.intervalos_crecimiento) == [(None, -2.0, None), (-2.0, 0.0, 1),
+                                                         (0.0, 2.0, -1), (2.0, None, None)]
+
+
+def test_sin_cortes_ni_puntos_un_solo_intervalo():
+    assert _resumen(_analisis("x").intervalos_crecimiento) == [(None, None, 1)]
+    assert _resumen(_analisis("x^3 - 3*x").intervalos_crecimiento) == [(None, -1.0, 1), (-1.0, 1.0, -1),
+                                                                      (1.0, None, 1)]
+
+
+def test_raices_numericas_de_un_polo_son_precisas():
+    polos = operations.singularidades(sympy.tan(x), -10.0, 10.0)
+    assert max(abs(math.cos(p)) for p in polos) < 1e-15
+
+
+def test_critico_indeciso_se_clasifica_por_la_primera_derivada():
+    # La torre de derivadas se corta antes de la de orden 14
+    for texto, tipo, signos in (("x^14", "minimo", [-1, 1]), ("x^50 - 1", "minimo", [-1, 1]),
+                                ("-x^14", "maximo", [1, -1])):
+        analisis = _analisis(texto)
+        assert [c[2] for c in analisis.clasificacion] == [tipo]
+        assert analisis.criticos_indecisos == ()
+        assert _resumen(analisis.intervalos_crecimiento) == [(None, 0.0, signos[0]), (0.0, None, signos[1])]
+
+
+def test_critico_sin_cambio_de_signo_no_separa_intervalos():
+    analisis = _analisis("x^15")
+    assert [c[2] for c in analisis.clasificacion] == ["inflexion"]
+    assert _resumen(analisis.intervalos_crecimiento) == [(None, None, 1)]
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+import operations
+import parametros
+
+
+def _variacion(texto, valores, a=-10.0, b=10.0):
+    familia = parametros.preparar(operations.convertir_texto_a_funcion(texto))
+    return familia.evaluar(valores, a, b)
+
+
+def _xs(marcadores):
+    return [round(x, 6) for x, _ in marcadores]
+
+
+def test_x4_tiene_minimo_y_no_inflexion():
+    variacion = _variacion("a*x^4", {"a": 1})
+    assert _xs(variacion.minimos) == [0.0]
+    assert variacion.maximos == ()
+    assert variacion.inflexion == ()
+
+
+def test_sin_termino_cubico_no_hay_inflexion():
+    # Con a = 0, f'' = 6ax es 0 en todas partes: no cambia de signo
+    variacion = _variacion("a*x^3 + b*x", {"a": 0, "b": 1})
+    assert variacion.inflexion == ()
+    assert variacion.maximos == variacion.minimos == ()
+
+
+def test_cubica_con_parametros():
+    variacion = _variacion("a*x^3 + b*x", {"a": 1, "b": -3})
+    assert _xs(variacion.maximos) == [-1.0]
+    assert _xs(variacion.minimos) == [1.0]
+    assert _xs(variacion.inflexion) == [0.0]
+
+
+def test_coincide_con_el_analisis():
+    # Con los parámetros reemplazados, los mismos marcadores que Analisis
+    for texto, valores, concreta in [("a*x^4 + b*x^2", {"a": 1, "b": -2}, "x^4 - 2*x^2"),
+                                     ("sin(a*x)", {"a": 1}, "sin(x)"),
+                                     ("a/x + x", {"a": 1}, "1/x + x")]:
+        variacion = _variacion(texto, valores)
+        analisis = operations.Analisis(operations.convertir_texto_a_funcion(concreta))
+        maximos, minimos, inflexion = analisis.marcadores_en(-10.0, 10.0)
+        for propios, esperados in ((variacion.maximos, maximos), (variacion.minimos, minimos),
+                                   (variacion.inflexion, inflexion)):
+            assert np.allclose(sorted(_xs(propios)), sorted(_xs(esperados)), atol=1e-6)
+
+
+def test_evaluar_compilada_sin_compilar():
+    assert np.isnan(operations.evaluar_compilada(None, [1.0, 2.0])).all()
+
+
+def test_e_no_es_parametro():
+    # La e minúscula es el número de Euler: no lleva deslizador
+    funcion = operations.convertir_texto_a_funcion("a*e^x")
+    assert [s.name for s in parametros.parametros_de(funcion)] == ["a"]
+    assert parametros.parametros_de(operations.convertir_texto_a_funcion("e^x - x")) == ()
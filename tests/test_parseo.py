@@ -0,0 +1,29 @@
+import pytest
+import sympy
+
+import operations
+
+
+@pytest.mark.parametrize("texto", [
+    "__import__('os').getpid()",
+    "x.diff(x)",
+    "x. n(2)",
+    "lambda: 1",
+    "[x, 1]",
+    "Heaviside(x)",
+    "x" * (operations.MAX_LARGO_EXPRESION + 1),
+])
+def test_texto_no_permitido(texto):
+    assert operations.convertir_texto_a_funcion(texto) is None
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("x^3 - 3*x", "x**3 - 3*x"),
+    ("1.5*x + x*.5", "2.0*x"),
+    ("ln(x) + abs(x)", "log(x) + Abs(x)"),
+    ("sqrt(4 - x^2)", "sqrt(4 - x**2)"),
+    ("e^x", "exp(x)"),
+    ("x^e + E", "x**E + E"),
+])
+def test_texto_permitido(texto, esperado):
+    assert operations.convertir_texto_a_funcion(texto) == sympy.sympify(esperado)
@@ -0,0 +1,64 @@
+import pytest
+import sympy
+
+import operations
+import polinomios
+
+x = sympy.symbols("x")
+
+
+def _raices(texto):
+    return polinomios.raices_reales(polinomios.coeficientes(sympy.sympify(texto)))
+
+
+def test_grado_bajo_es_exacto():
+    assert _raices("x^2 - 2") == ([-sympy.sqrt(2), sympy.sqrt(2)], "exacto")
+
+
+def test_grado_alto_con_raices_exactas():
+    assert _raices("6*x^5") == ([0], "exacto")
+    assert _raices("x^7 - x") == ([-1, 0, 1], "exacto")
+    raices, metodo = _raices("x^6 - 2")
+    assert metodo == "exacto"
+    assert raices == [-sympy.root(2, 6), sympy.root(2, 6)]
+
+
+def test_solo_los_factores_sin_formula_son_aproximados():
+    raices, metodo = _raices("(x^2 - 2)^3*(x^5 - x - 1)")
+    assert metodo == "aproximado"
+    assert raices[0] == -sympy.sqrt(2) and raices[-1] == sympy.sqrt(2)
+    assert abs(float(raices[1]) - 1.1673039783) < 1e-8
+
+
+def test_coeficientes_decimales_usan_el_camino_numerico():
+    raices, metodo = _raices("0.5*x^6 - x")
+    assert metodo == "aproximado"
+    assert [round(float(r), 6) for r in raices] == [0.0, round(2 ** (1 / 5), 6)]
+
+
+def test_x6_tiene_un_minimo_exacto_en_0():
+    analisis = operations.Analisis(operations.convertir_texto_a_funcion("x^6"))
+    assert analisis.metodo_criticos == "exacto"
+    assert analisis.puntos_criticos == (0,)
+    assert analisis.minimos == ((0, 0),)
+
+
+def test_coeficientes_irracionales():
+    # Poly.real_roots no sirve fuera de ZZ/QQ: en grado bajo resuelve sympy.solve
+    assert _raices("sqrt(2)*x^2 + x") is None
+    puntos, metodo = operations.resolver_ecuacion(sympy.sympify("sqrt(2)*x^2 + x"))
+    assert metodo == "exacto" and set(puntos) == {-sympy.sqrt(2) / 2, 0}
+    for texto in ("E*x^3 - x", "sqrt(3)*x^3 - x"):
+        puntos, _ = operations.resolver_ecuacion(sympy.sympify(texto))
+        c = float(sympy.sympify(texto).coeff(x, 3))
+        assert sorted(float(p) for p in puntos) == \
+            pytest.approx([-1 / c ** 0.5, 0.0, 1 / c ** 0.5])
+    raices, metodo = _raices("pi*x^5 - x")
+    assert metodo == "aproximado" and len(raices) == 3
+
+
+def test_analisis_con_coeficientes_irracionales():
+    for texto in ("sqrt(2)*x^2 + x", "E*x^3 - x", "sqrt(3)*x^3 - x"):
+        analisis = operations.Analisis(operations.convertir_texto_a_funcion(texto))
+        assert analisis.intervalos_crecimiento
+        assert analisis.maximos or analisis.minimos
@@ -0,0 +1,107 @@
+import asyncio
+import http.client
+import json
+import threading
+import time
+
+import pytest
+
+import servidor
+
+
+@pytest.fixture(scope="module")
+def local():
+    # Un servidor con un solo proceso, en un hilo con su propio bucle
+    listo = threading.Event()
+    estado = {}
+
+    def correr():
+        bucle = asyncio.new_event_loop()
+        asyncio.set_event_loop(bucle)
+        srv = servidor.Servidor(procesos=1)
+        escucha = bucle.run_until_complete(asyncio.start_server(srv.atender, "127.0.0.1", 0))
+        estado.update(bucle=bucle, servidor=srv, puerto=escucha.sockets[0].getsockname()[1])
+        listo.set()
+        bucle.run_forever()
+        escucha.close()
+        bucle.run_until_complete(escucha.wait_closed())
+        bucle.close()
+
+    hilo = threading.Thread(target=correr, daemon=True)
+    hilo.start()
+    listo.wait()
+    yield estado
+    estado["bucle"].call_soon_threadsafe(estado["bucle"].stop)
+    hilo.join()
+    estado["servidor"].cerrar()
+
+
+def _pedir(local, metodo, ruta, pedido=None, encabezados=None):
+    conexion = http.client.HTTPConnection("127.0.0.1", local["puerto"], timeout=30)
+    cuerpo = None if pedido is None else json.dumps(pedido)
+    if encabezados is None:
+        encabezados = {"Content-Type": "application/json"}
+    conexion.request(metodo, ruta, cuerpo, encabezados)
+    respuesta = conexion.getresponse()
+    datos = respuesta.read()
+    conexion.close()
+    return respuesta, (json.loads(datos) if datos else None)
+
+
+def test_analiza_por_post(local):
+    respuesta, datos = _pedir(local, "POST", "/analizar", {"expresion": "x^3 - 3*x", "pasos": False})
+    assert respuesta.status == 200
+    assert datos["estado"] == "ok"
+    assert datos["maximos"]
+
+
+def test_get_analizar_no_se_acepta(local):
+    respuesta, _ = _pedir(local, "GET", "/analizar?expresion=x^2", encabezados={})
+    assert respuesta.status == 405
+    assert respuesta.getheader("Allow") == "POST"
+
+
+def test_post_sin_json_no_se_acepta(local):
+    respuesta, _ = _pedir(local, "POST", "/analizar", {"expresion": "x^2"}, {"Content-Type": "text/plain"})
+    assert respuesta.status == 415
+
+
+def test_origen_y_host_ajenos(local):
+    encabezados = {"Content-Type": "application/json", "Origin": "https://ajeno.ejemplo"}
+    respuesta, _ = _pedir(local, "POST", "/analizar", {"expresion": "x^2"}, encabezados)
+    assert respuesta.status == 403
+    encabezados = {"Content-Type": "application/json", "Host": "ajeno.ejemplo"}
+    respuesta, _ = _pedir(local, "POST", "/analizar", {"expresion": "x^2"}, encabezados)
+    assert respuesta.status == 403
+    encabezados = {"Content-Type": "application/json", "Origin": "http://localhost:3000"}
+    respuesta, _ = _pedir(local, "POST", "/analizar", {"expresion": "x^2"}, encabezados)
+    assert respuesta.status == 200
+    assert respuesta.getheader("Access-Control-Allow-Origin") == "http://localhost:3000"
+
+
+def test_codigo_no_se_ejecuta(local):
+    _, datos = _pedir(local, "POST", "/analizar", {"expresion": "__import__('os').getpid()"})
+    assert datos["estado"] == "invalida"
+
+
+def test_parseo_lento_respeta_el_plazo(local):
+    _pedir(local, "POST", "/analizar", {"expresion": "x^2 + 1", "pasos": False})
+    antes = local["servidor"].pool.reiniciados
+    inicio = time.perf_counter()
+    respuesta, _ = _pedir(local, "POST", "/analizar", {"expresion": "9**9**9**9", "plazo": 1})
+    assert respuesta.status == 504
+    # El bucle sigue atendiendo mientras el proceso se reemplaza
+    respuesta, estado = _pedir(local, "GET", "/estado", encabezados={})
+    assert respuesta.status == 200
+    assert time.perf_counter() - inicio < 5
+    # El proceso vencido se mata y el siguiente pedido usa uno nuevo
+    respuesta, datos = _pedir(local, "POST", "/analizar", {"expresion": "x^4 - x", "pasos": False})
+    assert datos["estado"] == "ok"
+    assert local["servidor"].pool.reiniciados == antes + 1
+
+
+@pytest.mark.parametrize("plazo", [float("nan"), float("inf"), -1, 0, "5", True])
+def test_plazo_invalido(local, plazo):
+    respuesta, datos = _pedir(local, "POST", "/analizar", {"expresion": "x^2", "plazo": plazo})
+    assert respuesta.status == 400
+    assert "plazo" in datos["error"]
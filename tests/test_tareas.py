@@ -0,0 +1,88 @@
+import time
+
+import instrumentacion
+import operations
+import parametros
+import tareas
+
+
+def _esperar(trabajador, nodo, limite=60):
+    inicio = time.perf_counter()
+    while time.perf_counter() - inicio < limite:
+        mensaje = trabajador.recibir_aparte(nodo)
+        if mensaje is not None:
+            return mensaje
+        time.sleep(0.01)
+    raise AssertionError("el nodo no terminó")
+
+
+def test_perfil_corre_en_otro_proceso(tmp_path):
+    trabajador = tareas.Trabajador(procesos=1)
+    ruta = tmp_path / "grafi.prof"
+    instrumentacion.reiniciar()
+    instrumentacion.activar()
+    try:
+        trabajador.enviar_aparte(tareas.NODO_PERFIL, operations.convertir_texto_a_funcion("x^3 - 3*x"), str(ruta))
+        # perfilar() no bloquea: el análisis corre en el proceso de perfilado
+        assert trabajador.recibir_aparte(tareas.NODO_PERFIL) is None
+        tipo, texto = _esperar(trabajador, tareas.NODO_PERFIL)
+        assert tipo == "ok"
+        assert "analisis_completo" in texto
+        assert ruta.exists()
+        # Los tiempos por etapa del proceso llegan con el resultado
+        etapas = {nombre for nombre, *_ in instrumentacion.resumen()["etapas"]}
+        assert "nodo." + tareas.NODO_PERFIL in etapas
+        assert "parseo" in etapas or "derivada" in etapas
+    finally:
+        instrumentacion.desactivar()
+        instrumentacion.reiniciar()
+        trabajador.cerrar()
+
+
+def test_cancelar_perfil_mata_el_proceso():
+    trabajador = tareas.Trabajador(procesos=1)
+    try:
+        trabajador.enviar_aparte(tareas.NODO_PERFIL, operations.convertir_texto_a_funcion("x^2"))
+        trabajador.cancelar_aparte(tareas.NODO_PERFIL)
+        assert trabajador.recibir_aparte(tareas.NODO_PERFIL) is None
+        trabajador.enviar_aparte(tareas.NODO_PERFIL, operations.convertir_texto_a_funcion("x^2"))
+        assert _esperar(trabajador, tareas.NODO_PERFIL)[0] == "ok"
+    finally:
+        trabajador.cerrar()
+
+
+def test_familia_se_resuelve_en_otro_proceso():
+    trabajador = tareas.Trabajador(procesos=1)
+    funcion = operations.convertir_texto_a_funcion("a*x^3 + b*x")
+    try:
+        trabajador.enviar_aparte(tareas.NODO_FAMILIA, funcion)
+        tipo, simbolico = _esperar(trabajador, tareas.NODO_FAMILIA)
+        assert tipo == "ok"
+        assert isinstance(simbolico, parametros.Simbolico)
+        assert simbolico == parametros.parte_simbolica(funcion)
+        # En modo en vivo el pedido nuevo no mata al proceso y lo viejo se descarta
+        trabajador.enviar_aparte(tareas.NODO_FAMILIA, operations.convertir_texto_a_funcion("a*x^2"))
+        trabajador.enviar_aparte(tareas.NODO_FAMILIA, funcion, reemplazar=True)
+        assert _esperar(trabajador, tareas.NODO_FAMILIA)[1] == simbolico
+    finally:
+        trabajador.cerrar()
+
+
+def test_lectura_lenta_no_bloquea_y_se_corta():
+    trabajador = tareas.Trabajador(procesos=1)
+    try:
+        trabajador.enviar_aparte(tareas.NODO_LECTURA, "x^3 - 3*x")
+        tipo, funcion = _esperar(trabajador, tareas.NODO_LECTURA)
+        assert tipo == "ok"
+        assert funcion == operations.convertir_texto_a_funcion("x^3 - 3*x")
+        # 9^9^9^9 se calcula al leerlo: quien pide no espera y lo puede cortar
+        inicio = time.perf_counter()
+        trabajador.enviar_aparte(tareas.NODO_LECTURA, "9^9^9^9")
+        time.sleep(0.2)
+        assert trabajador.recibir_aparte(tareas.NODO_LECTURA) is None
+        trabajador.cancelar_aparte(tareas.NODO_LECTURA)
+        assert time.perf_counter() - inicio < 5
+        trabajador.enviar_aparte(tareas.NODO_LECTURA, "x +* 2")
+        assert _esperar(trabajador, tareas.NODO_LECTURA) == ("ok", None)
+    finally:
+        trabajador.cerrar()